@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import json
+import sqlite3
 import sys
-from dataclasses import replace
-from datetime import datetime, timezone
+from contextlib import nullcontext
+from dataclasses import asdict, replace
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import dspy
@@ -20,12 +22,21 @@ if str(SRC_PATH) not in sys.path:
 
 from goldsense.analyst import GoldAnalyst
 from goldsense.config import Settings
+from goldsense.daemon import read_state
 from goldsense.engine import MarketEngine
 from goldsense.exceptions import ConfigError, GoldSenseError
 from goldsense.fetcher import NewsFetcher
+from goldsense.frame import ResultFrame
+from goldsense.history import AnalysisHistory, HistoryFilter
 from goldsense.logger import JsonlLogger
-from goldsense.models import NewsArticle
-from goldsense.price import GoldPriceService
+from goldsense.metrics import append_run_metrics
+from goldsense.models import AnalysisResult, BatchAnalysis, NewsArticle
+from goldsense.pipeline import article_from_item, configure_lm
+from goldsense.price import CachedQuote, GoldPriceService, source_unit
+from goldsense.price_store import PriceStore
+from goldsense.runs import RunStore
+from goldsense.sentiment_index import WINDOWS, sentiment_series
+from goldsense.serialization import dumps, result_to_dict
 from goldsense.tonl import decode_news_articles, encode_news_articles, encode_tonl, decode_tonl
 
 
@@ -91,15 +102,7 @@ effective_settings = replace(settings)
 # --- GLOBAL DSPY CONFIGURATION (Dependency Injection Root) ---
 def configure_dspy(model_name: str):
     """Reconfigure DSPy with a new model."""
-    lm = dspy.LM(
-        f"openai/{model_name}",
-        api_key=effective_settings.cerebras_api_key,
-        api_base=effective_settings.cerebras_api_base,
-        temperature=effective_settings.analysis_temperature,
-        cache=False,
-    )
-    dspy.configure(lm=lm)
-    return lm
+    return configure_lm(effective_settings, model_name)
 
 # Kullanılacak model: Sidebar'dan seçilen veya default
 active_model = st.session_state.get("sidebar_model", effective_settings.cerebras_model)
@@ -114,10 +117,23 @@ except Exception as exc:
 from goldsense import ui
 
 fetcher = NewsFetcher(effective_settings)
-engine = MarketEngine()
+try:
+    engine = (
+        MarketEngine.from_config(Path(effective_settings.engine_config_path))
+        if effective_settings.engine_config_path
+        else MarketEngine()
+    )
+except ConfigError as exc:
+    st.error(f"Motor yapılandırması yüklenemedi: {exc}")
+    st.stop()
 
 price_service = GoldPriceService(effective_settings)
-logger = JsonlLogger(path=Path("logs/analysis.jsonl"))
+logger = JsonlLogger(
+    path=Path("logs/analysis.jsonl"),
+    rotate_max_bytes=effective_settings.log_rotate_max_bytes or None,
+    rotate_max_age=effective_settings.log_rotate_max_age,
+    codec=effective_settings.log_codec,
+)
 
 # NOT: GoldAnalyst artık analiz sırasında oluşturuluyor (model değişikliğini algılaması için)
 def get_analyst():
@@ -134,6 +150,14 @@ if "lm_history" not in st.session_state:
     st.session_state.lm_history = None
 if "token_usage" not in st.session_state:
     st.session_state.token_usage = None
+if "analysis_failures" not in st.session_state:
+    st.session_state.analysis_failures = []
+if "run_metrics" not in st.session_state:
+    st.session_state.run_metrics = None
+if "pipeline_run" not in st.session_state:
+    st.session_state.pipeline_run = None
+
+run_store = RunStore(Path(effective_settings.runs_dir)) if effective_settings.runs_dir else None
 
 
 def _run_fetch_sync(fetcher: NewsFetcher) -> tuple[list[NewsArticle], dict]:
@@ -141,31 +165,88 @@ def _run_fetch_sync(fetcher: NewsFetcher) -> tuple[list[NewsArticle], dict]:
     return asyncio.run(fetcher.fetch_latest_with_payload())
 
 
-def _run_analysis_sync(analyst: GoldAnalyst, articles: list[NewsArticle]):
-    return asyncio.run(analyst.analyze_articles(articles))
+def _run_analysis_sync(analyst: GoldAnalyst, articles: list[NewsArticle]) -> BatchAnalysis:
+    return asyncio.run(analyst.analyze_batch(articles))
 
 
-def _to_article(item: dict) -> NewsArticle:
-    published_raw = item.get("published_at") or item.get("publishedAt")
-    if isinstance(published_raw, str) and published_raw:
-        try:
-            published_at = datetime.fromisoformat(published_raw.replace("Z", "+00:00"))
-        except ValueError:
-            published_at = datetime.now(timezone.utc)
-    else:
-        published_at = datetime.now(timezone.utc)
-
-    return NewsArticle(
-        title=(item.get("title") or "").strip(),
-        description=(item.get("description") or "").strip(),
-        published_at=published_at,
-        source=item.get("source"),
-        url=item.get("url"),
-    )
+def _fetch_price_and_decode(tonl_text: str) -> tuple[CachedQuote | None, list[dict]]:
+    async def _run() -> list:
+        return await asyncio.gather(
+            price_service.get_quote_async(),
+            asyncio.to_thread(decode_news_articles, tonl_text),
+        )
+
+    quote, items = asyncio.run(_run())
+    return quote, items
+
+
+@st.cache_data(show_spinner=False)
+def _load_sentiment_series(log_path: str, log_mtime: float, window: str) -> pd.DataFrame:
+    """Vectorized backfill; re-runs only when the log file changes (mtime in cache key)."""
+    return sentiment_series(Path(log_path), window=window)
+
+
+def _price_history_source(quote: CachedQuote | None = None) -> str:
+    """Recorded source to chart: the displayed quote's, else the preferred one in its unit."""
+    names = list(effective_settings.price_sources)
+    if quote is not None:
+        if quote.source in names:
+            return quote.source
+        names = [name for name in names if source_unit(effective_settings, name) == quote.unit] or names
+    return names[0]
+
+
+def _load_price_history(results: list[AnalysisResult], source: str) -> pd.DataFrame | None:
+    """Hourly OHLC of one source's recorded quotes covering the analyzed articles' time span."""
+    if not effective_settings.price_store_path or not results:
+        return None
+    store_path = Path(effective_settings.price_store_path)
+    if not store_path.exists():
+        return None
+    published = [r.article.published_at for r in results]
+    try:
+        return PriceStore(store_path).ohlc(
+            "1h", start=min(published) - timedelta(hours=1), end=max(published) + timedelta(hours=1), source=source
+        )
+    except sqlite3.Error as exc:
+        print(f"⚠️  Fiyat geçmişi okunamadı: {exc}")
+        return None
+
+
+def _render_index_section(key: str | None = None) -> None:
+    st.divider()
+    index_window = st.radio("Endeks penceresi", list(WINDOWS), index=2, horizontal=True, key=key)
+    log_path = Path("logs/analysis.jsonl")
+    if log_path.exists():
+        ui.render_sentiment_index(
+            _load_sentiment_series(str(log_path), log_path.stat().st_mtime, index_window),
+            index_window,
+        )
+
+
+def _run_stage(name: str):
+    """Time a stage of the current pipeline run; yields its counts dict (no-op without a run)."""
+    run = st.session_state.pipeline_run
+    return run.stage(name) if run is not None else nullcontext({})
+
+
+def _fail_run(error: str) -> None:
+    """Close the current pipeline run as failed, so the next analysis starts a new one."""
+    run = st.session_state.pipeline_run
+    if run is not None:
+        run.finish(error=error)
+        st.session_state.pipeline_run = None
+
 
+def _run_artifact(name: str, data: bytes | str) -> None:
+    if st.session_state.pipeline_run is not None:
+        st.session_state.pipeline_run.add_artifact(name, data)
 
-tab_fetch, tab_tonl, tab_analyze, tab_perf = st.tabs(
-    ["Haber Hasadı", "TONL", "Analiz", "Performans Raporu"]
+
+daemon_state = read_state(Path(effective_settings.daemon_state_path))
+
+tab_fetch, tab_tonl, tab_analyze, tab_history, tab_live, tab_perf = st.tabs(
+    ["Haber Hasadı", "TONL", "Analiz", "Geçmiş", "Canlı", "Performans Raporu"]
 )
 
 with tab_fetch:
@@ -176,18 +257,22 @@ with tab_fetch:
     
     with col1:
         if st.button("📥 Haberleri Getir", type="primary", key="fetch_news", use_container_width=True):
+            # Each fetch starts a new pipeline run (manifest + artifacts under RUNS_DIR)
+            st.session_state.pipeline_run = run_store.start(model=active_model) if run_store else None
             with st.spinner("🔄 Haberler çekiliyor..."):
                 try:
-                    articles, payload = _run_fetch_sync(fetcher)
+                    with _run_stage("fetch") as counts:
+                        articles, payload = _run_fetch_sync(fetcher)
+                        counts["articles"] = len(articles)
                 except GoldSenseError as exc:
                     st.error(f"❌ Haber çekme hatası: {exc}")
                     st.stop()
 
             st.session_state.raw_payload = payload
+            raw_news = dumps(payload)
+            _run_artifact("raw_news.json", raw_news)
             Path("logs").mkdir(parents=True, exist_ok=True)
-            (Path("logs") / "raw_news.json").write_text(
-                json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
+            (Path("logs") / "raw_news.json").write_bytes(raw_news)  # Latest payload, compact: machine-read only
             
             # Success metrics
             col_a, col_b, col_c = st.columns(3)
@@ -239,8 +324,11 @@ with tab_tonl:
         else:
             if st.button("TONL'e Çevir (Haberler)", type="primary", key="convert_tonl_news"):
                 raw_articles = st.session_state.raw_payload.get("articles", [])
-                tonl_text = encode_news_articles(raw_articles)
+                with _run_stage("tonl") as counts:
+                    tonl_text = encode_news_articles(raw_articles)
+                    counts["chars"] = len(tonl_text)
                 st.session_state.tonl_text = tonl_text
+                _run_artifact("news.tonl", tonl_text)
 
                 Path("logs").mkdir(parents=True, exist_ok=True)
                 (Path("logs") / "news.tonl").write_text(tonl_text, encoding="utf-8")
@@ -316,30 +404,68 @@ with tab_tonl:
                         st.error(f"Hata: {e}")
 
 with tab_analyze:
-    if not st.session_state.tonl_text:
+    # With a background daemon the app is a reader; analyzing here (LLM calls from the app) is opt-in
+    manual_analysis = st.toggle(
+        "Uygulamada manuel analiz",
+        value=daemon_state is None,
+        key="manual_analysis",
+        help="Kapalıyken sonuçlar arka plan servisinin durum dosyasından okunur; uygulama LLM çağırmaz.",
+    )
+    if not manual_analysis:
+        daemon_summary = daemon_state.market_summary() if daemon_state is not None else None
+        daemon_results = daemon_state.recent_results() if daemon_state is not None else []
+        if daemon_summary is None or not daemon_results:
+            st.info("Arka plan servisi henüz analiz yazmadı. Başlatmak için:")
+            st.code("PYTHONPATH=src python -m goldsense daemon --interval 900 --window 24h", language="bash")
+        else:
+            st.caption(
+                f"Arka plan servisi · son {daemon_state.window_hours:g} saat · güncelleme: {daemon_state.updated_at}"
+            )
+            chart_source = (
+                daemon_state.price_source
+                if daemon_state.price_source in effective_settings.price_sources
+                else _price_history_source()
+            )
+            ui.render_results(
+                daemon_state.price, daemon_summary, daemon_results, confidence_threshold,
+                price_history=_load_price_history(daemon_results, chart_source),
+                key="daemon",
+                price_unit=daemon_state.price_unit or source_unit(effective_settings, chart_source),
+            )
+            _render_index_section(key="daemon_index_window")
+    elif not st.session_state.tonl_text:
         st.info("Önce 2. adımı tamamla (TONL'e çevir).")
     else:
         if st.button("Analizi Başlat", type="primary", key="run_analysis"):
-            # STEP 1: Fetch gold price first (non-blocking)
+            run = st.session_state.pipeline_run
+            if run is not None and any(stage["name"] == "decode" for stage in run.manifest.stages):
+                _fail_run("Önceki analiz tamamlanmadı")  # Crashed before finish(): never append to it
+            if st.session_state.pipeline_run is None and run_store is not None:
+                # Earlier run already finished: each further analysis is its own run, from the current TONL
+                st.session_state.pipeline_run = run_store.start(model=active_model)
+                _run_artifact("news.tonl", st.session_state.tonl_text)
+            if st.session_state.pipeline_run is not None:
+                st.session_state.pipeline_run.manifest.model = active_model  # Model used for analysis, not for fetch
+
+            # STEP 1: Fetch gold price (same-unit sources raced) while decoding TONL
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            status_text.text("Altın fiyatı sorgulanıyor...")
+            status_text.text("Altın fiyatı sorgulanıyor, TONL verisi decode ediliyor...")
             progress_bar.progress(10)
             
-            price = price_service.get_current_price()
+            with _run_stage("decode") as counts:
+                quote, tonl_items = _fetch_price_and_decode(st.session_state.tonl_text)
+                articles = [article_from_item(item) for item in tonl_items]
+                counts["articles"] = len(articles)
+                counts["price"] = quote.price if quote is not None else None
+                counts["price_unit"] = quote.unit if quote is not None else None
             
-            if price is None:
+            if quote is None:
                 st.warning("Altın fiyat bilgisi alınamadı (Truncgil/Binance yanıt vermedi). Analiz devam ediyor...")
             else:
-                st.success(f"✅ Güncel altın fiyatı: **${price:.2f}**")
-            
-            progress_bar.progress(20)
+                st.success(f"✅ Güncel altın fiyatı: **{quote.price:.2f} {quote.unit or ''}** ({quote.source})")
             
-            # STEP 2: Parse TONL
-            status_text.text("📄 TONL verisi decode ediliyor...")
-            tonl_items = decode_news_articles(st.session_state.tonl_text)
-            articles = [_to_article(item) for item in tonl_items]
             progress_bar.progress(30)
             
             # STEP 3: Run analysis with progress updates
@@ -350,7 +476,25 @@ with tab_analyze:
 
                 # Analyst'ı şimdi oluştur (sidebar'dan seçilen modeli kullanması için)
                 analyst = get_analyst()
-                results = _run_analysis_sync(analyst, articles)
+                with _run_stage("analysis") as counts:
+                    batch = _run_analysis_sync(analyst, articles)
+                    counts["results"] = len(batch.results)
+                    counts["failures"] = len(batch.failures)
+                    if batch.metrics is not None:
+                        counts["prompt_tokens"] = batch.metrics.prompt_tokens
+                        counts["completion_tokens"] = batch.metrics.completion_tokens
+                results = batch.results
+                _run_artifact("results.jsonl", b"".join(dumps(result_to_dict(r)) + b"\n" for r in results))
+                st.session_state.analysis_failures = batch.failures
+                st.session_state.run_metrics = batch.metrics
+                if batch.metrics is not None:
+                    append_run_metrics(Path("logs/metrics.jsonl"), batch.metrics)
+
+                if batch.failures and not results:
+                    raise GoldSenseError(
+                        f"Hiçbir haber analiz edilemedi ({len(batch.failures)} hata). "
+                        f"İlk hata: {batch.failures[0].error}"
+                    )
                 # DSPy Prompt ve History Yakalama (Performans Raporu için)
                 try:
                     import io
@@ -377,13 +521,18 @@ with tab_analyze:
                 
                 # Log results
                 status_text.text("💾 Sonuçlar kaydediliyor...")
-                for result in results:
-                    logger.log(result)
+                with _run_stage("log") as counts:
+                    counts["written"] = logger.log_many(results, model=active_model)
                 progress_bar.progress(90)
 
                 # Generate summary
                 status_text.text("Özet rapor oluşturuluyor...")
-                summary = engine.summarize(results)
+                with _run_stage("summary"):
+                    result_frame = ResultFrame.from_results(results)
+                    summary = engine.summarize_frame(result_frame)
+                if st.session_state.pipeline_run is not None:
+                    st.session_state.pipeline_run.finish(summary=asdict(summary))
+                    st.session_state.pipeline_run = None  # Finished manifests are never appended to
                 
                 # Capture LM history and usage for performance tab
                 lm = dspy.settings.lm
@@ -409,7 +558,7 @@ with tab_analyze:
                         'relevant_count': summary.relevant_articles,
                         'model': active_model,
                         'temperature': effective_settings.analysis_temperature,
-                        'few_shot_count': 9,  # From examples.py
+                        'few_shot_count': analyst.few_shot_count,
                     }
 
                 
@@ -417,16 +566,38 @@ with tab_analyze:
                 status_text.text("✅ Tamamlandı!")
                 
             except GoldSenseError as exc:
+                _fail_run(f"{type(exc).__name__}: {exc}")
                 st.error(f"Çalıştırma hatası: {exc}")
                 st.stop()
 
-            st.session_state.analysis = (price, summary, results)
+            st.session_state.analysis = (quote, summary, results)
+            st.session_state.result_frame = result_frame
             st.success("✅ Analiz tamamlandı! Aşağıda sonuçları görebilirsin.")
             st.rerun()  # Refresh to show results
 
         if st.session_state.analysis:
-            price, summary, results = st.session_state.analysis
-            ui.render_results(price, summary, results, confidence_threshold)
+            quote, summary, results = st.session_state.analysis
+
+            failures = st.session_state.analysis_failures
+            if failures:
+                st.warning(
+                    f"⚠️ {len(failures)}/{len(results) + len(failures)} haber "
+                    f"{effective_settings.analysis_max_attempts} denemeye rağmen analiz edilemedi. "
+                    "Sonuçlar kalan haberlerle hesaplandı."
+                )
+                with st.expander("Başarısız Haberler", expanded=False):
+                    for failure in failures:
+                        st.caption(f"**{failure.article.title}** ({failure.attempts} deneme): {failure.error}")
+
+            chart_source = _price_history_source(quote)
+            ui.render_results(
+                quote.price if quote is not None else None, summary, results, confidence_threshold,
+                frame=st.session_state.get("result_frame"),
+                price_history=_load_price_history(results, chart_source),
+                price_unit=quote.unit if quote is not None else source_unit(effective_settings, chart_source),
+            )
+
+            _render_index_section()
             
             # Basit İstatistik Özeti
             st.divider()
@@ -475,6 +646,106 @@ with tab_analyze:
             
             st.info("👆 Hazır olduğunda yukarıdaki butona basarak analizi başlatabilirsin.")
 
+# --- GEÇMİŞ SEKMESİ ---
+with tab_history:
+    st.subheader("🗂️ Analiz Geçmişi")
+    st.caption("Kaydedilmiş tüm analizlerde metin arar; tarih, kategori, kaynak, güven ve modele göre filtreler")
+
+    history = AnalysisHistory(logger.index_path)
+    facets = history.facets()
+    search_text = st.text_input(
+        "Metin ara",
+        placeholder="ör. fed faiz, iran, merkez bankası",
+        help="Başlık, açıklama ve etki gerekçesinde arar; büyük/küçük harf (İ/ı) ve aksanlar fark etmez. "
+        "Arama yapılırken sonuçlar benzerliğe göre sıralanır.",
+        key="history_search",
+    )
+    col_a, col_b = st.columns(2)
+    date_range = col_a.date_input(
+        "Yayın tarihi aralığı",
+        value=(datetime.now(timezone.utc).date() - timedelta(days=30), datetime.now(timezone.utc).date()),
+        key="history_dates",
+    )
+    min_confidence = col_b.slider("Minimum güven", 0.0, 1.0, 0.0, 0.05, key="history_confidence")
+    col_c, col_d, col_e = st.columns(3)
+    categories = col_c.multiselect("Kategori", facets["categories"], key="history_categories")
+    sources = col_d.multiselect("Kaynak", facets["sources"], key="history_sources")
+    models = col_e.multiselect("Model", facets["models"], key="history_models")
+    col_f, col_g, col_h = st.columns(3)
+    sort_labels = {"published_at": "Yayın tarihi", "logged_at": "Kayıt zamanı", "confidence": "Güven", "sentiment": "Etki puanı"}
+    sort = col_f.selectbox("Sıralama", list(sort_labels), format_func=sort_labels.get, key="history_sort")
+    page_size = col_g.selectbox("Sayfa boyutu", [25, 50, 100, 250], index=1, key="history_page_size")
+    page_number = col_h.number_input("Sayfa", min_value=1, value=1, step=1, key="history_page")
+
+    start_date, end_date = (date_range[0], date_range[-1]) if date_range else (None, None)
+    filters = HistoryFilter(
+        start=datetime.combine(start_date, datetime.min.time(), timezone.utc) if start_date else None,
+        end=datetime.combine(end_date + timedelta(days=1), datetime.min.time(), timezone.utc) if end_date else None,
+        categories=tuple(categories),
+        sources=tuple(sources),
+        models=tuple(models),
+        min_confidence=min_confidence or None,
+    )
+    if search_text.strip():
+        history_page = history.search(search_text, filters, page=int(page_number), page_size=page_size)
+    else:
+        history_page = history.query(filters, page=int(page_number), page_size=page_size, sort=sort)
+    st.caption(f"{history_page.total} kayıt, sayfa {history_page.page}/{history_page.pages}")
+
+    if history_page.results:
+        history_frame = ResultFrame.from_results(history_page.results)
+        chart_source = _price_history_source()
+        ui.render_results(
+            None,
+            engine.summarize_frame(history_frame),
+            history_page.results,
+            confidence_threshold,
+            frame=history_frame,
+            price_history=_load_price_history(history_page.results, chart_source),
+            key="history",
+            price_unit=source_unit(effective_settings, chart_source),
+        )
+    else:
+        st.info("Bu filtrelere uyan kayıtlı analiz yok.")
+
+# --- CANLI SEKMESİ ---
+with tab_live:
+    st.subheader("📡 Canlı Özet")
+    st.caption("Arka plan servisinin yazdığı durum dosyasını okur; analiz bu sekmede çalışmaz")
+
+    if daemon_state is None:
+        st.info("Arka plan servisi henüz çalışmadı. Başlatmak için:")
+        st.code("PYTHONPATH=src python -m goldsense daemon --interval 900 --window 24h", language="bash")
+    else:
+        if st.button("🔄 Yenile", key="live_refresh"):
+            st.rerun()
+        status_labels = {"starting": "Başlıyor", "running": "Çalışıyor", "stopped": "Durdu"}
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Durum", status_labels.get(daemon_state.status, daemon_state.status))
+        col2.metric("Yoklama", daemon_state.polls)
+        col3.metric("Analiz edilen", daemon_state.analyzed_total)
+        col4.metric("Kuyruk", sum(daemon_state.queues.values()))
+        st.caption(
+            f"Son güncelleme: {daemon_state.updated_at} · Son yoklama: {daemon_state.last_poll_at or '-'} · "
+            f"Pencere: son {daemon_state.window_hours:g} saat"
+        )
+        if daemon_state.last_error:
+            st.warning(f"Son hata: {daemon_state.last_error}")
+
+        live_summary = daemon_state.market_summary()
+        if live_summary is not None and live_summary.total_articles:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Ağırlıklı Skor", f"{live_summary.weighted_score:.1f}/10")
+            col2.metric("İlgili Haber", f"{live_summary.relevant_articles}/{live_summary.total_articles}")
+            sentiment = daemon_state.sentiment or {}
+            col3.metric(
+                "Duygu Endeksi",
+                f"{sentiment['value']:.2f}/10" if sentiment.get("value") is not None else "Veri Yok",
+            )
+            st.caption("Haber ayrıntıları: \"Analiz\" sekmesi (manuel analiz kapalıyken)")
+        else:
+            st.info("Pencerede henüz analiz yok.")
+
 # --- PERFORMANS RAPORU SEKMESİ ---
 with tab_perf:
     st.subheader("📊 DSPy Performans Raporu")
@@ -505,6 +776,10 @@ with tab_perf:
             col4.metric("Model", st.session_state.token_usage.get('model', 'N/A').split('/')[-1] if st.session_state.token_usage.get('model') else 'N/A')
             
             st.divider()
+
+        if st.session_state.run_metrics:
+            ui.render_run_metrics(st.session_state.run_metrics)
+            st.divider()
         
         # Few-Shot Examples Display
         st.markdown("### 📚 DSPy Few-Shot Eğitim Seti")
@@ -0,0 +1,177 @@
+"""Requests/second for the local HTTP API under concurrent keep-alive load.
+
+Seeds a temp log with synthetic analyses and a daemon state file, starts
+`ApiServer` in a separate process (so the load generator does not share its
+event loop) and drives every endpoint from `--connections` concurrent
+keep-alive connections for `--seconds` each. The server runs twice: with
+the response caches and with `cache_seconds=0` (every request rebuilt).
+
+    python scripts/benchmark_api.py --connections 32 --seconds 3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.api import ApiServer
+from goldsense.engine import MarketEngine
+from goldsense.history import AnalysisHistory
+from goldsense.logger import JsonlLogger
+from goldsense.models import AnalysisResult, NewsArticle
+from goldsense.serialization import dumps
+
+CATEGORIES = ("Macro", "Geopolitical", "Industrial", "Irrelevant")
+
+
+def _seed(directory: Path, count: int) -> tuple[Path, Path]:
+    now = datetime.now(timezone.utc)
+    results = [
+        AnalysisResult(
+            article=NewsArticle(
+                title=f"Gold headline {i}",
+                description="Central bank demand and rate expectations move bullion.",
+                published_at=now - timedelta(minutes=7 * i),
+                source=("Reuters", "Bloomberg", "CNBC")[i % 3],
+                url=f"https://bench.example/{i}",
+            ),
+            is_relevant=i % 4 != 3,
+            category=CATEGORIES[i % 4],
+            sentiment_score=1 + i % 10,
+            impact_reasoning="Lower real yields support gold.",
+            confidence_score=0.5 + (i % 5) / 10,
+        )
+        for i in range(count)
+    ]
+    logger = JsonlLogger(directory / "analysis.jsonl")
+    logger.log_many(results, model="bench")
+    state = {
+        "started_at": now.isoformat(),
+        "updated_at": now.isoformat(),
+        "status": "running",
+        "price": 2412.5,
+        "summary": asdict(MarketEngine().summarize(results[:200])),
+    }
+    state_path = directory / "daemon_state.json"
+    state_path.write_bytes(dumps(state))
+    return logger.index_path, state_path
+
+
+def _serve(index_path: Path, state_path: Path, cache_seconds: float, ready) -> None:
+    async def _main() -> None:
+        server = ApiServer(AnalysisHistory(index_path), state_path, cache_seconds=cache_seconds)
+        ready.put(await server.start())
+        await asyncio.Event().wait()
+
+    asyncio.run(_main())
+
+
+async def _worker(base: str, request: bytes, deadline: float, latencies: list[float], statuses: dict) -> None:
+    host, port = base.removeprefix("http://").split(":")
+    reader, writer = await asyncio.open_connection(host, int(port))
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            status = int(head.split(b" ", 2)[1])
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def _load(base: str, request: bytes, connections: int, seconds: float) -> tuple[float, list[float], dict]:
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    started = time.perf_counter()
+    deadline = started + seconds
+    await asyncio.gather(*(_worker(base, request, deadline, latencies, statuses) for _ in range(connections)))
+    return time.perf_counter() - started, latencies, statuses
+
+
+def _request(method: str, path: str, body: bytes = b"", headers: dict | None = None) -> bytes:
+    extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    return f"{method} {path} HTTP/1.1\r\nHost: bench\r\n{extra}Content-Length: {len(body)}\r\n\r\n".encode() + body
+
+
+async def _etag(base: str, path: str) -> str:
+    host, port = base.removeprefix("http://").split(":")
+    reader, writer = await asyncio.open_connection(host, int(port))
+    writer.write(_request("GET", path, headers={"Connection": "close"}))
+    head = await reader.readuntil(b"\r\n\r\n")
+    writer.close()
+    for line in head.decode("latin-1").split("\r\n"):
+        if line.lower().startswith("etag:"):
+            return line.split(":", 1)[1].strip()
+    raise SystemExit(f"No ETag for {path}")
+
+
+async def _bench(base: str, args: argparse.Namespace) -> None:
+    articles = [
+        {"title": f"Gold {i}", "description": "Bullion rises", "source": {"name": "Reuters"},
+         "publishedAt": "2026-03-01T10:00:00Z", "url": f"https://bench.example/{i}", "urlToImage": "x"}
+        for i in range(100)
+    ]
+    analyses = "/analyses?since=7d&limit=50"
+    scenarios = [
+        ("GET /summary", _request("GET", "/summary")),
+        (f"GET {analyses}", _request("GET", analyses)),
+        (f"GET {analyses} (304)", _request("GET", analyses, headers={"If-None-Match": await _etag(base, analyses)})),
+        ("GET /price", _request("GET", "/price")),
+        ("POST /tonl/encode (100)", _request("POST", "/tonl/encode", dumps({"articles": articles}))),
+    ]
+    for name, request in scenarios:
+        elapsed, latencies, statuses = await _load(base, request, args.connections, args.seconds)
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+        codes = ",".join(f"{code}x{count}" for code, count in sorted(statuses.items()))
+        print(
+            f"  {name:<38} {len(latencies) / elapsed:9.0f} istek/sn   "
+            f"p50 {quantiles[49] * 1000:6.2f} ms  p99 {quantiles[98] * 1000:6.2f} ms  [{codes}]"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyses", type=int, default=5000, help="Synthetic analyses in the history index")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=3.0, help="Load duration per endpoint")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path, state_path = _seed(Path(tmp), args.analyses)
+        print(f"{args.analyses} analiz, {args.connections} eşzamanlı bağlantı, uç nokta başına {args.seconds:g} sn")
+        for label, cache_seconds in (("Önbellekli (cache_seconds=5)", 5.0), ("Önbelleksiz (cache_seconds=0)", 0.0)):
+            ready = context.Queue()
+            process = context.Process(target=_serve, args=(index_path, state_path, cache_seconds, ready), daemon=True)
+            process.start()
+            try:
+                base = ready.get(timeout=30)
+                print(label)
+                asyncio.run(_bench(base, args))
+            finally:
+                process.terminate()
+                process.join()
+
+
+if __name__ == "__main__":
+    main()
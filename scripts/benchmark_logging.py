@@ -0,0 +1,70 @@
+"""Records/second for the analysis log write paths.
+
+Compares one `log()` call per result, a single `log_many()` batch and the
+background `BufferedJsonlWriter`, each on a fresh log in a temp directory.
+
+    python scripts/benchmark_logging.py --count 5000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.logger import BufferedJsonlWriter, JsonlLogger, read_results
+
+LOG_PATH = ROOT / "logs" / "analysis.jsonl"
+
+
+def _results(count: int) -> list:
+    templates = list(read_results(LOG_PATH))
+    if not templates:
+        raise SystemExit(f"No analyses in {LOG_PATH}")
+    results = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        results.append(replace(template, article=replace(template.article, url=f"https://bench.example/{i}")))
+    return results
+
+
+def _per_record(logger: JsonlLogger, results: list) -> None:
+    for result in results:
+        logger.log(result)
+
+
+def _batch(logger: JsonlLogger, results: list) -> None:
+    logger.log_many(results)
+
+
+def _buffered(logger: JsonlLogger, results: list) -> None:
+    writer = BufferedJsonlWriter(logger)
+    writer.submit_many(results)
+    writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = _results(args.count)
+    for name, write in (("log() per record", _per_record), ("log_many()", _batch), ("buffered writer", _buffered)):
+        with tempfile.TemporaryDirectory() as directory:
+            logger = JsonlLogger(Path(directory) / "analysis.jsonl")
+            started = time.perf_counter()
+            write(logger, results)
+            elapsed = time.perf_counter() - started
+            assert sum(1 for _ in read_results(logger.path)) == len(results)
+        print(f"{name:<18} {len(results) / elapsed:>10,.0f} kayıt/sn  ({elapsed:.3f} sn)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Measure memory per analysis record: dict-backed vs slotted models.
+
+Builds N AnalysisResults (cycling through logs/analysis.jsonl, with
+per-record titles/URLs so strings are not trivially shared) and reports
+tracemalloc bytes per record for the old `@dataclass(frozen=True)` layout
+and the current slotted, interned one.
+
+    python scripts/benchmark_model_memory.py --count 200000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.logger import read_results
+from goldsense.models import AnalysisResult, NewsArticle
+
+LOG_PATH = ROOT / "logs" / "analysis.jsonl"
+
+
+# Pre-slots layout, kept here only as the baseline
+@dataclass(frozen=True)
+class DictNewsArticle:
+    title: str
+    description: str
+    published_at: datetime
+    source: str | None = None
+    url: str | None = None
+
+
+@dataclass(frozen=True)
+class DictAnalysisResult:
+    article: DictNewsArticle
+    is_relevant: bool
+    category: str
+    sentiment_score: int
+    impact_reasoning: str
+    rationale: str | None = None
+    confidence_score: float = 0.5
+
+
+def _rows(count: int) -> list[dict]:
+    templates = list(read_results(LOG_PATH))
+    if not templates:
+        raise SystemExit(f"No analyses in {LOG_PATH}")
+    rows = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        article = {f.name: getattr(template.article, f.name) for f in fields(NewsArticle)}
+        # Fresh string objects per record, like json.loads produces
+        article["title"] = f"{template.article.title} #{i}"
+        article["url"] = f"{template.article.url or 'https://example.com/'}?n={i}"
+        article["source"] = "".join(template.article.source or "")
+        result = {f.name: getattr(template, f.name) for f in fields(AnalysisResult) if f.name != "article"}
+        result["category"] = "".join(template.category)
+        rows.append({"article": article, "result": result})
+    return rows
+
+
+def _measure(rows: list[dict], article_cls, result_cls) -> tuple[float, list]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [result_cls(article=article_cls(**row["article"]), **row["result"]) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(rows), records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = _rows(args.count)
+    # New title/url strings are allocated before measuring, so both layouts
+    # are charged only for their own objects plus any strings they keep.
+    baseline, kept = _measure(rows, DictNewsArticle, DictAnalysisResult)
+    del kept
+    slotted, kept = _measure(rows, NewsArticle, AnalysisResult)
+    del kept
+
+    print(f"Records:            {args.count:,}")
+    print(f"dict dataclasses:   {baseline:8.1f} B/record")
+    print(f"slotted + interned: {slotted:8.1f} B/record")
+    print(f"Saved:              {baseline - slotted:8.1f} B/record ({1 - slotted / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Compare the full and lean analysis output modes.
+
+Reports completion tokens, (simulated) latency and agreement of the lean
+verdicts with the full six-field answers.
+
+Record real responses once (needs .env, spends provider quota):
+    python scripts/benchmark_output_modes.py --record --limit 20
+
+Replay them offline through a stub LM (no network, deterministic):
+    python scripts/benchmark_output_modes.py
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+import dspy
+from dotenv import load_dotenv
+
+from goldsense.analyst import GoldAnalyst
+from goldsense.config import Settings
+from goldsense.fetcher import NewsFetcher
+from goldsense.models import AnalysisResult, NewsArticle
+
+MODES = ("full", "lean")
+RAW_NEWS_PATH = ROOT / "logs" / "raw_news.json"
+FIXTURE_PATH = ROOT / "logs" / "output_modes_fixture.json"
+_TITLE_RE = re.compile(r"\[\[ ## title ## \]\]\n(.*?)\n\n\[\[ ## description ## \]\]", re.DOTALL)
+
+
+def _title_from_messages(messages: list[dict]) -> str:
+    match = _TITLE_RE.search(messages[-1]["content"])
+    if not match:
+        raise ValueError("Article title not found in the final prompt message")
+    return match.group(1).strip()
+
+
+class ReplayLM(dspy.LM):
+    """Stub LM that answers from recorded completions.
+
+    Latency is simulated as time-to-first-token plus completion tokens over a
+    fixed decode throughput, so shorter answers are measurably faster.
+    """
+
+    def __init__(self, responses: dict[str, dict], ttft_seconds: float, tokens_per_second: float):
+        super().__init__("openai/replay-stub", cache=False)
+        self.responses = responses
+        self.ttft_seconds = ttft_seconds
+        self.tokens_per_second = tokens_per_second
+
+    def __call__(self, prompt=None, messages=None, **kwargs):
+        recorded = self.responses[_title_from_messages(messages)]
+        usage = recorded["usage"]
+        time.sleep(self.ttft_seconds + usage.get("completion_tokens", 0) / self.tokens_per_second)
+        self.history.append({
+            "messages": messages,
+            "kwargs": kwargs,
+            "outputs": [recorded["text"]],
+            "usage": usage,
+            "cost": None,
+            "model": self.model,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        })
+        return [recorded["text"]]
+
+
+def _load_articles(limit: int) -> list[NewsArticle]:
+    payload = json.loads(RAW_NEWS_PATH.read_text(encoding="utf-8"))
+    items = [item for item in payload.get("articles", []) if item.get("title")]
+    return [NewsFetcher._parse_article(item) for item in items[:limit]]
+
+
+def _record(settings: Settings, articles: list[NewsArticle]) -> None:
+    fixture: dict[str, dict] = {}
+    for mode in MODES:
+        lm = dspy.LM(
+            f"openai/{settings.cerebras_model}",
+            api_key=settings.cerebras_api_key,
+            api_base=settings.cerebras_api_base,
+            temperature=settings.analysis_temperature,
+            cache=False,
+        )
+        dspy.configure(lm=lm)
+        analyst = GoldAnalyst(replace(settings, analysis_output_mode=mode))
+        asyncio.run(analyst.analyze_batch(articles))
+
+        fixture[mode] = {}
+        for entry in lm.history:
+            outputs = entry.get("outputs") or [entry["response"].choices[0].message.content]
+            usage = dict(entry.get("usage") or {})
+            fixture[mode][_title_from_messages(entry["messages"])] = {
+                "text": outputs[0],
+                "usage": {
+                    "prompt_tokens": usage.get("prompt_tokens", 0),
+                    "completion_tokens": usage.get("completion_tokens", 0),
+                },
+            }
+        print(f"{mode}: {len(fixture[mode])} yanıt kaydedildi")
+
+    FIXTURE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    FIXTURE_PATH.write_text(json.dumps(fixture, ensure_ascii=False), encoding="utf-8")
+    print(f"Fixture: {FIXTURE_PATH}")
+
+
+def _agreement(full: list[AnalysisResult], lean: list[AnalysisResult]) -> dict[str, float]:
+    lean_by_title = {r.article.title: r for r in lean}
+    pairs = [(f, lean_by_title[f.article.title]) for f in full if f.article.title in lean_by_title]
+    if not pairs:
+        return {"pairs": 0}
+    return {
+        "pairs": len(pairs),
+        "relevance": sum(f.is_relevant == l.is_relevant for f, l in pairs) / len(pairs),
+        "category": sum(f.category == l.category for f, l in pairs) / len(pairs),
+        "score_within_1": sum(abs(f.sentiment_score - l.sentiment_score) <= 1 for f, l in pairs) / len(pairs),
+        "mean_abs_score_diff": sum(abs(f.sentiment_score - l.sentiment_score) for f, l in pairs) / len(pairs),
+    }
+
+
+def _replay(settings: Settings, articles: list[NewsArticle], ttft: float, tps: float) -> None:
+    fixture = json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
+    results: dict[str, list[AnalysisResult]] = {}
+
+    print(f"{'Mod':<6} {'Completion tok':>15} {'Prompt tok':>11} {'p50 (sn)':>9} {'p95 (sn)':>9} {'Toplam (sn)':>12}")
+    for mode in MODES:
+        recorded = fixture[mode]
+        subset = [a for a in articles if a.title in recorded]
+        dspy.configure(lm=ReplayLM(recorded, ttft_seconds=ttft, tokens_per_second=tps))
+        analyst = GoldAnalyst(replace(settings, analysis_output_mode=mode, analysis_max_attempts=1))
+        batch = asyncio.run(analyst.analyze_batch(subset))
+        results[mode] = batch.results
+
+        m = batch.metrics
+        print(
+            f"{mode:<6} {m.completion_tokens:>15} {m.prompt_tokens:>11} "
+            f"{m.latency_p50:>9.2f} {m.latency_p95:>9.2f} {m.wall_seconds:>12.2f}"
+        )
+
+    print("\nLean ↔ Full uyumu:")
+    for key, value in _agreement(results["full"], results["lean"]).items():
+        print(f"  {key:<20} {value:.2f}" if isinstance(value, float) else f"  {key:<20} {value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", action="store_true", help="Call the real provider and save responses")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--ttft", type=float, default=0.15, help="Simulated time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=450.0, help="Simulated decode speed")
+    args = parser.parse_args()
+
+    load_dotenv()
+    settings = Settings.from_env()
+    articles = _load_articles(args.limit)
+
+    if args.record:
+        settings.validate()
+        _record(settings, articles)
+    elif not FIXTURE_PATH.exists():
+        sys.exit(f"Fixture bulunamadı: {FIXTURE_PATH}. Önce --record ile kayıt alın.")
+    else:
+        _replay(settings, articles, args.ttft, args.tokens_per_second)
+
+
+if __name__ == "__main__":
+    main()
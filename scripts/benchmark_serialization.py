@@ -0,0 +1,96 @@
+"""Encode/decode throughput of the analysis log line formats.
+
+Compares the old path (`asdict` + stdlib `json.dumps`) with the
+hand-written `result_to_dict` under each installed JSON backend, using the
+analyses in logs/analysis.jsonl, and reports the raw_news.json size with and
+without indentation.
+
+    python scripts/benchmark_serialization.py --rounds 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense import serialization
+from goldsense.logger import read_results
+from goldsense.serialization import result_to_dict
+
+LOG_PATH = ROOT / "logs" / "analysis.jsonl"
+RAW_NEWS_PATH = ROOT / "logs" / "raw_news.json"
+
+
+def _stdlib_asdict(result) -> bytes:
+    payload = asdict(result)
+    payload["article"]["published_at"] = result.article.published_at.isoformat()
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _encoders() -> dict:
+    encoders = {
+        "asdict + json": _stdlib_asdict,
+        "result_to_dict + json": lambda r: json.dumps(result_to_dict(r), ensure_ascii=False).encode("utf-8") + b"\n",
+    }
+    if serialization.ujson is not None:
+        encoders["result_to_dict + ujson"] = lambda r: serialization.ujson.dumps(
+            result_to_dict(r), ensure_ascii=False, escape_forward_slashes=False
+        ).encode("utf-8") + b"\n"
+    if serialization.orjson is not None:
+        encoders["result_to_dict + orjson"] = lambda r: serialization.orjson.dumps(result_to_dict(r)) + b"\n"
+    return encoders
+
+
+def _decoders() -> dict:
+    decoders = {"json": json.loads}
+    if serialization.ujson is not None:
+        decoders["ujson"] = serialization.ujson.loads
+    if serialization.orjson is not None:
+        decoders["orjson"] = serialization.orjson.loads
+    return decoders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    results = list(read_results(LOG_PATH))
+    if not results:
+        raise SystemExit(f"No analyses in {LOG_PATH}")
+    count = len(results) * args.rounds
+    print(f"{len(results)} kayıt x {args.rounds} tur, varsayılan arka uç: {serialization.BACKEND}")
+
+    lines = []
+    for name, encode in _encoders().items():
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            lines = [encode(result) for result in results]
+        elapsed = time.perf_counter() - started
+        print(f"yaz  {name:<24} {count / elapsed:>12,.0f} kayıt/sn")
+
+    for name, decode in _decoders().items():
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            for line in lines:
+                decode(line)
+        elapsed = time.perf_counter() - started
+        print(f"oku  {name:<24} {count / elapsed:>12,.0f} kayıt/sn")
+
+    if RAW_NEWS_PATH.exists():
+        payload = json.loads(RAW_NEWS_PATH.read_text(encoding="utf-8"))
+        indented = len(json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8"))
+        compact = len(serialization.dumps(payload))
+        print(f"raw_news.json: {indented:,} -> {compact:,} bayt (girintisiz)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Offline load test of GoldAnalyst against the bundled stub LLM server.
+
+No network and no provider quota: the stub answers from a replay fixture
+(see `python -m goldsense.stub_server --record`) or synthesizes answers.
+
+    python scripts/load_test.py --articles 200 --concurrency 12 --rate-limit-rate 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+import dspy
+from dotenv import load_dotenv
+
+from goldsense.analyst import GoldAnalyst
+from goldsense.config import Settings
+from goldsense.fetcher import NewsFetcher
+from goldsense.models import NewsArticle
+from goldsense.stub_server import LATENCY_DISTRIBUTIONS, StubConfig, StubLLMServer
+
+RAW_NEWS_PATH = ROOT / "logs" / "raw_news.json"
+
+
+def _load_articles(count: int) -> list[NewsArticle]:
+    payload = json.loads(RAW_NEWS_PATH.read_text(encoding="utf-8"))
+    base = [NewsFetcher._parse_article(item) for item in payload.get("articles", []) if item.get("title")]
+    # Repeat the recorded articles with distinct titles to reach the requested volume
+    articles = []
+    for i in range(count):
+        article = base[i % len(base)]
+        if i >= len(base):
+            article = replace(article, title=f"{article.title} #{i // len(base)}")
+        articles.append(article)
+    return articles
+
+
+async def _run(args: argparse.Namespace) -> None:
+    stub = StubLLMServer(StubConfig(
+        latency=args.latency,
+        latency_mean_seconds=args.latency_mean,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+        fixture_path=args.fixture,
+    ))
+    api_base = await stub.start()
+
+    load_dotenv()
+    settings = replace(
+        Settings.from_env(),
+        cerebras_model="stub",
+        max_concurrency=args.concurrency,
+        analysis_output_mode=args.mode,
+        analysis_retry_base_delay=args.retry_delay,
+    )
+    # num_retries=0: let GoldAnalyst's own retry queue handle 429/500s so they show in the report
+    dspy.configure(lm=dspy.LM("openai/stub", api_key="stub", api_base=api_base, cache=False, num_retries=0))
+
+    analyst = GoldAnalyst(settings)
+    articles = _load_articles(args.articles)
+    batch = await analyst.analyze_batch(articles)
+    await stub.stop()
+
+    m = batch.metrics
+    print(f"Haber: {len(articles)} | Başarılı: {len(batch.results)} | Başarısız: {len(batch.failures)}")
+    print(f"Süre: {m.wall_seconds:.2f} sn | Verim: {len(batch.results) / m.wall_seconds:.1f} haber/sn")
+    print(f"Gecikme p50/p95/p99: {m.latency_p50:.2f} / {m.latency_p95:.2f} / {m.latency_p99:.2f} sn")
+    print(f"Kuyruk p50/p95/p99: {m.queue_wait_p50:.2f} / {m.queue_wait_p95:.2f} / {m.queue_wait_p99:.2f} sn")
+    print(f"Token: {m.prompt_tokens} prompt + {m.completion_tokens} completion | Tekrar: {m.retries}")
+    print(f"Stub: {stub.stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--mode", choices=("full", "lean"), default="full")
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-mean", type=float, default=0.3)
+    parser.add_argument("--tokens-per-second", type=float, default=450.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-delay", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixture", type=Path, default=ROOT / "logs" / "llm_fixture.json")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,12 @@ def main() -> None:
     except Exception as exc:
         print(f"Fiyat hatası: {exc}")
 
+    for source in checker.price_source_states():
+        print(
+            f"  {source['name']}: {source['state']} | ardışık hata: {source['failures']}"
+            + (f" | tekrar deneme: {source['retry_in_seconds']} sn" if source["state"] == "open" else "")
+        )
+
 
 if __name__ == "__main__":
     main()
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import asyncio
+import copy
+import hashlib
+import json
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Literal
 
 import dspy
 
 from .config import Settings
 from .exceptions import ExternalServiceError
-from .models import AnalysisResult, Category, NewsArticle
+from .lean import max_completion_tokens, parse_verdict, verdict_description
+from .metrics import CallMetrics, MetricsCollector
+from .models import AnalysisFailure, AnalysisResult, BatchAnalysis, Category, NewsArticle
 
 
 class GoldSignalSignature(dspy.Signature):
@@ -56,42 +64,191 @@ class GoldSignalSignature(dspy.Signature):
         )
 
 
+class LeanGoldSignalSignature(dspy.Signature):
+    """Analyze a news article for gold market impact. Answer with one compact JSON verdict; impact text in Turkish."""
+
+    title: str = dspy.InputField(
+        desc="The news headline or title to be analyzed"
+    )
+    description: str = dspy.InputField(
+        desc="The news summary or description providing context"
+    )
+
+    verdict: str = dspy.OutputField(
+        desc="Compact single-line JSON verdict"  # Replaced with the configured schema in GoldAnalyst
+    )
+
+
+@contextmanager
+def _capture_lm_calls(lm_calls: list[dict] | None):
+    """Route this thread's LM requests through a private history list.
+
+    `lm.history` is shared by all worker threads, so reading its tail after a
+    call is racy. A shallow copy of the LM with its own history (installed via
+    the thread-local `dspy.context`) isolates this call's usage entries; they
+    are copied back to the shared history so `inspect_history` keeps working.
+    """
+    lm = dspy.settings.lm
+    if lm_calls is None or lm is None:
+        yield
+        return
+
+    call_lm = copy.copy(lm)
+    call_lm.history = []
+    try:
+        with dspy.context(lm=call_lm):
+            yield
+    finally:
+        lm_calls.extend(call_lm.history)
+        if isinstance(getattr(lm, "history", None), list):
+            lm.history.extend(call_lm.history)
+
+
 @dataclass
 class GoldAnalyst:
     settings: Settings
 
     def __post_init__(self) -> None:
         # We assume dspy.configure() is called globally in app.py (Dependency Injection pattern)
-        
-        # 1. Create the basic ChainOfThought module
-        self._predict = dspy.ChainOfThought(GoldSignalSignature)
-        
+        from dspy.teleprompt import LabeledFewShot
+        from .examples import TRAINING_SET, lean_training_set
+
+        if self.settings.analysis_output_mode == "lean":
+            # Lean mode: one compact JSON field, no ChainOfThought reasoning field,
+            # so completions are a fraction of the full six-field answer.
+            signature = LeanGoldSignalSignature.with_updated_fields(
+                "verdict",
+                desc=verdict_description(
+                    self.settings.lean_include_rationale,
+                    self.settings.lean_reasoning_max_tokens,
+                    self.settings.lean_rationale_max_tokens,
+                ),
+            )
+            student = dspy.Predict(signature)
+            trainset = lean_training_set(self.settings.lean_include_rationale)
+        else:
+            # 1. Create the basic ChainOfThought module
+            student = dspy.ChainOfThought(GoldSignalSignature)
+            trainset = TRAINING_SET
+
         # 2. OPTIMIZATION: Compile with Few-Shot Examples using LabeledFewShot
         # This injects our curated examples into the prompt context.
-        # k=len(TRAINING_SET) means we use all examples we provided.
-        from dspy.teleprompt import LabeledFewShot
-        from .examples import TRAINING_SET
-        
-        teleprompter = LabeledFewShot(k=len(TRAINING_SET))
-        self._predict = teleprompter.compile(student=self._predict, trainset=TRAINING_SET)
+        # k=len(trainset) means we use all examples we provided.
+        teleprompter = LabeledFewShot(k=len(trainset))
+        self._predict = teleprompter.compile(student=student, trainset=trainset)
+
+        # 3. CANONICAL PREFIX: LabeledFewShot samples demos in a shuffled order.
+        # Pin them to the declared order so every call (and every process)
+        # sends a byte-identical instructions + demos prefix that
+        # OpenAI-compatible servers can serve from their prompt (KV) cache.
+        # Only the final user turn - the article itself - varies per call.
+        for _, predictor in self._predict.named_predictors():
+            predictor.demos = list(trainset)
+        self._prefix_hash: str | None = None
 
 
     async def analyze_articles(self, articles: list[NewsArticle]) -> list[AnalysisResult]:
+        """Analyze articles and return only the successful results (input order)."""
+        batch = await self.analyze_batch(articles)
+        return batch.results
+
+    async def analyze_batch(self, articles: list[NewsArticle]) -> BatchAnalysis:
+        """Analyze articles, tolerating per-article failures.
+
+        A failed article is re-queued with exponential backoff until
+        `analysis_max_attempts` is spent; the semaphore slot is released
+        while it waits so other articles keep flowing. One bad LLM response
+        no longer discards the rest of the batch.
+
+        Every attempt is recorded in a `MetricsCollector`; the aggregated
+        `RunMetrics` are attached to the returned batch.
+        """
         semaphore = asyncio.Semaphore(self.settings.max_concurrency)
+        max_attempts = self.settings.analysis_max_attempts
+        collector = MetricsCollector(
+            prompt_cost_per_million=self.settings.prompt_cost_per_million,
+            completion_cost_per_million=self.settings.completion_cost_per_million,
+        )
+        run_started = time.perf_counter()
 
-        async def _bound_analyze(article: NewsArticle) -> AnalysisResult:
+        async def _timed_attempt(article: NewsArticle, attempt: int) -> AnalysisResult:
+            enqueued = time.perf_counter()
             async with semaphore:
-                return await asyncio.to_thread(self._analyze_one, article)
+                started = time.perf_counter()
+                lm_calls: list[dict] = []
+                succeeded = False
+                try:
+                    result = await asyncio.to_thread(self._analyze_one, article, lm_calls)
+                    succeeded = True
+                    return result
+                finally:
+                    collector.record(CallMetrics.from_history(
+                        lm_calls,
+                        article_url=article.url,
+                        queue_wait_seconds=started - enqueued,
+                        latency_seconds=time.perf_counter() - started,
+                        retries=attempt - 1,
+                        succeeded=succeeded,
+                        default_model=self.settings.cerebras_model,
+                    ))
+
+        async def _analyze_with_retry(article: NewsArticle) -> AnalysisResult | AnalysisFailure:
+            last_error: ExternalServiceError | None = None
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return await _timed_attempt(article, attempt)
+                except ExternalServiceError as exc:
+                    last_error = exc
+                    if attempt < max_attempts:
+                        await asyncio.sleep(self._retry_delay(attempt))
+            return AnalysisFailure(article=article, error=str(last_error), attempts=max_attempts)
+
+        outcomes = await asyncio.gather(*(_analyze_with_retry(article) for article in articles))
+        return BatchAnalysis(
+            results=[o for o in outcomes if isinstance(o, AnalysisResult)],
+            failures=[o for o in outcomes if isinstance(o, AnalysisFailure)],
+            metrics=collector.summarize(
+                wall_seconds=time.perf_counter() - run_started,
+                prefix_hash=self.prefix_hash,
+            ),
+        )
+
+    def format_prompt(self, article: NewsArticle) -> list[dict]:
+        """Chat messages DSPy will send for `article` (no LM call is made)."""
+        _, predictor = self._predict.named_predictors()[0]
+        adapter = dspy.settings.adapter or dspy.ChatAdapter()
+        return adapter.format(
+            predictor.signature,
+            predictor.demos,
+            {"title": article.title, "description": article.description},
+        )
+
+    @property
+    def prefix_hash(self) -> str | None:
+        """SHA-256 of the cacheable prompt prefix (everything before the article turn).
+
+        Stable across calls and processes for the same signature, demos and
+        adapter; a change here means provider-side prompt caches go cold.
+        """
+        if getattr(self, "_prefix_hash", None) is None and self._predict.named_predictors():
+            probe = NewsArticle(title="", description="", published_at=datetime(1970, 1, 1, tzinfo=timezone.utc))
+            prefix = self.format_prompt(probe)[:-1]
+            encoded = json.dumps(prefix, ensure_ascii=False, sort_keys=True).encode("utf-8")
+            self._prefix_hash = hashlib.sha256(encoded).hexdigest()
+        return getattr(self, "_prefix_hash", None)
+
+    @property
+    def few_shot_count(self) -> int:
+        """Number of demos actually injected into the prompt."""
+        return max((len(p.demos) for _, p in self._predict.named_predictors()), default=0)
 
-        tasks = [_bound_analyze(article) for article in articles]
-        return await asyncio.gather(*tasks)
+    def _retry_delay(self, attempt: int) -> float:
+        return self.settings.analysis_retry_base_delay * (2 ** (attempt - 1))
 
-    def _analyze_one(self, article: NewsArticle) -> AnalysisResult:
+    def _analyze_one(self, article: NewsArticle, lm_calls: list[dict] | None = None) -> AnalysisResult:
         try:
-            result = self._predict(
-                title=article.title,
-                description=article.description
-            )
+            with _capture_lm_calls(lm_calls):
+                result = self._run_predict(article)
             
             # DSPy Assertions for validation
             score_value = int(result.sentiment_score) if hasattr(result, 'sentiment_score') else 5
@@ -139,6 +296,28 @@ class GoldAnalyst:
             confidence_score=confidence_score,  # Model's confidence in this analysis
         )
 
+    def _run_predict(self, article: NewsArticle):
+        if self.settings.analysis_output_mode != "lean":
+            return self._predict(
+                title=article.title,
+                description=article.description
+            )
+
+        include_rationale = self.settings.lean_include_rationale
+        reasoning_cap = self.settings.lean_reasoning_max_tokens
+        rationale_cap = self.settings.lean_rationale_max_tokens
+        prediction = self._predict(
+            title=article.title,
+            description=article.description,
+            config={"max_tokens": max_completion_tokens(include_rationale, reasoning_cap, rationale_cap)},
+        )
+        # Same attribute names as the full signature, so validation below is shared
+        return parse_verdict(
+            prediction.verdict,
+            reasoning_max_tokens=reasoning_cap,
+            rationale_max_tokens=rationale_cap if include_rationale else None,
+        )
+
     @staticmethod
     def _clamp_score(score: int) -> int:
         try:
@@ -0,0 +1,256 @@
+"""Local read-only HTTP API for other tools (standard library, asyncio).
+
+    GET  /summary                     rolling MarketSummary (daemon state, else history)
+    GET  /analyses?since=24h&limit=50 logged analyses, newest first
+    GET  /price                       latest gold quote with its unit (shared price cache)
+    POST /tonl/encode                 NewsAPI payload (or article list) -> TONL text
+
+Responses are encoded once and served from memory with a strong ETag;
+`If-None-Match` gets an empty 304. Cached bodies are dropped when the
+history index or the daemon state file changes (checked at most every
+`check_seconds`) and rebuilt after `cache_seconds` at the latest, so
+relative `since` windows drift by no more than that.
+
+    python -m goldsense serve --port 8088
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .daemon import read_state
+from .engine import MarketEngine
+from .history import AnalysisHistory, HistoryFilter, parse_since, read_only_uri
+from .httpserver import HttpRequest, HttpResponse, bound_port, start_http_server, stop_http_server
+from .price import GoldPriceService
+from .serialization import dumps, loads, result_to_dict
+from .tonl import encode_news_articles
+
+MAX_LIMIT = 500  # Largest /analyses page
+_CACHE_ENTRIES = 256  # Per endpoint; distinct query strings beyond this evict the oldest
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    content_type: str
+    etag: str
+    built_at: float  # time.monotonic()
+
+    @classmethod
+    def build(cls, body: bytes, content_type: str = "application/json") -> "CachedBody":
+        return cls(body, content_type, f'"{hashlib.sha256(body).hexdigest()[:20]}"', time.monotonic())
+
+
+@dataclass
+class ApiServer:
+    history: AnalysisHistory
+    state_path: Path | None = None
+    engine: MarketEngine = field(default_factory=MarketEngine)
+    price_service: GoldPriceService | None = None
+    window: timedelta = timedelta(hours=24)  # /summary without a daemon state file
+    cache_seconds: float = 5.0
+    check_seconds: float = 0.5
+    _caches: dict[str, OrderedDict[tuple, CachedBody]] = field(default_factory=dict, init=False, repr=False)
+    _pending: dict[tuple, asyncio.Future] = field(default_factory=dict, init=False, repr=False)
+    _generation: tuple | None = field(default=None, init=False, repr=False)
+    _checked_at: float = field(default=float("-inf"), init=False, repr=False)
+    _index: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+    _price_lock: asyncio.Lock | None = field(default=None, init=False, repr=False)
+    _server: asyncio.AbstractServer | None = field(default=None, init=False, repr=False)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL (port 0 picks a free port)."""
+        self._server = await start_http_server(self.handle, host, port)
+        return f"http://{host}:{bound_port(self._server)}"
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            await stop_http_server(self._server)  # Also closes idle keep-alive connections
+            self._server = None
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    async def handle(self, request: HttpRequest) -> HttpResponse:
+        routes = {
+            "/summary": ("GET", self._summary),
+            "/analyses": ("GET", self._analyses),
+            "/price": ("GET", self._price),
+            "/tonl/encode": ("POST", self._tonl),
+        }
+        route = routes.get(request.path.rstrip("/") or "/")
+        if route is None:
+            return HttpResponse.json({"error": f"Unknown path: {request.path}", "paths": list(routes)}, status=404)
+        method, build = route
+        if request.method != method:
+            return HttpResponse.json({"error": f"Use {method} for {request.path}"}, status=405, headers={"Allow": method})
+
+        self._check_generation()
+        try:
+            cached = await build(request)
+        except ValueError as exc:
+            return HttpResponse.json({"error": str(exc)}, status=400)
+        return _respond(request, cached)
+
+    # --- Endpoints ---
+
+    async def _summary(self, request: HttpRequest) -> CachedBody:
+        return await self._cached("summary", (), lambda: asyncio.to_thread(self._build_summary))
+
+    async def _analyses(self, request: HttpRequest) -> CachedBody:
+        since_raw = request.param("since", "24h")
+        try:
+            limit = int(request.param("limit", "50"))
+        except ValueError:
+            raise ValueError("limit must be an integer") from None
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+        since = parse_since(since_raw)
+        return await self._cached("analyses", (since_raw, limit), lambda: asyncio.to_thread(self._build_analyses, since_raw, since, limit))
+
+    async def _price(self, request: HttpRequest) -> CachedBody:
+        if self.price_service is None:
+            state = read_state(self.state_path) if self.state_path else None
+            payload = {
+                "price": state.price if state else None,
+                "unit": state.price_unit if state else None,
+                "source": "daemon",
+                "price_source": state.price_source if state else None,
+            }
+            return self._memo("price", (), dumps(payload))
+        if self._price_lock is None:
+            self._price_lock = asyncio.Lock()
+        async with self._price_lock:  # One inline fetch when the quote expired, not one per client
+            quote = await self.price_service.get_quote_async()
+        payload = {
+            "price": quote.price if quote else None,
+            "unit": quote.unit if quote else None,  # e.g. "TRY/g" (Truncgil GRA) or "USD/oz" (Binance PAXG)
+            "source": quote.source if quote else None,
+            "fetched_at": datetime.fromtimestamp(quote.fetched_at, timezone.utc).isoformat() if quote else None,
+            "state": self.price_service.cache.state(),
+        }
+        return self._memo("price", (), dumps(payload))
+
+    async def _tonl(self, request: HttpRequest) -> CachedBody:
+        key = (hashlib.sha256(request.body).digest(),)
+        cached = self._caches.get("tonl", {}).get(key)
+        if cached is not None:  # Same payload, same TONL: never stale
+            return cached
+        try:
+            payload = loads(request.body)
+        except ValueError:
+            raise ValueError("Body must be a JSON NewsAPI payload or a list of articles") from None
+        articles = payload.get("articles") if isinstance(payload, dict) else payload
+        if not isinstance(articles, list) or not all(isinstance(item, dict) for item in articles):
+            raise ValueError("Body must be a JSON NewsAPI payload or a list of articles")
+        text = await asyncio.to_thread(encode_news_articles, articles)
+        return self._store("tonl", key, CachedBody.build(text.encode("utf-8"), "text/plain; charset=utf-8"))
+
+    # --- Builders (run in a worker thread) ---
+
+    def _build_summary(self) -> CachedBody:
+        state = read_state(self.state_path) if self.state_path else None
+        if state is not None and state.summary is not None:
+            payload = {
+                "source": "daemon",
+                "updated_at": state.updated_at,
+                "window_hours": state.window_hours,
+                "price": state.price,
+                "summary": state.summary,
+            }
+        else:
+            now = datetime.now(timezone.utc)
+            results = list(self.history.iter_results(HistoryFilter(start=now - self.window)))
+            payload = {
+                "source": "history",
+                "updated_at": None,  # Only the daemon publishes; keeps the ETag stable across rebuilds
+                "window_hours": self.window / timedelta(hours=1),
+                "price": None,
+                "summary": asdict(self.engine.summarize(results)),
+            }
+        return CachedBody.build(dumps(payload))
+
+    def _build_analyses(self, since_raw: str, since: datetime, limit: int) -> CachedBody:
+        page = self.history.query(HistoryFilter(start=since), page_size=limit)
+        payload = {
+            "since": since_raw,  # As given: a resolved relative cut-off would change the ETag on every rebuild
+            "total": page.total,
+            "count": len(page.results),
+            "analyses": [result_to_dict(result) for result in page.results],
+        }
+        return CachedBody.build(dumps(payload))
+
+    # --- Caching ---
+
+    async def _cached(self, name: str, key: tuple, build) -> CachedBody:
+        cached = self._caches.get(name, {}).get(key)
+        if cached is not None and time.monotonic() - cached.built_at < self.cache_seconds:
+            return cached
+        pending = self._pending.get((name, key))
+        if pending is None:  # Concurrent misses share one rebuild
+            pending = self._pending[(name, key)] = asyncio.ensure_future(build())
+            pending.add_done_callback(lambda _: self._pending.pop((name, key), None))
+        return self._store(name, key, await asyncio.shield(pending))
+
+    def _memo(self, name: str, key: tuple, body: bytes) -> CachedBody:
+        # Payload built per request (cheap); reuse the entry while the bytes are unchanged
+        cached = self._caches.get(name, {}).get(key)
+        if cached is not None and cached.body == body:
+            return cached
+        return self._store(name, key, CachedBody.build(body))
+
+    def _store(self, name: str, key: tuple, cached: CachedBody) -> CachedBody:
+        cache = self._caches.setdefault(name, OrderedDict())
+        cache[key] = cached
+        cache.move_to_end(key)
+        while len(cache) > _CACHE_ENTRIES:
+            cache.popitem(last=False)
+        return cached
+
+    def _check_generation(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_seconds:
+            return
+        self._checked_at = now
+        generation = (self._index_version(), _mtime_ns(self.state_path))
+        if generation != self._generation:
+            self._generation = generation
+            for name in ("summary", "analyses"):
+                self._caches.pop(name, None)
+
+    def _index_version(self) -> int | None:
+        # data_version changes whenever another connection commits to the index
+        try:
+            if self._index is None:
+                self._index = sqlite3.connect(read_only_uri(self.history.index_path), uri=True, check_same_thread=False)
+            return self._index.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+
+def _respond(request: HttpRequest, cached: CachedBody) -> HttpResponse:
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if request.method == "GET" and _etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return HttpResponse(304, headers=headers)
+    return HttpResponse(200, cached.body, {"Content-Type": cached.content_type, **headers})
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [value.strip().removeprefix("W/") for value in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _mtime_ns(path: Path | None) -> int | None:
+    try:
+        return path.stat().st_mtime_ns if path is not None else None
+    except OSError:
+        return None
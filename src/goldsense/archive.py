@@ -0,0 +1,206 @@
+"""Compressed, rotated segments of the JSONL analysis log.
+
+Rotation moves the hot file into `<log>.segments/` as a gzip (or zstd, if
+the `zstandard` package is installed) segment listed in `manifest.json`.
+`iter_log_lines` reads segments in manifest order followed by the hot file,
+so readers see one continuous log. Compaction merges all segments into one
+and keeps only the last entry per URL.
+
+    python -m goldsense.archive stats --log logs/analysis.jsonl
+    python -m goldsense.archive compact --log logs/analysis.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+try:  # Optional: better ratio and speed than gzip
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+CODECS = ("gzip", "zstd")
+_SUFFIXES = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+_MANIFEST = "manifest.json"
+_PENDING = "pending.jsonl"
+
+
+@dataclass(frozen=True)
+class SegmentInfo:
+    name: str
+    codec: str
+    records: int
+    raw_bytes: int
+    stored_bytes: int
+    created_at: str
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+@dataclass
+class SegmentArchive:
+    directory: Path
+
+    @classmethod
+    def for_log(cls, path: Path) -> "SegmentArchive":
+        return cls(path.with_suffix(".segments"))
+
+    @property
+    def pending_path(self) -> Path:
+        return self.directory / _PENDING
+
+    def segments(self) -> list[SegmentInfo]:
+        manifest = self.directory / _MANIFEST
+        if not manifest.exists():
+            return []
+        payload = json.loads(manifest.read_text(encoding="utf-8"))
+        return [SegmentInfo(**entry) for entry in payload.get("segments", [])]
+
+    def iter_lines(self) -> Iterator[bytes]:
+        """Raw lines of every segment (manifest order), then a pending rotation."""
+        for segment in self.segments():
+            yield from _read_segment(self.directory / segment.name, segment.codec)
+        if self.pending_path.exists():
+            with self.pending_path.open("rb") as file:
+                yield from file
+
+    def rotate(self, hot_path: Path, codec: str | None = None) -> SegmentInfo | None:
+        """Move the hot file into a new compressed segment and leave it empty.
+
+        The hot file is first renamed to `pending.jsonl`, an atomic step, so
+        a crash never loses or duplicates lines; `finish_pending` completes
+        an interrupted rotation. The caller must hold the log's write lock.
+        """
+        if not hot_path.exists() or hot_path.stat().st_size == 0:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        os.replace(hot_path, self.pending_path)
+        hot_path.touch()
+        return self.finish_pending(codec)
+
+    def finish_pending(self, codec: str | None = None) -> SegmentInfo | None:
+        if not self.pending_path.exists():
+            return None
+        data = self.pending_path.read_bytes()
+        segment = self._write_segment(data, codec or default_codec())
+        self._save_manifest([*self.segments(), segment])
+        self.pending_path.unlink()
+        return segment
+
+    def compact(self, codec: str | None = None) -> tuple[int, int]:
+        """Merge all segments into one, keeping the last entry per URL.
+
+        Entries without a URL are kept; unparseable lines are dropped.
+        Returns (records before, records after). Caller holds the write lock.
+        """
+        self.finish_pending(codec)
+        old = self.segments()
+        if not old:
+            return 0, 0
+
+        entries: list[tuple[str | None, bytes]] = []
+        for line in self.iter_lines():
+            try:
+                url = json.loads(line).get("article", {}).get("url")
+            except (ValueError, AttributeError):
+                continue
+            entries.append((url, line if line.endswith(b"\n") else line + b"\n"))
+
+        last_index = {url: index for index, (url, _) in enumerate(entries) if url}
+        kept = [line for index, (url, line) in enumerate(entries) if not url or last_index[url] == index]
+
+        segment = self._write_segment(b"".join(kept), codec or default_codec())
+        self._save_manifest([segment])
+        for info in old:
+            (self.directory / info.name).unlink(missing_ok=True)
+        return sum(info.records for info in old), segment.records
+
+    def _write_segment(self, data: bytes, codec: str) -> SegmentInfo:
+        if codec not in CODECS:
+            raise ValueError(f"Unknown log codec: {codec}")
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("zstd compression needs the 'zstandard' package")
+
+        created = datetime.now(timezone.utc)
+        name = f"analysis-{created:%Y%m%dT%H%M%S%fZ}{_SUFFIXES[codec]}"
+        compressed = (
+            zstandard.ZstdCompressor(level=10).compress(data) if codec == "zstd" else gzip.compress(data, compresslevel=6)
+        )
+        path = self.directory / name
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with tmp_path.open("wb") as file:
+            file.write(compressed)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+        return SegmentInfo(
+            name=name,
+            codec=codec,
+            records=data.count(b"\n"),
+            raw_bytes=len(data),
+            stored_bytes=len(compressed),
+            created_at=created.isoformat(),
+        )
+
+    def _save_manifest(self, segments: list[SegmentInfo]) -> None:
+        manifest = self.directory / _MANIFEST
+        tmp_path = manifest.with_suffix(".json.tmp")
+        tmp_path.write_text(
+            json.dumps({"segments": [asdict(segment) for segment in segments]}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, manifest)
+
+
+def iter_log_lines(path: Path) -> Iterator[bytes]:
+    """Every raw line of the log: archived segments first, then the hot file."""
+    yield from SegmentArchive.for_log(path).iter_lines()
+    if path.exists():
+        with path.open("rb") as file:
+            yield from file
+
+
+def _read_segment(path: Path, codec: str) -> Iterator[bytes]:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError(f"{path.name} is zstd-compressed; install 'zstandard' to read it")
+        yield from zstandard.ZstdDecompressor().decompress(path.read_bytes()).splitlines(keepends=True)
+    else:
+        with gzip.open(path, "rb") as file:
+            yield from file
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Analysis log archive maintenance")
+    parser.add_argument("command", choices=("stats", "rotate", "compact"))
+    parser.add_argument("--log", type=Path, default=Path("logs/analysis.jsonl"))
+    args = parser.parse_args()
+
+    from .logger import JsonlLogger  # Rotation and compaction run under the logger's write lock
+
+    logger = JsonlLogger(args.log)
+    if args.command == "rotate":
+        segment = logger.rotate()
+        print(f"Yeni segment: {segment.name} ({segment.records} kayıt)" if segment else "Sıcak dosya boş.")
+    elif args.command == "compact":
+        before, after = logger.compact()
+        print(f"Sıkıştırma: {before} -> {after} kayıt")
+
+    segments = logger.archive.segments()
+    stored = sum(segment.stored_bytes for segment in segments)
+    raw = sum(segment.raw_bytes for segment in segments)
+    hot = args.log.stat().st_size if args.log.exists() else 0
+    print(f"{len(segments)} segment, {sum(s.records for s in segments)} kayıt, {raw:,} -> {stored:,} bayt")
+    print(f"Sıcak dosya: {hot:,} bayt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Backtest MarketEngine signals against a historical gold price series.
+
+Analyses from the JSONL log are grouped into time buckets. Each bucket gets
+the MarketEngine weighted score, which is turned into a long (> bullish
+threshold), short (< bearish threshold) or flat signal at the bucket's end.
+Signals are scored against forward returns over several horizons.
+
+For any category-weight vector w the bucket score is
+`(numerator @ w) / (denominator @ w)`, so the per-category sums are built
+once (`SignalMatrix`). A whole weight grid is then a single matrix product,
+and threshold grids are a broadcast comparison. Weight chunks are spread
+across processes.
+
+    python -m goldsense.backtest --prices data/gold_prices.csv --horizons 1h,4h,24h
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .engine import MarketEngine
+from .exceptions import ConfigError, GoldSenseError
+from .frame import CATEGORY_ORDER, ResultFrame
+from .price_store import PriceStore
+
+SIGNAL_CATEGORIES = CATEGORY_ORDER[:3]  # Irrelevant always weighs 0
+DEFAULT_HORIZONS = ("1h", "4h", "24h")
+_TIMESTAMP_COLUMNS = ("timestamp", "time", "datetime", "date")
+_PRICE_COLUMNS = ("price", "close", "Close", "Price")
+
+
+@dataclass(frozen=True)
+class BacktestGrid:
+    bullish_thresholds: tuple[float, ...] = (6.0, 6.5, 7.0, 7.5, 8.0)
+    bearish_thresholds: tuple[float, ...] = (3.0, 3.5, 4.0, 4.5, 5.0)
+    macro_weights: tuple[float, ...] = (1.0, 1.5, 2.0)
+    geopolitical_weights: tuple[float, ...] = (0.8, 1.2, 1.6)
+    industrial_weights: tuple[float, ...] = (0.5, 1.0, 1.5)
+
+    def weight_vectors(self) -> np.ndarray:
+        """All weight combinations as an (m, 3) array in SIGNAL_CATEGORIES order."""
+        combos = itertools.product(self.macro_weights, self.geopolitical_weights, self.industrial_weights)
+        return np.array(list(combos), dtype=np.float64).reshape(-1, len(SIGNAL_CATEGORIES))
+
+
+@dataclass(frozen=True)
+class SignalMatrix:
+    timestamps: np.ndarray  # datetime64[ns] (UTC), bucket end = when the signal is known
+    numerator: np.ndarray  # (buckets, 3) Σ score × confidence per category
+    denominator: np.ndarray  # (buckets, 3) Σ confidence per category
+    relevant: np.ndarray  # (buckets,) relevant analyses per bucket
+    returns: dict[str, np.ndarray]  # horizon -> forward return per bucket, NaN when unknown
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def weighted_scores(self, weights: np.ndarray) -> np.ndarray:
+        """(buckets, m) MarketEngine weighted scores for an (m, 3) weight array."""
+        weights = np.atleast_2d(weights)
+        numerator = self.numerator @ weights.T
+        denominator = self.denominator @ weights.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1.0), 0.0)
+
+
+def load_price_series(path: Path, source: str | None = None) -> pd.Series:
+    """Read a local price file into a UTC-indexed, sorted Series.
+
+    CSV and Parquet need timestamp and price columns. A `.sqlite`/`.db` file
+    is read as a PriceStore: prices recorded by GoldPriceService, for one
+    `source` (default: the most recorded one).
+    """
+    if not path.exists():
+        raise ConfigError(f"Fiyat dosyası bulunamadı: {path}")
+    if path.suffix.lower() in {".sqlite", ".db"}:
+        series = PriceStore(path).series(source)
+        if series.empty:
+            raise ConfigError(f"Fiyat kaydında veri yok: {path}" + (f" (kaynak: {source})" if source else ""))
+        return series[~series.index.duplicated(keep="last")]
+    if path.suffix.lower() in {".parquet", ".pq"}:
+        try:
+            table = pd.read_parquet(path)
+        except ImportError as exc:
+            raise ConfigError("Parquet okumak için pyarrow gerekli (pip install pyarrow)") from exc
+    else:
+        table = pd.read_csv(path)
+
+    time_column = next((name for name in _TIMESTAMP_COLUMNS if name in table.columns), None)
+    price_column = next((name for name in _PRICE_COLUMNS if name in table.columns), None)
+    if time_column is None or price_column is None:
+        raise ConfigError(
+            f"Fiyat dosyasında zaman ({'/'.join(_TIMESTAMP_COLUMNS)}) ve "
+            f"fiyat ({'/'.join(_PRICE_COLUMNS)}) sütunları olmalı: {path}"
+        )
+
+    series = pd.Series(
+        table[price_column].astype(float).to_numpy(),
+        index=pd.to_datetime(table[time_column], utc=True),
+        name="price",
+    )
+    series = series[~series.index.duplicated(keep="last")].sort_index()
+    return series.dropna()
+
+
+def build_signal_matrix(
+    frame: ResultFrame,
+    prices: pd.Series,
+    horizons: tuple[str, ...] = DEFAULT_HORIZONS,
+    freq: str = "1h",
+) -> SignalMatrix:
+    if prices.empty:
+        raise GoldSenseError("Fiyat serisi boş: sinyaller hiçbir fiyatla eşleştirilemez (kaynak/dosya doğru mu?)")
+    mask = frame.relevant_mask
+    published = pd.DatetimeIndex(frame.published_at[mask])
+    bucket_end = (published.floor(freq) + pd.Timedelta(freq)).to_numpy(dtype="datetime64[ns]")
+    timestamps, inverse = np.unique(bucket_end, return_inverse=True)
+
+    categories = frame.category_code[mask].astype(np.intp)
+    confidence = frame.confidence_score[mask]
+    scores = frame.sentiment_score[mask].astype(np.float64)
+    shape = (len(timestamps), len(SIGNAL_CATEGORIES))
+    numerator = np.zeros(shape)
+    denominator = np.zeros(shape)
+    np.add.at(numerator, (inverse, categories), scores * confidence)
+    np.add.at(denominator, (inverse, categories), confidence)
+    relevant = np.bincount(inverse, minlength=len(timestamps))
+
+    price_times = prices.index.tz_convert("UTC").tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    price_values = prices.to_numpy(dtype=np.float64)
+    entry = _price_asof(price_times, price_values, timestamps)
+    returns = {}
+    for horizon in horizons:
+        exit_times = timestamps + pd.Timedelta(horizon).to_timedelta64()
+        exit_price = _price_asof(price_times, price_values, exit_times)
+        exit_price[exit_times > price_times[-1]] = np.nan  # Horizon not covered by the series yet
+        returns[horizon] = exit_price / entry - 1.0
+
+    return SignalMatrix(timestamps, numerator, denominator, relevant, returns)
+
+
+def evaluate(
+    matrix: SignalMatrix,
+    weights: np.ndarray,
+    bullish_thresholds: np.ndarray,
+    bearish_thresholds: np.ndarray,
+) -> pd.DataFrame:
+    """Hit rate and information coefficient for every weight × threshold × horizon."""
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    bullish = np.asarray(bullish_thresholds, dtype=np.float64)
+    bearish = np.asarray(bearish_thresholds, dtype=np.float64)
+    scores = matrix.weighted_scores(weights)  # (buckets, m)
+    bull_index, bear_index = np.nonzero(bearish[None, :] < bullish[:, None])
+
+    frames = []
+    for horizon, returns in matrix.returns.items():
+        valid = (matrix.relevant > 0) & np.isfinite(returns)
+        horizon_scores = scores[valid]
+        horizon_returns = returns[valid]
+
+        # (samples, m, thresholds) masks; summed over samples
+        longs = horizon_scores[:, :, None] > bullish[None, None, :]
+        shorts = horizon_scores[:, :, None] < bearish[None, None, :]
+        up = (horizon_returns > 0)[:, None, None]
+        down = (horizon_returns < 0)[:, None, None]
+        signed = horizon_returns[:, None, None]
+
+        long_count = longs.sum(axis=0)[:, bull_index]
+        short_count = shorts.sum(axis=0)[:, bear_index]
+        hits = (longs & up).sum(axis=0)[:, bull_index] + (shorts & down).sum(axis=0)[:, bear_index]
+        signal_return = (longs * signed).sum(axis=0)[:, bull_index] - (shorts * signed).sum(axis=0)[:, bear_index]
+        signals = long_count + short_count
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            hit_rate = np.where(signals > 0, hits / np.maximum(signals, 1), np.nan)
+            mean_return = np.where(signals > 0, signal_return / np.maximum(signals, 1), np.nan)
+        ic = rank_ic(horizon_scores, horizon_returns)
+
+        pairs = len(bull_index)
+        frames.append(pd.DataFrame({
+            "horizon": horizon,
+            "bullish_threshold": np.tile(bullish[bull_index], len(weights)),
+            "bearish_threshold": np.tile(bearish[bear_index], len(weights)),
+            **{
+                f"{name.lower()}_weight": np.repeat(weights[:, i], pairs)
+                for i, name in enumerate(SIGNAL_CATEGORIES)
+            },
+            "samples": int(valid.sum()),
+            "signals": signals.ravel(),
+            "long_signals": long_count.ravel(),
+            "short_signals": short_count.ravel(),
+            "hit_rate": hit_rate.ravel(),
+            "mean_signal_return": mean_return.ravel(),
+            "ic": np.repeat(ic, pairs),
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def run_backtest(matrix: SignalMatrix, grid: BacktestGrid | None = None, workers: int | None = None) -> pd.DataFrame:
+    """Sweep the grid, spreading weight chunks over `workers` processes."""
+    grid = grid or BacktestGrid()
+    weights = grid.weight_vectors()
+    bullish = np.array(grid.bullish_thresholds)
+    bearish = np.array(grid.bearish_thresholds)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(weights)))
+
+    if workers == 1:
+        report = evaluate(matrix, weights, bullish, bearish)
+    else:
+        chunks = np.array_split(weights, workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(evaluate, [matrix] * len(chunks), chunks, [bullish] * len(chunks), [bearish] * len(chunks))
+            report = pd.concat(list(parts), ignore_index=True)
+
+    if report.empty:
+        return report
+    return report.sort_values(["horizon", "ic", "hit_rate"], ascending=[True, False, False], ignore_index=True)
+
+
+def baseline_config() -> dict[str, float]:
+    """Current MarketEngine settings, in the report's column names."""
+    engine = MarketEngine()
+    return {
+        "bullish_threshold": engine.bullish_threshold,
+        "bearish_threshold": engine.bearish_threshold,
+        **{f"{name.lower()}_weight": engine.category_weights[name] for name in SIGNAL_CATEGORIES},
+    }
+
+
+def _price_asof(times: np.ndarray, values: np.ndarray, when: np.ndarray) -> np.ndarray:
+    index = np.searchsorted(times, when, side="right") - 1
+    return np.where(index >= 0, values[np.maximum(index, 0)], np.nan)
+
+
+def rank_ic(scores: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    """Spearman correlation of each score column with returns (NaN if undefined)."""
+    if len(returns) < 3:
+        return np.full(scores.shape[1], np.nan)
+    score_ranks = pd.DataFrame(scores).rank(axis=0).to_numpy()
+    return_ranks = pd.Series(returns).rank().to_numpy()
+    score_ranks -= score_ranks.mean(axis=0)
+    return_ranks -= return_ranks.mean()
+    denominator = np.sqrt((score_ranks ** 2).sum(axis=0) * (return_ranks ** 2).sum())
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, (score_ranks * return_ranks[:, None]).sum(axis=0) / denominator, np.nan)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backtest sentiment signals against gold prices")
+    parser.add_argument(
+        "--prices", type=Path, required=True, help="CSV/Parquet with timestamp and price columns, or a PriceStore .sqlite"
+    )
+    parser.add_argument("--source", default=None, help="PriceStore source (default: most recorded)")
+    parser.add_argument("--log", type=Path, default=Path("logs/analysis.jsonl"))
+    parser.add_argument("--horizons", default=",".join(DEFAULT_HORIZONS))
+    parser.add_argument("--freq", default="1h", help="Signal bucket size")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", type=Path, default=Path("logs/backtest_report.csv"))
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    horizons = tuple(h.strip() for h in args.horizons.split(",") if h.strip())
+    prices = load_price_series(args.prices, args.source)
+    matrix = build_signal_matrix(ResultFrame.from_log(args.log), prices, horizons, args.freq)
+    report = run_backtest(matrix, workers=args.workers)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(args.out, index=False)
+    print(f"{len(matrix)} sinyal dönemi, {len(report)} konfigürasyon satırı -> {args.out}")
+
+    baseline = baseline_config()
+    is_baseline = np.logical_and.reduce([report[column] == value for column, value in baseline.items()])
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        for horizon, rows in report.groupby("horizon", sort=False):
+            print(f"\n== {horizon} ==")
+            print(rows.head(args.top).to_string(index=False))
+            print("Mevcut ayarlar:")
+            print(rows[is_baseline[rows.index]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
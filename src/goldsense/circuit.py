@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one external source.
+
+    Closed: calls go through; `failure_threshold` consecutive failures open
+    the breaker. Open: calls are refused instantly until `cooldown_seconds`
+    have passed. Half-open: exactly one probe call is let through; success
+    closes the breaker, failure re-opens it for another cool-down.
+    """
+
+    name: str
+    failure_threshold: int = 3
+    cooldown_seconds: float = 60.0
+    _state: str = field(default=CLOSED, init=False, repr=False)
+    _failures: int = field(default=0, init=False, repr=False)
+    _opened_at: float | None = field(default=None, init=False, repr=False)
+    _probe_in_flight: bool = field(default=False, init=False, repr=False)
+    _last_error: str | None = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. A True in half-open reserves the probe."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._state = HALF_OPEN
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+            self._last_error = None
+
+    def record_failure(self, error: Exception | str | None = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error) if error is not None else None
+            if self._probe_in_flight or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Give back a half-open probe that ended without a verdict (e.g. cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            retry_in = (
+                max(0.0, self._opened_at + self.cooldown_seconds - now)
+                if state == OPEN and self._opened_at is not None
+                else 0.0
+            )
+            return {
+                "name": self.name,
+                "state": state,
+                "failures": self._failures,
+                "retry_in_seconds": round(retry_in, 1),
+                "last_error": self._last_error,
+            }
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and self._opened_at is not None and now - self._opened_at >= self.cooldown_seconds:
+            return HALF_OPEN
+        return self._state
@@ -0,0 +1,289 @@
+"""Headless command line entry point (no Streamlit).
+
+    python -m goldsense run --since 24h --model llama-3.3-70b --concurrency 8
+    python -m goldsense run --json > summary.json   # cron-friendly
+    python -m goldsense daemon --interval 900 --window 24h
+    python -m goldsense serve --port 8088
+
+Exit codes: 0 success (also when there was nothing new), 1 unexpected
+error, 2 configuration error, 3 news fetch failed, 4 every analysis failed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import signal
+import sys
+from dataclasses import asdict, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from dotenv import load_dotenv
+
+from .config import Settings
+from .engine import MarketEngine
+from .exceptions import ConfigError, ExternalServiceError, GoldSenseError
+from .history import parse_duration, parse_since
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_CONFIG = 2
+EXIT_FETCH = 3
+EXIT_ANALYSIS = 4
+
+
+def _argument(parse: Callable[[str], object]) -> Callable[[str], object]:
+    """argparse `type` for a parser raising ValueError; keeps its message in the usage error."""
+
+    def _type(raw: str) -> object:
+        try:
+            return parse(raw)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(str(exc)) from None
+
+    _type.__name__ = parse.__name__
+    return _type
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="goldsense", description="Gold-Sense AI headless pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Fetch, encode, analyze, log and summarize once")
+    run.add_argument("--since", type=_argument(parse_since), default=None, help="Only articles published after (24h, 3d, ISO date)")
+    run.add_argument("--model", default=None, help="Overrides CEREBRAS_MODEL")
+    run.add_argument("--concurrency", type=int, default=None, help="Overrides MAX_CONCURRENCY")
+    run.add_argument("--log", type=Path, default=Path("logs/analysis.jsonl"))
+    run.add_argument("--reanalyze", action="store_true", help="Also analyze articles already in the log")
+    run.add_argument("--no-price", action="store_true", help="Skip the gold price lookup")
+    run.add_argument("--no-record", action="store_true", help="Do not write a run manifest (RUNS_DIR)")
+    run.add_argument("--json", action="store_true", help="Print the result as JSON on stdout")
+    run.add_argument("--quiet", action="store_true", help="No per-stage progress on stderr")
+    run.set_defaults(handler=cmd_run)
+
+    daemon = commands.add_parser("daemon", help="Poll, analyze and summarize continuously until stopped")
+    daemon.add_argument("--interval", type=float, default=None, help="Seconds between polls (DAEMON_POLL_SECONDS)")
+    daemon.add_argument("--window", type=_argument(parse_duration), default=None, help="Rolling summary window (DAEMON_WINDOW_HOURS)")
+    daemon.add_argument("--model", default=None, help="Overrides CEREBRAS_MODEL")
+    daemon.add_argument("--concurrency", type=int, default=None, help="Overrides MAX_CONCURRENCY")
+    daemon.add_argument("--log", type=Path, default=Path("logs/analysis.jsonl"))
+    daemon.add_argument("--state", type=Path, default=None, help="State file (DAEMON_STATE_PATH)")
+    daemon.add_argument("--no-price", action="store_true", help="Skip the gold price lookup")
+    daemon.set_defaults(handler=cmd_daemon, since=None)
+
+    serve = commands.add_parser("serve", help="Serve summaries, analyses, price and TONL over local HTTP")
+    serve.add_argument("--host", default=None, help="Overrides API_HOST")
+    serve.add_argument("--port", type=int, default=None, help="Overrides API_PORT")
+    serve.add_argument("--log", type=Path, default=Path("logs/analysis.jsonl"))
+    serve.add_argument("--state", type=Path, default=None, help="Daemon state file (DAEMON_STATE_PATH)")
+    serve.add_argument("--no-price", action="store_true", help="Serve the daemon's last price instead of fetching")
+    serve.set_defaults(handler=cmd_serve, since=None, model=None, concurrency=None)
+    return parser
+
+
+def run_settings(args: argparse.Namespace, now: datetime | None = None) -> Settings:
+    settings = Settings.from_env()
+    overrides = {}
+    if args.model:
+        overrides["cerebras_model"] = args.model
+    if args.concurrency is not None:
+        overrides["max_concurrency"] = args.concurrency
+    if getattr(args, "host", None):
+        overrides["api_host"] = args.host
+    if getattr(args, "port", None) is not None:
+        overrides["api_port"] = args.port
+    if getattr(args, "interval", None) is not None:
+        overrides["daemon_poll_seconds"] = args.interval
+    if getattr(args, "window", None) is not None:
+        overrides["daemon_window_hours"] = args.window / timedelta(hours=1)
+    if args.since is not None:
+        # NewsAPI filters by day; the exact cut-off is applied to publish times
+        age = (now or datetime.now(timezone.utc)) - args.since
+        overrides["lookback_days"] = max(1, math.ceil(age / timedelta(days=1)))
+    settings = replace(settings, **overrides)
+    settings.validate(credentials=args.command != "serve")  # serve only reads the log and prices
+    return settings
+
+
+def _configure(args: argparse.Namespace) -> tuple[Settings, MarketEngine]:
+    load_dotenv()
+    settings = run_settings(args)
+    engine = MarketEngine.from_config(Path(settings.engine_config_path)) if settings.engine_config_path else MarketEngine()
+    return settings, engine
+
+
+def _logger(settings: Settings, path: Path):
+    from .logger import JsonlLogger
+
+    return JsonlLogger(
+        path,
+        rotate_max_bytes=settings.log_rotate_max_bytes or None,
+        rotate_max_age=settings.log_rotate_max_age,
+        codec=settings.log_codec,
+    )
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    try:
+        settings, engine = _configure(args)
+    except ConfigError as exc:
+        print(f"Yapılandırma hatası: {exc}", file=sys.stderr)
+        return EXIT_CONFIG
+
+    # Heavy imports (DSPy) only once the configuration is known to be valid
+    from .metrics import append_run_metrics
+    from .pipeline import Pipeline, configure_lm
+    from .price import GoldPriceService
+    from .runs import RunStore
+
+    configure_lm(settings)
+    pipeline = Pipeline(
+        settings=settings,
+        logger=_logger(settings, args.log),
+        engine=engine,
+        price_service=None if args.no_price else GoldPriceService(settings),
+        runs=RunStore(Path(settings.runs_dir)) if settings.runs_dir and not args.no_record else None,
+        model=settings.cerebras_model,
+        on_progress=None if args.quiet else _print_progress,
+    )
+
+    try:
+        result = asyncio.run(pipeline.run(since=args.since, skip_logged=not args.reanalyze))
+    except ExternalServiceError as exc:
+        print(f"Haber çekme hatası: {exc}", file=sys.stderr)
+        return EXIT_FETCH
+    except GoldSenseError as exc:
+        print(f"Çalıştırma hatası: {exc}", file=sys.stderr)
+        return EXIT_ERROR
+
+    if result.metrics is not None:
+        append_run_metrics(args.log.parent / "metrics.jsonl", result.metrics)
+
+    if args.json:
+        print(_json_report(result))
+    else:
+        _print_report(result)
+
+    if result.failures and not result.results:
+        print(f"Hiçbir haber analiz edilemedi ({len(result.failures)} hata).", file=sys.stderr)
+        return EXIT_ANALYSIS
+    return EXIT_OK
+
+
+def cmd_daemon(args: argparse.Namespace) -> int:
+    try:
+        settings, engine = _configure(args)
+    except ConfigError as exc:
+        print(f"Yapılandırma hatası: {exc}", file=sys.stderr)
+        return EXIT_CONFIG
+
+    from .daemon import AnalysisDaemon
+    from .pipeline import configure_lm
+    from .price import GoldPriceService
+
+    configure_lm(settings)
+    daemon = AnalysisDaemon(
+        settings=settings,
+        logger=_logger(settings, args.log),
+        state_path=args.state or Path(settings.daemon_state_path),
+        engine=engine,
+        price_service=None if args.no_price else GoldPriceService(settings),
+        model=settings.cerebras_model,
+        poll_seconds=settings.daemon_poll_seconds,
+        window=timedelta(hours=settings.daemon_window_hours),
+        queue_size=settings.daemon_queue_size,
+        batch_size=settings.max_concurrency * 2,
+    )
+    print(
+        f"Servis başladı: her {settings.daemon_poll_seconds:.0f} sn'de bir haber çekiliyor, "
+        f"durum: {daemon.state_path} (durdurmak için Ctrl+C)",
+        file=sys.stderr,
+    )
+    daemon.run_forever()
+    return EXIT_OK
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    try:
+        settings, engine = _configure(args)
+    except ConfigError as exc:
+        print(f"Yapılandırma hatası: {exc}", file=sys.stderr)
+        return EXIT_CONFIG
+
+    from .api import ApiServer
+    from .history import AnalysisHistory
+    from .price import GoldPriceService
+
+    server = ApiServer(
+        history=AnalysisHistory(_logger(settings, args.log).index_path),
+        state_path=args.state or Path(settings.daemon_state_path),
+        engine=engine,
+        price_service=None if args.no_price else GoldPriceService(settings),
+        window=timedelta(hours=settings.daemon_window_hours),
+        cache_seconds=settings.api_cache_seconds,
+    )
+
+    async def _serve() -> None:
+        url = await server.start(settings.api_host, settings.api_port)
+        print(f"API hazır: {url} (/summary, /analyses, /price, /tonl/encode; durdurmak için Ctrl+C)", file=sys.stderr)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        await stop.wait()
+        await server.stop()
+
+    asyncio.run(_serve())
+    return EXIT_OK
+
+
+def _print_progress(stage: str, counts: dict, seconds: float) -> None:
+    details = " ".join(f"{key}={value}" for key, value in counts.items())
+    print(f"[{stage:<8}] {seconds:7.2f} sn  {details}", file=sys.stderr, flush=True)
+
+
+def _print_report(result) -> None:
+    summary = result.summary
+    rate = result.analyzed / result.seconds if result.seconds else 0.0
+    print(f"Çalıştırma: {result.run_id or '-'}")
+    print(
+        f"Haber: {result.fetched} çekildi, {result.skipped} atlandı, {result.analyzed} analiz edildi, "
+        f"{len(result.failures)} başarısız, {result.written} kaydedildi"
+    )
+    print(f"Eğilim: {summary.trend} (ağırlıklı skor {summary.weighted_score:.1f}/10, ort. güven %{summary.confidence_average * 100:.0f})")
+    if result.price is not None:
+        print(f"Altın fiyatı: {result.price:,.2f} {result.price_unit or ''}".rstrip() + f" ({result.price_source})")
+    else:
+        print("Altın fiyatı: veri yok")
+    print(f"Süre: {result.seconds:.2f} sn ({rate:.2f} haber/sn)")
+
+
+def _json_report(result) -> str:
+    from .serialization import dumps
+
+    return dumps(
+        {
+            "run_id": result.run_id,
+            "fetched": result.fetched,
+            "skipped": result.skipped,
+            "analyzed": result.analyzed,
+            "failed": len(result.failures),
+            "written": result.written,
+            "price": result.price,
+            "price_unit": result.price_unit,
+            "price_source": result.price_source,
+            "seconds": round(result.seconds, 3),
+            "summary": asdict(result.summary),
+        }
+    ).decode("utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
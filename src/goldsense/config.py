@@ -20,6 +20,35 @@ class Settings:
     max_concurrency: int
     truncgil_url: str
     truncgil_gold_symbol: str = "XGLD"  # Depending on API response structure
+    analysis_max_attempts: int = 3
+    analysis_retry_base_delay: float = 1.0  # Exponential backoff: base, 2x base, 4x base...
+    analysis_output_mode: str = "full"  # "full" (six adapter fields) or "lean" (compact JSON verdict)
+    lean_include_rationale: bool = False
+    lean_reasoning_max_tokens: int = 80
+    lean_rationale_max_tokens: int = 60
+    prompt_cost_per_million: float | None = None  # USD, used when the provider reports no cost
+    completion_cost_per_million: float | None = None
+    engine_config_path: str | None = None  # JSON written by goldsense.optimizer
+    price_sources: tuple[str, ...] = ("truncgil", "binance")  # Preference order; only same-unit sources are raced
+    price_strategy: str = "first"  # "first" valid quote, or "median" of all valid quotes
+    price_deadline_seconds: float = 5.0
+    price_cache_path: str | None = None  # JSON file shared across processes; None: in-memory only
+    price_cache_fresh_seconds: float = 300.0  # Served without refresh
+    price_cache_max_stale_seconds: float = 3600.0  # Served while refreshing in background
+    price_breaker_failure_threshold: int = 3  # Consecutive failures that open a source's breaker
+    price_breaker_cooldown_seconds: float = 60.0  # Open breaker skips the source, then allows one probe
+    price_store_path: str | None = None  # SQLite file recording every fetched quote; None disables
+    log_rotate_max_bytes: int = 0  # Hot JSONL size that triggers rotation (opt-in, e.g. 1048576); 0 disables
+    log_rotate_max_age_hours: float = 0.0  # Hot JSONL age that triggers rotation; 0 disables
+    log_compression: str = "auto"  # Segment codec: "auto" (zstd if installed), "gzip", "zstd"
+    runs_dir: str | None = "logs/runs"  # Per-run manifests and artifacts (goldsense.runs); None disables
+    daemon_poll_seconds: float = 900.0  # NewsAPI free tier: 100 requests/day
+    daemon_window_hours: float = 24.0  # Rolling summary covers articles published in this window
+    daemon_queue_size: int = 100  # Bound of each queue between daemon stages
+    daemon_state_path: str = "logs/daemon_state.json"
+    api_host: str = "127.0.0.1"  # Local HTTP API (goldsense serve); not meant to face the internet
+    api_port: int = 8088
+    api_cache_seconds: float = 5.0  # Longest a cached response is served before it is rebuilt
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -40,9 +69,77 @@ class Settings:
                 "TRUNCGIL_URL", "https://finans.truncgil.com/v4/today.json"
             ),
             truncgil_gold_symbol=os.getenv("TRUNCGIL_GOLD_SYMBOL", "GRA"),
+            analysis_max_attempts=int(os.getenv("ANALYSIS_MAX_ATTEMPTS", "3")),
+            analysis_retry_base_delay=float(os.getenv("ANALYSIS_RETRY_BASE_DELAY", "1.0")),
+            analysis_output_mode=os.getenv("ANALYSIS_OUTPUT_MODE", "full").strip().lower(),
+            lean_include_rationale=os.getenv("LEAN_INCLUDE_RATIONALE", "false").strip().lower() in {"1", "true", "yes"},
+            lean_reasoning_max_tokens=int(os.getenv("LEAN_REASONING_MAX_TOKENS", "80")),
+            lean_rationale_max_tokens=int(os.getenv("LEAN_RATIONALE_MAX_TOKENS", "60")),
+            prompt_cost_per_million=_optional_float(os.getenv("PROMPT_COST_PER_MILLION")),
+            completion_cost_per_million=_optional_float(os.getenv("COMPLETION_COST_PER_MILLION")),
+            engine_config_path=os.getenv("ENGINE_CONFIG_PATH") or None,
+            price_sources=tuple(
+                name.strip().lower() for name in os.getenv("PRICE_SOURCES", "truncgil,binance").split(",") if name.strip()
+            ),
+            price_strategy=os.getenv("PRICE_STRATEGY", "first").strip().lower(),
+            price_deadline_seconds=float(os.getenv("PRICE_DEADLINE_SECONDS", "5.0")),
+            price_cache_path=os.getenv("PRICE_CACHE_PATH", "logs/price_cache.json") or None,
+            price_cache_fresh_seconds=float(os.getenv("PRICE_CACHE_FRESH_SECONDS", "300")),
+            price_cache_max_stale_seconds=float(os.getenv("PRICE_CACHE_MAX_STALE_SECONDS", "3600")),
+            price_breaker_failure_threshold=int(os.getenv("PRICE_BREAKER_FAILURE_THRESHOLD", "3")),
+            price_breaker_cooldown_seconds=float(os.getenv("PRICE_BREAKER_COOLDOWN_SECONDS", "60")),
+            price_store_path=os.getenv("PRICE_STORE_PATH") or None,
+            log_rotate_max_bytes=int(os.getenv("LOG_ROTATE_MAX_BYTES", "0")),
+            log_rotate_max_age_hours=float(os.getenv("LOG_ROTATE_MAX_AGE_HOURS", "0")),
+            log_compression=os.getenv("LOG_COMPRESSION", "auto").strip().lower(),
+            runs_dir=os.getenv("RUNS_DIR", "logs/runs") or None,
+            daemon_poll_seconds=float(os.getenv("DAEMON_POLL_SECONDS", "900")),
+            daemon_window_hours=float(os.getenv("DAEMON_WINDOW_HOURS", "24")),
+            daemon_queue_size=int(os.getenv("DAEMON_QUEUE_SIZE", "100")),
+            daemon_state_path=os.getenv("DAEMON_STATE_PATH", "logs/daemon_state.json"),
+            api_host=os.getenv("API_HOST", "127.0.0.1"),
+            api_port=int(os.getenv("API_PORT", "8088")),
+            api_cache_seconds=float(os.getenv("API_CACHE_SECONDS", "5")),
         )
 
-    def validate(self) -> None:
+    def validate(self, credentials: bool = True) -> None:
+        """`credentials=False` skips the NewsAPI and Cerebras keys for commands that neither fetch nor analyze."""
+        if credentials:
+            self._validate_credentials()
+        if self.lookback_days <= 0:
+            raise ConfigError("LOOKBACK_DAYS must be positive")
+        if self.max_concurrency <= 0:
+            raise ConfigError("MAX_CONCURRENCY must be positive")
+        if self.analysis_max_attempts <= 0:
+            raise ConfigError("ANALYSIS_MAX_ATTEMPTS must be positive")
+        if self.analysis_retry_base_delay < 0:
+            raise ConfigError("ANALYSIS_RETRY_BASE_DELAY must not be negative")
+        if self.analysis_output_mode not in {"full", "lean"}:
+            raise ConfigError("ANALYSIS_OUTPUT_MODE must be 'full' or 'lean'")
+        if self.lean_reasoning_max_tokens <= 0 or self.lean_rationale_max_tokens <= 0:
+            raise ConfigError("LEAN_*_MAX_TOKENS must be positive")
+        if not self.price_sources or not set(self.price_sources) <= {"truncgil", "binance"}:
+            raise ConfigError("PRICE_SOURCES must list truncgil and/or binance")
+        if self.price_strategy not in {"first", "median"}:
+            raise ConfigError("PRICE_STRATEGY must be 'first' or 'median'")
+        if self.price_deadline_seconds <= 0:
+            raise ConfigError("PRICE_DEADLINE_SECONDS must be positive")
+        if self.price_cache_fresh_seconds < 0 or self.price_cache_max_stale_seconds < self.price_cache_fresh_seconds:
+            raise ConfigError("PRICE_CACHE_MAX_STALE_SECONDS must be >= PRICE_CACHE_FRESH_SECONDS >= 0")
+        if self.price_breaker_failure_threshold <= 0 or self.price_breaker_cooldown_seconds < 0:
+            raise ConfigError("PRICE_BREAKER_FAILURE_THRESHOLD must be positive, cool-down not negative")
+        if self.log_rotate_max_bytes < 0 or self.log_rotate_max_age_hours < 0:
+            raise ConfigError("LOG_ROTATE_MAX_BYTES / LOG_ROTATE_MAX_AGE_HOURS must not be negative")
+        if self.log_compression not in {"auto", "gzip", "zstd"}:
+            raise ConfigError("LOG_COMPRESSION must be 'auto', 'gzip' or 'zstd'")
+        if self.daemon_poll_seconds <= 0 or self.daemon_window_hours <= 0 or self.daemon_queue_size <= 0:
+            raise ConfigError("DAEMON_POLL_SECONDS, DAEMON_WINDOW_HOURS and DAEMON_QUEUE_SIZE must be positive")
+        if not 0 <= self.api_port <= 65535 or self.api_cache_seconds < 0:
+            raise ConfigError("API_PORT must be a valid port, API_CACHE_SECONDS not negative")
+        if not self.truncgil_gold_symbol:
+            raise ConfigError("TRUNCGIL_GOLD_SYMBOL must be set")
+
+    def _validate_credentials(self) -> None:
         if not self.newsapi_key:
             raise ConfigError("NEWSAPI_KEY is missing in .env")
         if not self.cerebras_api_key:
@@ -51,13 +148,19 @@ class Settings:
             raise ConfigError("CEREBRAS_API_BASE is missing in .env")
         if not self.cerebras_model:
             raise ConfigError("CEREBRAS_MODEL is missing in .env")
-        if self.lookback_days <= 0:
-            raise ConfigError("LOOKBACK_DAYS must be positive")
-        if self.max_concurrency <= 0:
-            raise ConfigError("MAX_CONCURRENCY must be positive")
-        if not self.truncgil_gold_symbol:
-            raise ConfigError("TRUNCGIL_GOLD_SYMBOL must be set")
 
     @property
     def lookback_delta(self) -> timedelta:
         return timedelta(days=self.lookback_days)
+
+    @property
+    def log_rotate_max_age(self) -> timedelta | None:
+        return timedelta(hours=self.log_rotate_max_age_hours) if self.log_rotate_max_age_hours else None
+
+    @property
+    def log_codec(self) -> str | None:
+        return None if self.log_compression == "auto" else self.log_compression
+
+
+def _optional_float(raw: str | None) -> float | None:
+    return float(raw) if raw else None
@@ -0,0 +1,283 @@
+"""Long-running harvest → analysis → log service.
+
+Three asyncio stages connected by bounded queues:
+
+    poller ──articles──▶ analyzer ──results──▶ writer ──▶ analysis log + state file
+
+The poller fetches news every `poll_seconds` and enqueues only articles
+that are neither logged nor already in flight. When the analyzer falls
+behind, the full article queue blocks the poller (backpressure) instead of
+buffering without limit. The writer logs each batch and keeps a rolling
+window of analyses (seeded from the history index on start). The window's
+`MarketSummary` and time-decayed sentiment index are maintained
+incrementally (`MarketEngine.update`/`remove`, `RollingSentimentIndex`),
+and a JSON state file that readers (the Streamlit app, the HTTP API, other
+tools) poll is rewritten atomically.
+
+    python -m goldsense daemon --interval 900 --window 24h
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import os
+import signal
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .analyst import GoldAnalyst
+from .config import Settings
+from .engine import MarketEngine
+from .fetcher import NewsFetcher
+from .history import AnalysisHistory, HistoryFilter
+from .logger import JsonlLogger, result_from_entry
+from .models import AnalysisResult, MarketSummary, NewsArticle
+from .price import GoldPriceService
+from .sentiment_index import RollingSentimentIndex
+from .serialization import dumps, loads, result_to_dict
+
+RECENT_LIMIT = 50  # Analyses kept in the state file, newest first
+
+
+@dataclass
+class DaemonState:
+    started_at: str
+    updated_at: str
+    status: str = "starting"  # starting / running / stopped
+    polls: int = 0
+    last_poll_at: str | None = None
+    last_error: str | None = None
+    fetched_total: int = 0
+    analyzed_total: int = 0
+    failed_total: int = 0
+    written_total: int = 0
+    queues: dict[str, int] = field(default_factory=dict)  # Current depth per queue
+    window_hours: float = 24.0
+    price: float | None = None
+    price_source: str | None = None
+    price_unit: str | None = None  # e.g. "TRY/g"; see goldsense.price.source_unit
+    summary: dict | None = None
+    sentiment: dict | None = None  # RollingSentimentIndex point over the window: value, weight, count
+    recent: list[dict] = field(default_factory=list)  # Log-line layout (result_to_dict)
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "DaemonState":
+        return cls(**payload)
+
+    def market_summary(self) -> MarketSummary | None:
+        return MarketSummary(**self.summary) if self.summary else None
+
+    def recent_results(self) -> list[AnalysisResult]:
+        return [result_from_entry(entry) for entry in self.recent]
+
+
+def read_state(path: Path) -> DaemonState | None:
+    """Latest state written by a running (or stopped) daemon; None if there is none."""
+    try:
+        return DaemonState.from_dict(loads(path.read_bytes()))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+@dataclass
+class AnalysisDaemon:
+    settings: Settings
+    logger: JsonlLogger
+    state_path: Path
+    engine: MarketEngine = field(default_factory=MarketEngine)  # Its running state holds the window summary
+    price_service: GoldPriceService | None = None
+    model: str | None = None
+    poll_seconds: float = 900.0
+    window: timedelta = timedelta(hours=24)
+    queue_size: int = 100
+    batch_size: int = 12
+    _stop: asyncio.Event = field(init=False, repr=False)
+    _articles: asyncio.Queue = field(init=False, repr=False)
+    _results: asyncio.Queue = field(init=False, repr=False)
+    _in_flight: set[str] = field(default_factory=set, init=False, repr=False)
+    _window: dict[str, AnalysisResult] = field(default_factory=dict, init=False, repr=False)
+    _expiry: list[tuple[datetime, str]] = field(default_factory=list, init=False, repr=False)  # Heap of (published_at, key)
+    _sentiment: RollingSentimentIndex = field(init=False, repr=False)
+    _state: DaemonState = field(init=False, repr=False)
+
+    async def run(self) -> None:
+        """Run until `stop()` (or SIGINT/SIGTERM via `run_forever`); queued work is drained first."""
+        now = datetime.now(timezone.utc).isoformat()
+        self._stop = asyncio.Event()
+        self._articles = asyncio.Queue(maxsize=self.queue_size)
+        self._results = asyncio.Queue(maxsize=self.queue_size)
+        self._state = DaemonState(started_at=now, updated_at=now, window_hours=self.window / timedelta(hours=1))
+        self.engine.reset()
+        self._window.clear()
+        self._expiry.clear()
+        self._sentiment = RollingSentimentIndex(window=self.window, category_weights=dict(self.engine.category_weights))
+        self._seed_window()
+        self._state.status = "running"
+        await self._publish()
+
+        analyzer = asyncio.create_task(self._analyze_loop(), name="daemon-analyzer")
+        writer = asyncio.create_task(self._write_loop(), name="daemon-writer")
+        try:
+            await self._poll_loop()
+            await self._articles.join()
+            await self._results.join()
+        finally:
+            analyzer.cancel()
+            writer.cancel()
+            await asyncio.gather(analyzer, writer, return_exceptions=True)
+            self._state.status = "stopped"
+            await self._publish()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run_forever(self) -> None:
+        async def _main() -> None:
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, self.stop)
+            await self.run()
+
+        asyncio.run(_main())
+
+    async def _poll_loop(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            await self.poll_once()
+            try:
+                await asyncio.wait_for(self._stop.wait(), max(0.0, self.poll_seconds - (time.monotonic() - started)))
+            except asyncio.TimeoutError:
+                pass
+
+    async def poll_once(self) -> int:
+        """Fetch once and enqueue new articles; returns how many were enqueued."""
+        self._state.polls += 1
+        self._state.last_poll_at = datetime.now(timezone.utc).isoformat()
+        try:
+            articles = await NewsFetcher(self.settings).fetch_latest()
+        except Exception as exc:  # Keep polling; the error is visible in the state file
+            self._state.last_error = f"{type(exc).__name__}: {exc}"
+            print(f"⚠️  Haber çekilemedi: {exc}", file=sys.stderr)
+            await self._publish()
+            return 0
+
+        self._state.last_error = None
+        self._state.fetched_total += len(articles)
+        enqueued = 0
+        for article in articles:
+            if self._stop.is_set():
+                break
+            if article.url and (article.url in self._in_flight or article.url in self.logger):
+                continue
+            if article.url:
+                self._in_flight.add(article.url)
+            await self._articles.put(article)  # Blocks while the analyzer is behind
+            enqueued += 1
+        await self._publish()
+        return enqueued
+
+    async def _analyze_loop(self) -> None:
+        analyst = GoldAnalyst(self.settings)
+        while True:
+            batch = [await self._articles.get()]
+            while len(batch) < self.batch_size and not self._articles.empty():
+                batch.append(self._articles.get_nowait())
+            try:
+                analysis = await analyst.analyze_batch(batch)
+                self._state.failed_total += len(analysis.failures)
+                for failure in analysis.failures:  # Retried on a later poll
+                    self._release(failure.article)
+                await self._results.put(analysis.results)
+            except Exception as exc:
+                self._state.last_error = f"{type(exc).__name__}: {exc}"
+                print(f"⚠️  Analiz hatası: {exc}", file=sys.stderr)
+                for article in batch:
+                    self._release(article)
+            finally:
+                for _ in batch:
+                    self._articles.task_done()
+
+    async def _write_loop(self) -> None:
+        while True:
+            results = await self._results.get()
+            try:
+                written = await asyncio.to_thread(self.logger.log_many, results, model=self.model)
+                self._state.analyzed_total += len(results)
+                self._state.written_total += written
+                for result in results:
+                    self._add_to_window(result)
+                    self._release(result.article)
+                if self.price_service is not None:
+                    quote = await self.price_service.get_quote_async()
+                    self._state.price = quote.price if quote is not None else None
+                    self._state.price_source = quote.source if quote is not None else None
+                    self._state.price_unit = quote.unit if quote is not None else None
+                await self._publish()
+            except Exception as exc:
+                self._state.last_error = f"{type(exc).__name__}: {exc}"
+                print(f"⚠️  Analiz kaydı yazılamadı: {exc}", file=sys.stderr)
+                for result in results:
+                    self._release(result.article)
+            finally:
+                self._results.task_done()
+
+    def _release(self, article: NewsArticle) -> None:
+        if article.url:
+            self._in_flight.discard(article.url)
+
+    def _seed_window(self) -> None:
+        # Restarted daemons pick up the window from the history index
+        start = datetime.now(timezone.utc) - self.window
+        history = AnalysisHistory(self.logger.index_path)
+        for result in history.iter_results(HistoryFilter(start=start)):  # Oldest first: the index appends in order
+            self._add_to_window(result)
+
+    def _add_to_window(self, result: AnalysisResult) -> None:
+        published = result.article.published_at
+        if published < datetime.now(timezone.utc) - self.window:
+            return  # Late analysis of an article already outside the window
+        key = _window_key(result)
+        previous = self._window.get(key)
+        if previous is not None:  # Same article again: the newer analysis replaces the older one
+            self.engine.remove(previous)
+        else:
+            self._sentiment.update(result)  # The index cannot retract; it counts each article once
+        self._window[key] = result
+        self.engine.update(result)
+        heapq.heappush(self._expiry, (published, key))
+
+    def _evict_expired(self) -> None:
+        cutoff = datetime.now(timezone.utc) - self.window
+        while self._expiry and self._expiry[0][0] < cutoff:
+            published, key = heapq.heappop(self._expiry)
+            current = self._window.get(key)
+            if current is not None and current.article.published_at == published:  # Else a replaced entry
+                del self._window[key]
+                self.engine.remove(current)
+
+    async def _publish(self) -> None:
+        self._evict_expired()
+        state = self._state
+        state.updated_at = datetime.now(timezone.utc).isoformat()
+        state.queues = {"articles": self._articles.qsize(), "results": self._results.qsize()}
+        state.summary = asdict(self.engine.current_summary())
+        point = self._sentiment.point_at()
+        state.sentiment = {"value": point.value, "weight": point.weight, "count": point.count}
+        recent = heapq.nlargest(RECENT_LIMIT, self._window.values(), key=lambda r: r.article.published_at)
+        state.recent = [result_to_dict(result) for result in recent]
+        payload = dumps(asdict(state))
+        await asyncio.to_thread(_write_atomic, self.state_path, payload)
+
+
+def _window_key(result: AnalysisResult) -> str:
+    return result.article.url or f"{result.article.title}|{result.article.published_at.isoformat()}"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
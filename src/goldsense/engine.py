@@ -1,7 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
 
+import numpy as np
+
+from .exceptions import ConfigError
+from .frame import CATEGORY_ORDER, ResultFrame
 from .models import AnalysisResult, MarketSummary
 
 
@@ -9,7 +17,7 @@ from .models import AnalysisResult, MarketSummary
 class MarketEngine:
     bullish_threshold: float = 7.0
     bearish_threshold: float = 4.0
-    
+
     # Category weights for weighted average calculation
     CATEGORY_WEIGHTS = {
         "Macro": 1.5,          # Highest impact: economy, central banks, policy
@@ -17,10 +25,46 @@ class MarketEngine:
         "Industrial": 1.0,     # Baseline: industrial demand, mining, jewelry
         "Irrelevant": 0.0,     # No impact on gold markets
     }
+    # Per-instance weights; defaults to CATEGORY_WEIGHTS, overridden by a fitted config
+    category_weights: dict[str, float] = field(default_factory=lambda: dict(MarketEngine.CATEGORY_WEIGHTS))
+
+    # Rebuild the float sums from the added results after this many removals,
+    # so subtracting evicted results cannot accumulate drift
+    RESUM_EVERY = 1024
+
+    # Running state for update/remove. `_members` is the multiset of added
+    # results: it guards `remove` and is the source for the periodic re-sum.
+    _members: Counter = field(default_factory=Counter, init=False, repr=False)
+    _relevant_count: int = field(default=0, init=False, repr=False)
+    _score_sum: int = field(default=0, init=False, repr=False)
+    _confidence_sum: float = field(default=0.0, init=False, repr=False)
+    _weighted_numerator: float = field(default=0.0, init=False, repr=False)
+    _weighted_denominator: float = field(default=0.0, init=False, repr=False)
+    _removals: int = field(default=0, init=False, repr=False)
+
+    @classmethod
+    def from_config(cls, path: Path) -> "MarketEngine":
+        """Load thresholds and category weights written by `goldsense.optimizer`."""
+        try:
+            config = json.loads(path.read_text(encoding="utf-8"))
+            weights = {name: float(value) for name, value in config["category_weights"].items()}
+            engine = cls(
+                bullish_threshold=float(config["bullish_threshold"]),
+                bearish_threshold=float(config["bearish_threshold"]),
+                category_weights={**cls.CATEGORY_WEIGHTS, **weights},
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            raise ConfigError(f"Engine config could not be loaded from {path}: {exc}") from exc
+
+        if engine.bearish_threshold >= engine.bullish_threshold:
+            raise ConfigError(f"Engine config {path}: bearish_threshold must be below bullish_threshold")
+        if any(weight < 0 for weight in engine.category_weights.values()):
+            raise ConfigError(f"Engine config {path}: category weights must not be negative")
+        return engine
 
     def summarize(self, results: list[AnalysisResult]) -> MarketSummary:
-        total = len(results)
-        relevant = [r for r in results if r.is_relevant and r.category != "Irrelevant"]
+        """Batch summary; does not touch the running state of `update`/`remove`."""
+        relevant = [r for r in results if self._is_relevant(r)]
         relevant_count = len(relevant)
 
         average_score = (
@@ -28,10 +72,10 @@ class MarketEngine:
             if relevant_count
             else 0.0
         )
-        
+
         # Calculate weighted score: ∑(Score × Weight × Confidence) / ∑(Weight × Confidence)
         weighted_score = self._calculate_weighted_score(relevant)
-        
+
         # Average confidence across all analyses
         confidence_average = (
             sum(r.confidence_score for r in relevant) / relevant_count
@@ -39,6 +83,80 @@ class MarketEngine:
             else 0.0
         )
 
+        return self._build_summary(len(results), relevant_count, average_score, weighted_score, confidence_average)
+
+    def update(self, result: AnalysisResult) -> None:
+        """Add one result to the running summary in O(1)."""
+        self._members[result] += 1
+        self._apply(result, 1)
+
+    def remove(self, result: AnalysisResult) -> None:
+        """Remove a previously added result (e.g. sliding-window eviction) in O(1).
+
+        Raises ValueError if the result was not added (or already removed).
+        """
+        count = self._members.get(result, 0)
+        if not count:
+            raise ValueError("Result was not added to this engine")
+        if count == 1:
+            del self._members[result]
+        else:
+            self._members[result] = count - 1
+        self._apply(result, -1)
+        self._removals += 1
+        if self._removals >= self.RESUM_EVERY:
+            self._resum()
+
+    def reset(self) -> None:
+        self._members.clear()
+        self._relevant_count = 0
+        self._score_sum = 0
+        self._confidence_sum = 0.0
+        self._weighted_numerator = 0.0
+        self._weighted_denominator = 0.0
+        self._removals = 0
+
+    def current_summary(self) -> MarketSummary:
+        """Summary of the results added with `update` and not removed since."""
+        relevant_count = self._relevant_count
+        average_score = self._score_sum / relevant_count if relevant_count else 0.0
+        weighted_score = (
+            self._weighted_numerator / self._weighted_denominator
+            if relevant_count and self._weighted_denominator
+            else 0.0
+        )
+        confidence_average = self._confidence_sum / relevant_count if relevant_count else 0.0
+        return self._build_summary(
+            self._members.total(), relevant_count, average_score, weighted_score, confidence_average
+        )
+
+    def summarize_frame(self, frame: ResultFrame) -> MarketSummary:
+        """Vectorized `summarize` over a columnar ResultFrame.
+
+        Uses numpy float64 sums, so values can differ from `summarize` in the
+        last bits; the trend is identical except exactly at a threshold.
+        """
+        mask = frame.relevant_mask
+        relevant_count = int(mask.sum())
+        scores = frame.sentiment_score[mask].astype(np.float64)
+        confidence = frame.confidence_score[mask]
+        weights = np.array([self.category_weights.get(name, 0.0) for name in CATEGORY_ORDER])[frame.category_code[mask]]
+
+        average_score = float(scores.sum() / relevant_count) if relevant_count else 0.0
+        denominator = float(np.sum(weights * confidence))
+        weighted_score = float(np.sum(scores * weights * confidence)) / denominator if denominator else 0.0
+        confidence_average = float(confidence.sum() / relevant_count) if relevant_count else 0.0
+
+        return self._build_summary(len(frame), relevant_count, average_score, weighted_score, confidence_average)
+
+    def _build_summary(
+        self,
+        total: int,
+        relevant_count: int,
+        average_score: float,
+        weighted_score: float,
+        confidence_average: float,
+    ) -> MarketSummary:
         if weighted_score > self.bullish_threshold:
             trend = "Strong Bullish"
         elif weighted_score < self.bearish_threshold and relevant_count > 0:
@@ -54,31 +172,64 @@ class MarketEngine:
             weighted_score=weighted_score,
             confidence_average=confidence_average,
         )
-    
+
+    @staticmethod
+    def _is_relevant(result: AnalysisResult) -> bool:
+        return result.is_relevant and result.category != "Irrelevant"
+
+    def _apply(self, result: AnalysisResult, sign: int) -> None:
+        if not self._is_relevant(result):
+            return
+
+        weight = self.category_weights.get(result.category, 0.0)
+        confidence = result.confidence_score
+
+        self._relevant_count += sign
+        self._score_sum += sign * result.sentiment_score
+        self._confidence_sum += sign * confidence
+        self._weighted_numerator += sign * result.sentiment_score * weight * confidence
+        self._weighted_denominator += sign * weight * confidence
+        if self._relevant_count == 0:
+            # Drained: drop the float residue of the subtractions so an empty window is exactly empty
+            self._confidence_sum = 0.0
+            self._weighted_numerator = 0.0
+            self._weighted_denominator = 0.0
+
+    def _resum(self) -> None:
+        relevant = [
+            (result, count) for result, count in self._members.items() if self._is_relevant(result)
+        ]
+        weights = [self.category_weights.get(result.category, 0.0) for result, _ in relevant]
+        self._confidence_sum = math.fsum(r.confidence_score * n for r, n in relevant)
+        self._weighted_numerator = math.fsum(
+            r.sentiment_score * w * r.confidence_score * n for (r, n), w in zip(relevant, weights)
+        )
+        self._weighted_denominator = math.fsum(w * r.confidence_score * n for (r, n), w in zip(relevant, weights))
+        self._removals = 0
+
     def _calculate_weighted_score(self, relevant: list[AnalysisResult]) -> float:
         """
         Calculate weighted average score:
         WeightedScore = ∑(Score × Weight × Confidence) / ∑(Weight × Confidence)
-        
+
         This ensures:
         - Macro news (1.5x) influences trend more than industrial (1.0x)
         - Low-confidence analyses are down-weighted
         """
         if not relevant:
             return 0.0
-        
+
         numerator = 0.0
         denominator = 0.0
-        
+
         for result in relevant:
-            weight = self.CATEGORY_WEIGHTS.get(result.category, 0.0)
+            weight = self.category_weights.get(result.category, 0.0)
             confidence = result.confidence_score
-            
+
             numerator += result.sentiment_score * weight * confidence
             denominator += weight * confidence
-        
+
         if denominator == 0:
             return 0.0
-        
-        return numerator / denominator
 
+        return numerator / denominator
@@ -76,3 +76,24 @@ TRAINING_SET = [
         confidence_score="0.75"
     ).with_inputs("title", "description"),
 ]
+
+
+def lean_training_set(include_rationale: bool) -> list[Example]:
+    """TRAINING_SET re-expressed in the compact verdict schema (see lean.py)."""
+    from .lean import encode_verdict
+
+    return [
+        Example(
+            title=example.title,
+            description=example.description,
+            verdict=encode_verdict(
+                is_relevant=example.is_relevant == "True",
+                category=example.category,
+                sentiment_score=int(example.sentiment_score),
+                confidence_score=float(example.confidence_score),
+                impact_reasoning=example.impact_reasoning,
+                rationale=example.rationale if include_rationale else None,
+            ),
+        ).with_inputs("title", "description")
+        for example in TRAINING_SET
+    ]
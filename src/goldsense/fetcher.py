@@ -32,8 +32,11 @@ class NewsFetcher:
             "apiKey": self.settings.newsapi_key,
         }
 
-        async with httpx.AsyncClient(timeout=30) as client:  # Increased timeout
-            response = await client.get(self.settings.newsapi_base, params=params)
+        try:
+            async with httpx.AsyncClient(timeout=30) as client:  # Increased timeout
+                response = await client.get(self.settings.newsapi_base, params=params)
+        except httpx.HTTPError as exc:
+            raise ExternalServiceError(f"NewsAPI request failed: {exc}") from exc
 
         if response.status_code != 200:
             raise ExternalServiceError(
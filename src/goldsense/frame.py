@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from datetime import timezone
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .logger import read_results
+from .models import AnalysisResult, Category, NewsArticle
+
+CATEGORY_ORDER: tuple[Category, ...] = ("Macro", "Geopolitical", "Industrial", "Irrelevant")
+_CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORY_ORDER)}
+IRRELEVANT_CODE = _CATEGORY_CODES["Irrelevant"]
+NO_SOURCE = -1
+
+
+@dataclass(frozen=True)
+class ResultFrame:
+    """Columnar view of a batch of AnalysisResults.
+
+    Numeric fields live in compact NumPy arrays so aggregations and charts
+    avoid per-row Python objects; sources are dictionary-encoded against an
+    interned string table. Text fields stay as object arrays and are only
+    touched when converting back to AnalysisResults or building hover text.
+    Timestamps are normalized to UTC.
+    """
+
+    sentiment_score: np.ndarray  # int8
+    confidence_score: np.ndarray  # float64
+    category_code: np.ndarray  # int8, index into CATEGORY_ORDER
+    is_relevant: np.ndarray  # bool
+    published_at: np.ndarray  # datetime64[ns], UTC
+    source_code: np.ndarray  # int32, index into `sources` or NO_SOURCE
+    sources: tuple[str, ...]
+    title: np.ndarray  # object
+    description: np.ndarray  # object
+    url: np.ndarray  # object
+    impact_reasoning: np.ndarray  # object
+    rationale: np.ndarray  # object
+
+    def __len__(self) -> int:
+        return len(self.sentiment_score)
+
+    @classmethod
+    def from_results(cls, results: Iterable[AnalysisResult]) -> "ResultFrame":
+        results = list(results)
+        source_codes: dict[str, int] = {}
+
+        def _source_code(source: str | None) -> int:
+            if source is None:
+                return NO_SOURCE
+            return source_codes.setdefault(sys.intern(source), len(source_codes))
+
+        return cls(
+            sentiment_score=np.fromiter((r.sentiment_score for r in results), dtype=np.int8, count=len(results)),
+            confidence_score=np.fromiter((r.confidence_score for r in results), dtype=np.float64, count=len(results)),
+            category_code=np.fromiter(
+                (_CATEGORY_CODES.get(r.category, IRRELEVANT_CODE) for r in results), dtype=np.int8, count=len(results)
+            ),
+            is_relevant=np.fromiter((r.is_relevant for r in results), dtype=bool, count=len(results)),
+            published_at=pd.to_datetime([r.article.published_at for r in results], utc=True)
+            .tz_localize(None)
+            .to_numpy(dtype="datetime64[ns]"),
+            source_code=np.fromiter((_source_code(r.article.source) for r in results), dtype=np.int32, count=len(results)),
+            sources=tuple(source_codes),
+            title=_object_array(r.article.title for r in results),
+            description=_object_array(r.article.description for r in results),
+            url=_object_array(r.article.url for r in results),
+            impact_reasoning=_object_array(r.impact_reasoning for r in results),
+            rationale=_object_array(r.rationale for r in results),
+        )
+
+    @classmethod
+    def from_log(cls, path: Path) -> "ResultFrame":
+        return cls.from_results(read_results(path))
+
+    def to_results(self) -> list[AnalysisResult]:
+        published = pd.to_datetime(self.published_at).tz_localize(timezone.utc).to_pydatetime()
+        return [
+            AnalysisResult(
+                article=NewsArticle(
+                    title=self.title[i],
+                    description=self.description[i],
+                    published_at=published[i],
+                    source=self.sources[self.source_code[i]] if self.source_code[i] != NO_SOURCE else None,
+                    url=self.url[i],
+                ),
+                is_relevant=bool(self.is_relevant[i]),
+                category=CATEGORY_ORDER[self.category_code[i]],
+                sentiment_score=int(self.sentiment_score[i]),
+                impact_reasoning=self.impact_reasoning[i],
+                rationale=self.rationale[i],
+                confidence_score=float(self.confidence_score[i]),
+            )
+            for i in range(len(self))
+        ]
+
+    @property
+    def relevant_mask(self) -> np.ndarray:
+        """Same rule as MarketEngine: flagged relevant and not categorized Irrelevant."""
+        return self.is_relevant & (self.category_code != IRRELEVANT_CODE)
+
+    def chart_data(self, category_labels: dict[str, str] | None = None) -> pd.DataFrame:
+        """Relevant rows as a DataFrame built column-wise (no per-row dicts)."""
+        mask = self.relevant_mask
+        labels = [(category_labels or {}).get(name, name) for name in CATEGORY_ORDER]
+        return pd.DataFrame({
+            "title": self.title[mask],
+            "score": self.sentiment_score[mask],
+            "category": pd.Categorical.from_codes(self.category_code[mask], categories=labels),
+            "published_at": pd.to_datetime(self.published_at[mask]).tz_localize(timezone.utc),
+        })
+
+
+def _object_array(values: Iterable) -> np.ndarray:
+    items = list(values)
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
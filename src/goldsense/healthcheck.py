@@ -15,6 +15,10 @@ class ServiceCheck:
         articles = await self.fetcher.fetch_latest()
         return {"count": len(articles), "status": "ok"}
 
+    def price_source_states(self) -> list[dict]:
+        """Circuit breaker state per price source (closed / open / half_open)."""
+        return self.price_service.breaker_states()
+
     def check_yfinance(self) -> float:
         price = self.price_service.get_current_price()
         if price is None:
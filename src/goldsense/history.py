@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import math
+import re
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+from .logger import JsonlLogger
+from .models import AnalysisResult, NewsArticle
+from .textsearch import match_query
+
+SORT_FIELDS = {
+    "published_at": "published_ts",
+    "logged_at": "logged_at",
+    "confidence": "confidence_score",
+    "sentiment": "sentiment_score",
+}
+_RESULT_COLUMNS = ", ".join(
+    f"history.{column}"
+    for column in (
+        "published_at", "title", "description", "source", "url", "is_relevant", "category",
+        "sentiment_score", "impact_reasoning", "rationale", "confidence_score",
+    )
+)
+_BM25_WEIGHTS = "4.0, 2.0, 1.0, 0.5"  # title, description, impact_reasoning, rationale
+_RELATIVE = re.compile(r"^(\d+)([mhd])$")
+_UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_duration(raw: str) -> timedelta:
+    """`90m` / `24h` / `3d`; ValueError otherwise."""
+    match = _RELATIVE.match(raw.strip().lower())
+    if not match:
+        raise ValueError(f"invalid duration: {raw!r} (e.g. 90m, 24h, 3d)")
+    return timedelta(**{_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def parse_since(raw: str, now: datetime | None = None) -> datetime:
+    """`90m` / `24h` / `3d` before now, or an ISO date/datetime (UTC if naive); ValueError otherwise."""
+    now = now or datetime.now(timezone.utc)
+    match = _RELATIVE.match(raw.strip().lower())
+    if match:
+        return now - timedelta(**{_UNITS[match.group(2)]: int(match.group(1))})
+    try:
+        parsed = datetime.fromisoformat(raw.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"invalid since value: {raw!r} (e.g. 24h, 3d, 2026-02-01)") from None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class HistoryFilter:
+    start: datetime | None = None  # Published at or after
+    end: datetime | None = None  # Published before
+    categories: tuple[str, ...] = ()
+    sources: tuple[str, ...] = ()
+    models: tuple[str, ...] = ()
+    min_confidence: float | None = None
+    relevant_only: bool = False
+
+    def where(self, *extra: str) -> tuple[str, list]:
+        clauses, params = list(extra), []
+        if self.start is not None:
+            clauses.append("published_ts >= ?")
+            params.append(self.start.timestamp())
+        if self.end is not None:
+            clauses.append("published_ts < ?")
+            params.append(self.end.timestamp())
+        for column, values in (("category", self.categories), ("source", self.sources), ("model", self.models)):
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if self.min_confidence is not None:
+            clauses.append("confidence_score >= ?")
+            params.append(self.min_confidence)
+        if self.relevant_only:
+            clauses.append("is_relevant = 1")
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+@dataclass(frozen=True)
+class HistoryPage:
+    results: list[AnalysisResult]
+    total: int  # Matching rows across all pages
+    page: int  # 1-based
+    page_size: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, math.ceil(self.total / self.page_size))
+
+
+@dataclass
+class AnalysisHistory:
+    """Filtered, paginated reads of the logged analyses.
+
+    Queries run against the `history` table that `JsonlLogger` keeps in its
+    SQLite index (indexed on publish time, category, source and model) and
+    its FTS5 full-text index, so they do not touch the JSONL log or its
+    archived segments.
+    """
+
+    index_path: Path
+
+    @classmethod
+    def for_log(cls, path: Path) -> "AnalysisHistory":
+        """Bring the log's index up to date, then read from it."""
+        return cls(JsonlLogger(path).index_path)
+
+    def query(
+        self,
+        filters: HistoryFilter | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        sort: str = "published_at",
+        descending: bool = True,
+    ) -> HistoryPage:
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort} (expected one of {', '.join(SORT_FIELDS)})")
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be positive")
+
+        where, params = (filters or HistoryFilter()).where()
+        direction = "DESC" if descending else "ASC"
+        with closing(self._connect()) as connection:
+            total = connection.execute(f"SELECT COUNT(*) FROM history {where}", params).fetchone()[0]
+            rows = connection.execute(
+                f"SELECT {_RESULT_COLUMNS} FROM history {where} "
+                f"ORDER BY {SORT_FIELDS[sort]} {direction}, id {direction} LIMIT ? OFFSET ?",
+                [*params, page_size, (page - 1) * page_size],
+            ).fetchall()
+        return HistoryPage([_row_to_result(row) for row in rows], total, page, page_size)
+
+    def iter_results(self, filters: HistoryFilter | None = None, batch_size: int = 1000) -> Iterator[AnalysisResult]:
+        """Every matching result, oldest first, with no page cap.
+
+        Reads in keyset-paged batches on (published_ts, id), so rows logged
+        while iterating neither shift nor repeat earlier ones.
+        """
+        last_ts, last_id = float("-inf"), 0
+        with closing(self._connect()) as connection:
+            while True:
+                where, params = (filters or HistoryFilter()).where("(published_ts, id) > (?, ?)")
+                rows = connection.execute(
+                    f"SELECT history.published_ts, history.id, {_RESULT_COLUMNS} FROM history {where} "
+                    "ORDER BY published_ts, id LIMIT ?",
+                    [last_ts, last_id, *params, batch_size],
+                ).fetchall()
+                for row in rows:
+                    yield _row_to_result(row[2:])
+                if len(rows) < batch_size:
+                    return
+                last_ts, last_id = rows[-1][0], rows[-1][1]
+
+    def search(
+        self,
+        text: str,
+        filters: HistoryFilter | None = None,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> HistoryPage:
+        """Best matches first for `text` in title, description and reasoning.
+
+        Every word must match (as a prefix, Turkish-folded, diacritics
+        ignored); ranking is BM25 with title hits weighted highest.
+        """
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be positive")
+        expression = match_query(text)
+        if expression is None:
+            return HistoryPage([], 0, page, page_size)
+
+        where, params = (filters or HistoryFilter()).where("history_fts MATCH ?")
+        params = [expression, *params]
+        # CROSS JOIN pins the FTS table as the outer loop; otherwise SQLite may
+        # scan a filter index and evaluate MATCH row by row.
+        joined = "history_fts CROSS JOIN history ON history.id = history_fts.rowid"
+        with closing(self._connect()) as connection:
+            total = connection.execute(f"SELECT COUNT(*) FROM {joined} {where}", params).fetchone()[0]
+            rows = connection.execute(
+                f"SELECT {_RESULT_COLUMNS} FROM {joined} {where} "
+                f"ORDER BY bm25(history_fts, {_BM25_WEIGHTS}), history.id DESC LIMIT ? OFFSET ?",
+                [*params, page_size, (page - 1) * page_size],
+            ).fetchall()
+        return HistoryPage([_row_to_result(row) for row in rows], total, page, page_size)
+
+    def facets(self) -> dict[str, list[str]]:
+        """Distinct categories, sources and models, for filter widgets."""
+        with closing(self._connect()) as connection:
+            return {
+                name: [
+                    value
+                    for (value,) in connection.execute(
+                        f"SELECT DISTINCT {column} FROM history WHERE {column} IS NOT NULL ORDER BY {column}"
+                    )
+                ]
+                for name, column in (("categories", "category"), ("sources", "source"), ("models", "model"))
+            }
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(read_only_uri(self.index_path), uri=True, timeout=10)
+
+
+def read_only_uri(path: Path) -> str:
+    """SQLite URI opening `path` read-only; `?`, `#` and `%` in the path are escaped."""
+    return Path(path).resolve().as_uri() + "?mode=ro"
+
+
+def _row_to_result(row: tuple) -> AnalysisResult:
+    (published_at, title, description, source, url, is_relevant, category, sentiment_score,
+     impact_reasoning, rationale, confidence_score) = row
+    return AnalysisResult(
+        article=NewsArticle(
+            title=title,
+            description=description,
+            published_at=datetime.fromisoformat(published_at),
+            source=source,
+            url=url,
+        ),
+        is_relevant=bool(is_relevant),
+        category=category,
+        sentiment_score=sentiment_score,
+        impact_reasoning=impact_reasoning,
+        rationale=rationale,
+        confidence_score=confidence_score,
+    )
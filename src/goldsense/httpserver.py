@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import weakref
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from urllib.parse import parse_qs, urlsplit
+
+# Minimal HTTP/1.1 server on asyncio streams (standard library only).
+# Enough for local tools: keep-alive, Content-Length bodies, JSON helpers.
+# Not intended to face the internet.
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+_MAX_BODY_BYTES = 10 * 1024 * 1024
+# Open connections per server (handler task, writer), closed by `stop_http_server`
+_CONNECTIONS: "weakref.WeakKeyDictionary[asyncio.AbstractServer, set]" = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class HttpRequest:
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]  # Lower-cased names
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8")) if self.body else None
+
+    def param(self, name: str, default: str | None = None) -> str | None:
+        values = self.query.get(name)
+        return values[0] if values else default
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    status: int
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def json(cls, payload, status: int = 200, headers: dict[str, str] | None = None) -> "HttpResponse":
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        return cls(status, body, {"Content-Type": "application/json", **(headers or {})})
+
+    @classmethod
+    def text(cls, text: str, status: int = 200, headers: dict[str, str] | None = None) -> "HttpResponse":
+        return cls(status, text.encode("utf-8"), {"Content-Type": "text/plain; charset=utf-8", **(headers or {})})
+
+
+Handler = Callable[[HttpRequest], Awaitable[HttpResponse]]
+
+
+async def start_http_server(handler: Handler, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+    """Start serving `handler`; port 0 picks a free port (see `bound_port`).
+
+    Stop with `stop_http_server`, which also ends idle keep-alive connections.
+    """
+    connections: set[tuple[asyncio.Task, asyncio.StreamWriter]] = set()
+
+    async def _on_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = (asyncio.current_task(), writer)
+        connections.add(connection)
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                try:
+                    response = await handler(request)
+                except Exception as exc:  # Handler bug must not kill the connection loop
+                    response = HttpResponse.json({"error": str(exc)}, status=500)
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                writer.write(_encode_response(response, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+            connections.discard(connection)
+
+    server = await asyncio.start_server(_on_connection, host, port)
+    _CONNECTIONS[server] = connections
+    return server
+
+
+async def stop_http_server(server: asyncio.AbstractServer) -> None:
+    """Stop accepting, close open connections and wait for their handlers.
+
+    Closing the transport ends a handler waiting for the next keep-alive
+    request with EOF. Cancelling it instead would leave CancelledError
+    tracebacks from the stream callback on Python 3.11.
+    """
+    server.close()
+    connections = list(_CONNECTIONS.pop(server, ()))
+    for _, writer in connections:
+        writer.close()
+    await asyncio.gather(*(task for task, _ in connections), return_exceptions=True)
+    await server.wait_closed()
+
+
+def bound_port(server: asyncio.AbstractServer) -> int:
+    return server.sockets[0].getsockname()[1]
+
+
+async def _read_request(reader: asyncio.StreamReader) -> HttpRequest | None:
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", "0") or 0)
+    if length > _MAX_BODY_BYTES:
+        raise ValueError("Request body too large")
+    body = await reader.readexactly(length) if length else b""
+
+    parts = urlsplit(target)
+    return HttpRequest(
+        method=method.upper(),
+        path=parts.path,
+        query=parse_qs(parts.query),
+        headers=headers,
+        body=body,
+    )
+
+
+def _encode_response(response: HttpResponse, keep_alive: bool) -> bytes:
+    reason = _REASONS.get(response.status, "")
+    lines = [f"HTTP/1.1 {response.status} {reason}"]
+    headers = {
+        "Content-Length": str(len(response.body)),
+        "Connection": "keep-alive" if keep_alive else "close",
+        **response.headers,
+    }
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + response.body
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+
+# Compact response schema for the "lean" output mode.
+# One single-line JSON object with one-letter keys replaces six verbose
+# adapter fields, which cuts completion tokens (the dominant latency cost):
+#   r: relevance (1/0)   c: category code   s: score 1-10
+#   k: confidence 0-1    i: Turkish impact  w: English rationale (optional)
+
+CATEGORY_CODES = {
+    "Macro": "M",
+    "Geopolitical": "G",
+    "Industrial": "I",
+    "Irrelevant": "X",
+}
+_CODE_TO_CATEGORY = {code: name for name, code in CATEGORY_CODES.items()}
+
+# Keys, quotes, score and confidence - everything except the two text fields
+_STRUCTURAL_TOKENS = 40
+_CHARS_PER_TOKEN = 4
+# The per-field budgets are guidance in the prompt (and enforced by `_truncate`);
+# the hard cap must not cut the JSON short when Turkish text tokenizes denser
+_CAP_HEADROOM = 2
+_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class LeanVerdict:
+    """Parsed compact verdict; attribute names mirror GoldSignalSignature outputs."""
+
+    is_relevant: bool
+    category: str
+    sentiment_score: int
+    confidence_score: float
+    impact_reasoning: str
+    rationale: str | None = None
+
+
+def verdict_description(include_rationale: bool, reasoning_max_tokens: int, rationale_max_tokens: int) -> str:
+    fields = [
+        '"r": 1 if the news materially affects gold else 0',
+        '"c": category code, one of M (Macro), G (Geopolitical), I (Industrial), X (Irrelevant)',
+        '"s": integer gold sentiment 1 (strongly bearish) to 10 (strongly bullish)',
+        '"k": confidence 0.0-1.0',
+        f'"i": impact mechanism in TURKISH, at most {reasoning_max_tokens} tokens',
+    ]
+    if include_rationale:
+        fields.append(f'"w": short English reasoning, at most {rationale_max_tokens} tokens')
+    return "A single-line JSON object with keys " + "; ".join(fields) + ". No other text."
+
+
+def max_completion_tokens(include_rationale: bool, reasoning_max_tokens: int, rationale_max_tokens: int) -> int:
+    """Hard `max_tokens` cap for one lean completion (adapter framing included).
+
+    Twice the field budgets, so an overlong answer is truncated by
+    `parse_verdict` instead of losing its closing brace at the provider.
+    """
+    budget = reasoning_max_tokens
+    if include_rationale:
+        budget += rationale_max_tokens
+    return _STRUCTURAL_TOKENS + _CAP_HEADROOM * budget
+
+
+def encode_verdict(
+    *,
+    is_relevant: bool,
+    category: str,
+    sentiment_score: int,
+    confidence_score: float,
+    impact_reasoning: str,
+    rationale: str | None = None,
+) -> str:
+    payload = {
+        "r": 1 if is_relevant else 0,
+        "c": CATEGORY_CODES.get(category, "X"),
+        "s": int(sentiment_score),
+        "k": round(float(confidence_score), 2),
+        "i": impact_reasoning,
+    }
+    if rationale:
+        payload["w"] = rationale
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def parse_verdict(raw: str, reasoning_max_tokens: int | None = None, rationale_max_tokens: int | None = None) -> LeanVerdict:
+    """Parse a compact verdict, tolerating code fences and surrounding chatter.
+
+    Raises ValueError if no JSON object can be recovered.
+    """
+    match = _OBJECT_RE.search(str(raw))
+    if not match:
+        raise ValueError(f"Lean verdict is not a JSON object: {str(raw)[:80]!r}")
+    data = json.loads(match.group(0))
+    if not isinstance(data, dict):
+        raise ValueError("Lean verdict must be a JSON object")
+
+    code = str(data.get("c", "X")).strip()
+    category = _CODE_TO_CATEGORY.get(code.upper(), code)  # Accept full names too
+    rationale = data.get("w")
+
+    return LeanVerdict(
+        is_relevant=str(data.get("r", 0)).strip().lower() in {"1", "true", "yes"},
+        category=category,
+        sentiment_score=data.get("s", 5),
+        confidence_score=data.get("k", 0.5),
+        impact_reasoning=_truncate(str(data.get("i", "")).strip(), reasoning_max_tokens),
+        rationale=_truncate(str(rationale).strip(), rationale_max_tokens) if rationale else None,
+    )
+
+
+def _truncate(text: str, max_tokens: int | None) -> str:
+    """Cut text to roughly `max_tokens`, on a word boundary."""
+    if max_tokens is None:
+        return text
+    limit = max_tokens * _CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0].rstrip(",;:") + "…"
@@ -1,48 +1,442 @@
 from __future__ import annotations
 
+import atexit
 import json
-from dataclasses import asdict, dataclass
-from datetime import datetime, timezone
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from .models import AnalysisResult
+from .archive import SegmentArchive, SegmentInfo, _read_segment, iter_log_lines
+from .models import AnalysisResult, NewsArticle
+from .serialization import dumps, loads, result_to_dict
+from .textsearch import FTS_TOKENIZER, fold_text
+
+
+_INDEX_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+-- One row per log line, queried by goldsense.history
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    published_ts REAL NOT NULL,  -- Unix seconds
+    published_at TEXT NOT NULL,
+    logged_at TEXT,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    source TEXT,
+    url TEXT,
+    is_relevant INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    sentiment_score INTEGER NOT NULL,
+    impact_reasoning TEXT NOT NULL,
+    rationale TEXT,
+    confidence_score REAL NOT NULL,
+    model TEXT,
+    hot INTEGER NOT NULL DEFAULT 0  -- 1 while the line is in the hot file (rebuilt if that file is replaced)
+);
+-- Trailing confidence_score lets min-confidence filters and counts stay in the index
+CREATE INDEX IF NOT EXISTS history_published ON history (published_ts, confidence_score);
+CREATE INDEX IF NOT EXISTS history_category ON history (category, published_ts, confidence_score);
+CREATE INDEX IF NOT EXISTS history_source ON history (source, published_ts, confidence_score);
+CREATE INDEX IF NOT EXISTS history_model ON history (model, published_ts, confidence_score);
+CREATE INDEX IF NOT EXISTS history_confidence ON history (confidence_score);
+CREATE INDEX IF NOT EXISTS history_url ON history (url);
+-- Full-text index over case-folded text (rowid = history.id), see goldsense.textsearch
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    title, description, impact_reasoning, rationale, tokenize = '{FTS_TOKENIZER}'
+);
+"""
+_HISTORY_VERSION = "3"  # Bump to rebuild the history tables from the log
+_HISTORY_COLUMNS = (
+    "published_ts, published_at, logged_at, title, description, source, url, is_relevant, "
+    "category, sentiment_score, impact_reasoning, rationale, confidence_score, model, hot"
+)
 
 
 @dataclass
 class JsonlLogger:
+    """Append-only JSONL analysis log with a persistent URL index.
+
+    Deduplication uses a sidecar SQLite index (`<log>.index.sqlite`) with a
+    primary key on the URL, so a check is one indexed lookup and creating a
+    logger no longer scans the history. The index remembers how many bytes
+    of the JSONL file it has covered. On start-up only lines past that
+    offset are indexed, so the first run migrates the existing file once
+    and later runs pick up anything appended by other writers. If the file
+    was truncated or replaced (smaller than the offset, or another inode),
+    the history rows of the hot file are rebuilt from it.
+
+    The same index holds a `history` table with one row per logged line,
+    plus its FTS5 full-text index, which `goldsense.history` filters,
+    searches and pages through.
+
+    With `rotate_max_bytes` / `rotate_max_age` set (both off by default),
+    the hot file is moved into a compressed segment once it grows too big
+    or too old: `<log>.segments/` then holds the older lines (see
+    `goldsense.archive`) and the hot file only the newest ones.
+    `read_results` reads across segments transparently; tools reading the
+    JSONL file directly see only the hot part.
+    """
+
     path: Path
-    _seen_urls: set[str] | None = None
+    index_path: Path | None = None
+    rotate_max_bytes: int | None = None
+    rotate_max_age: timedelta | None = None
+    codec: str | None = None  # "gzip" / "zstd"; default: zstd if installed
 
     def __post_init__(self):
-        # Load existing URLs from log file for deduplication
-        if self._seen_urls is None:
-            object.__setattr__(self, '_seen_urls', set())
-            if self.path.exists():
-                try:
-                    with self.path.open("r", encoding="utf-8") as file:
-                        for line in file:
-                            if line.strip():
-                                entry = json.loads(line)
-                                url = entry.get("article", {}).get("url")
-                                if url:
-                                    self._seen_urls.add(url)
-                except Exception:
-                    pass  # If log file is corrupted, continue with empty set
-
-    def log(self, result: AnalysisResult) -> None:
-        # URL-based deduplication
-        url = result.article.url
-        if url and url in self._seen_urls:
-            return  # Skip duplicate URLs
-        
-        payload = asdict(result)
-        payload["logged_at"] = datetime.now(timezone.utc).isoformat()
-        payload["article"]["published_at"] = result.article.published_at.isoformat()
+        if self.index_path is None:
+            self.index_path = self.path.with_suffix(".index.sqlite")
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.executescript(_INDEX_SCHEMA)
+            if self._get_meta(connection, "history_version") != _HISTORY_VERSION:
+                # The layout may have changed: recreate the history tables (refilled below)
+                connection.executescript(
+                    "DROP TABLE IF EXISTS history; DROP TABLE IF EXISTS history_fts;" + _INDEX_SCHEMA
+                )
+            with _write_transaction(connection):
+                if self._get_meta(connection, "history_version") != _HISTORY_VERSION:
+                    # New or outdated history table: re-read the whole log once
+                    connection.execute("DELETE FROM history")
+                    connection.execute("DELETE FROM history_fts")
+                    self._set_offset(connection, 0)
+                    self._set_meta(connection, "indexed_segments", "[]")
+                    self._set_meta(connection, "history_version", _HISTORY_VERSION)
+                self.archive.finish_pending(self.codec)  # Complete a rotation interrupted by a crash
+                self._index_segments(connection)
+                self._catch_up(connection)
+
+    @property
+    def archive(self) -> SegmentArchive:
+        return SegmentArchive.for_log(self.path)
+
+    def __contains__(self, url: str) -> bool:
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def log(self, result: AnalysisResult, model: str | None = None) -> None:
+        self.log_many([result], model=model)
+
+    def log_many(self, results: Iterable[AnalysisResult], fsync: bool = True, model: str | None = None) -> int:
+        """Append a batch with one transaction and one open/write/fsync.
+
+        Results whose URL is already logged (or repeated in the batch) are
+        skipped. `model` is stored with each line. Returns the number of
+        lines written.
+        """
+        results = list(results)
+        if not results:
+            return 0
+        logged_at = datetime.now(timezone.utc).isoformat()
 
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("a", encoding="utf-8") as file:
-            file.write(json.dumps(payload, ensure_ascii=False) + "\n")
-        
-        # Add to seen URLs
-        if url:
-            self._seen_urls.add(url)
+        with closing(self._connect()) as connection, _write_transaction(connection):
+            self._catch_up(connection)  # Index lines other writers appended since our last write
+            lines = []
+            for result in results:
+                url = result.article.url
+                if url and connection.execute("INSERT OR IGNORE INTO urls (url) VALUES (?)", (url,)).rowcount == 0:
+                    continue  # Skip duplicate URLs
+                entry = result_to_dict(result)
+                entry["logged_at"] = logged_at
+                entry["model"] = model
+                _insert_history(connection, entry, hot=True)
+                lines.append(dumps(entry) + b"\n")
+            if not lines:
+                return 0
+
+            with self.path.open("ab") as file:
+                file.write(b"".join(lines))
+                file.flush()
+                if fsync:
+                    os.fsync(file.fileno())
+                offset = file.tell()
+                inode = os.fstat(file.fileno()).st_ino
+            self._set_offset(connection, offset, inode)
+            if self._rotation_due(connection, offset):
+                self._rotate(connection)
+        return len(lines)
+
+    def rotate(self) -> SegmentInfo | None:
+        """Force the hot file into a new segment (no-op when it is empty)."""
+        with closing(self._connect()) as connection, _write_transaction(connection):
+            self._catch_up(connection)
+            return self._rotate(connection)
+
+    def compact(self) -> tuple[int, int]:
+        """Rotate, then merge all segments dropping superseded entries per URL.
+
+        Returns (records before, records after). The URL index is unchanged:
+        compaction never removes the last entry of a URL.
+        """
+        with closing(self._connect()) as connection, _write_transaction(connection):
+            self._catch_up(connection)
+            self._rotate(connection)
+            counts = self.archive.compact(self.codec)
+            connection.execute(  # Mirror the archive: keep the last row per URL
+                "DELETE FROM history WHERE url IS NOT NULL AND id NOT IN "
+                "(SELECT MAX(id) FROM history WHERE url IS NOT NULL GROUP BY url)"
+            )
+            connection.execute("DELETE FROM history_fts WHERE rowid NOT IN (SELECT id FROM history)")
+            self._set_meta(connection, "indexed_segments", json.dumps([s.name for s in self.archive.segments()]))
+            return counts
+
+    def _rotation_due(self, connection: sqlite3.Connection, size: int) -> bool:
+        if self.rotate_max_bytes and size >= self.rotate_max_bytes:
+            return True
+        if self.rotate_max_age and size > 0:
+            started = self._get_meta(connection, "hot_started_at")
+            if started is None:
+                self._set_meta(connection, "hot_started_at", str(time.time()))
+                return False
+            return time.time() - float(started) >= self.rotate_max_age.total_seconds()
+        return False
+
+    def _rotate(self, connection: sqlite3.Connection) -> SegmentInfo | None:
+        segment = self.archive.rotate(self.path, self.codec)
+        if segment is None:
+            return None
+        self._set_offset(connection, 0)
+        connection.execute("DELETE FROM meta WHERE key = 'jsonl_inode'")
+        connection.execute("UPDATE history SET hot = 0 WHERE hot = 1")  # Their lines now live in the segment
+        self._set_meta(connection, "hot_started_at", str(time.time()))
+        indexed = json.loads(self._get_meta(connection, "indexed_segments") or "[]")
+        self._set_meta(connection, "indexed_segments", json.dumps([*indexed, segment.name]))
+        return segment
+
+    def _index_segments(self, connection: sqlite3.Connection) -> None:
+        # Segments not yet in this index (e.g. the index file was deleted)
+        indexed = set(json.loads(self._get_meta(connection, "indexed_segments") or "[]"))
+        segments = self.archive.segments()
+        missing = [segment for segment in segments if segment.name not in indexed]
+        if not missing:
+            return
+        for segment in missing:
+            for raw in _read_segment(self.archive.directory / segment.name, segment.codec):
+                _index_line(connection, raw)
+        self._set_meta(connection, "indexed_segments", json.dumps([segment.name for segment in segments]))
+
+    def _catch_up(self, connection: sqlite3.Connection) -> None:
+        offset = self._offset(connection)
+        if not self.path.exists():
+            return
+        stat = self.path.stat()
+        inode = self._get_meta(connection, "jsonl_inode")
+        if stat.st_size < offset or (offset and inode is not None and int(inode) != stat.st_ino):
+            # File was truncated or replaced: rebuild its rows instead of indexing them twice
+            # (known URLs stay indexed)
+            connection.execute("DELETE FROM history_fts WHERE rowid IN (SELECT id FROM history WHERE hot = 1)")
+            connection.execute("DELETE FROM history WHERE hot = 1")
+            offset = 0
+        if stat.st_size == offset:
+            self._set_offset(connection, offset, stat.st_ino)
+            return
+
+        with self.path.open("rb") as file:
+            file.seek(offset)
+            for raw in file:
+                if not raw.endswith(b"\n"):
+                    break  # Partial last line (writer mid-append): index it next time
+                offset += len(raw)
+                _index_line(connection, raw, hot=True)
+        self._set_offset(connection, offset, stat.st_ino)
+
+    def _offset(self, connection: sqlite3.Connection) -> int:
+        return int(self._get_meta(connection, "jsonl_offset") or 0)
+
+    def _set_offset(self, connection: sqlite3.Connection, offset: int, inode: int | None = None) -> None:
+        self._set_meta(connection, "jsonl_offset", str(offset))
+        if inode is not None:  # Identity of the hot file the offset belongs to
+            self._set_meta(connection, "jsonl_inode", str(inode))
+
+    @staticmethod
+    def _get_meta(connection: sqlite3.Connection, key: str) -> str | None:
+        row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_meta(connection: sqlite3.Connection, key: str, value: str) -> None:
+        connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are explicit (BEGIN IMMEDIATE / `with connection`)
+        return sqlite3.connect(self.index_path, timeout=10, isolation_level=None)
+
+
+@dataclass
+class BufferedJsonlWriter:
+    """Background writer thread in front of `JsonlLogger.log_many`.
+
+    `submit` only enqueues; it blocks when the bounded queue is full, which
+    applies backpressure instead of growing memory. The writer thread drains
+    up to `max_batch` results at a time, or whatever arrived within
+    `flush_interval_seconds`, and appends them as one fsync'd batch.
+    `flush` waits until everything submitted is on disk. `close` runs at
+    interpreter exit, so pending results are flushed on normal shutdown.
+    """
+
+    logger: JsonlLogger
+    model: str | None = None
+    max_queue: int = 1024
+    max_batch: int = 256
+    flush_interval_seconds: float = 0.5
+    _queue: queue.Queue = field(init=False, repr=False)
+    _thread: threading.Thread = field(init=False, repr=False)
+    _error: BaseException | None = field(default=None, init=False, repr=False)
+    _closed: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, result: AnalysisResult) -> None:
+        if self._closed:
+            raise RuntimeError("BufferedJsonlWriter is closed")
+        self._queue.put(result)
+
+    def submit_many(self, results: Iterable[AnalysisResult]) -> None:
+        for result in results:
+            self.submit(result)
+
+    def flush(self) -> None:
+        """Block until all submitted results are written; re-raise a writer error."""
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(batch) < self.max_batch and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            results = [item for item in batch if item is not _STOP]
+            try:
+                self.logger.log_many(results, model=self.model)
+            except BaseException as exc:  # Surface on the next flush(); keep the thread alive
+                print(f"⚠️  Analiz kaydı yazılamadı: {exc}")
+                self._error = exc
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is _STOP:
+                return
+
+
+_STOP = object()
+
+
+def _index_line(connection: sqlite3.Connection, raw: bytes, hot: bool = False) -> None:
+    try:
+        entry = loads(raw)
+        url = entry.get("article", {}).get("url")
+    except (ValueError, AttributeError):
+        return  # Corrupted line: nothing to index
+    if url:
+        connection.execute("INSERT OR IGNORE INTO urls (url) VALUES (?)", (url,))
+    try:
+        _insert_history(connection, entry, hot)
+    except (KeyError, TypeError, ValueError):
+        pass  # Incomplete entry: deduplicated, but not queryable
+
+
+def _insert_history(connection: sqlite3.Connection, entry: dict, hot: bool = False) -> None:
+    article = entry["article"]
+    published_at = datetime.fromisoformat(article["published_at"])
+    cursor = connection.execute(
+        f"INSERT INTO history ({_HISTORY_COLUMNS}) VALUES ({', '.join('?' * 15)})",
+        (
+            published_at.timestamp(),
+            article["published_at"],
+            entry.get("logged_at"),
+            article.get("title") or "",
+            article.get("description") or "",
+            article.get("source"),
+            article.get("url"),
+            int(bool(entry["is_relevant"])),
+            entry["category"],
+            int(entry["sentiment_score"]),
+            entry.get("impact_reasoning") or "",
+            entry.get("rationale"),
+            float(entry.get("confidence_score", 0.5)),
+            entry.get("model"),
+            int(hot),
+        ),
+    )
+    connection.execute(
+        "INSERT INTO history_fts (rowid, title, description, impact_reasoning, rationale) VALUES (?, ?, ?, ?, ?)",
+        (
+            cursor.lastrowid,
+            fold_text(article.get("title")),
+            fold_text(article.get("description")),
+            fold_text(entry.get("impact_reasoning")),
+            fold_text(entry.get("rationale")),
+        ),
+    )
+
+
+@contextmanager
+def _write_transaction(connection: sqlite3.Connection) -> Iterator[None]:
+    # IMMEDIATE takes the write lock up front, so concurrent loggers cannot
+    # both claim the same URL between the check and the append.
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.rollback()
+        raise
+    connection.commit()
+
+
+def read_results(path: Path) -> Iterator[AnalysisResult]:
+    """Yield logged analyses in order (archived segments, then the hot file), skipping corrupted lines."""
+    for line in iter_log_lines(path):
+        if not line.strip():
+            continue
+        try:
+            yield result_from_entry(loads(line))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            continue
+
+
+def result_from_entry(entry: dict) -> AnalysisResult:
+    """Inverse of the payload written by `JsonlLogger.log`."""
+    article = entry["article"]
+    return AnalysisResult(
+        article=NewsArticle(
+            title=article.get("title") or "",
+            description=article.get("description") or "",
+            published_at=datetime.fromisoformat(article["published_at"]),
+            source=article.get("source"),
+            url=article.get("url"),
+        ),
+        is_relevant=bool(entry["is_relevant"]),
+        category=entry["category"],
+        sentiment_score=int(entry["sentiment_score"]),
+        impact_reasoning=entry.get("impact_reasoning") or "",
+        rationale=entry.get("rationale"),
+        confidence_score=float(entry.get("confidence_score", 0.5)),
+    )
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .serialization import dumps
+
+
+@dataclass(frozen=True)
+class CallMetrics:
+    """One analysis attempt (one or more LM requests for a single article)."""
+
+    article_url: str | None
+    model: str | None
+    prompt_tokens: int
+    completion_tokens: int
+    queue_wait_seconds: float  # Time spent waiting for a concurrency slot
+    latency_seconds: float  # Time spent inside the LM call(s)
+    retries: int  # 0 on the first attempt
+    cache_hit: bool
+    cost: float | None
+    succeeded: bool
+    cached_prompt_tokens: int = 0  # Prompt tokens served from the provider's prefix cache
+
+    @classmethod
+    def from_history(
+        cls,
+        entries: list[dict],
+        *,
+        article_url: str | None,
+        queue_wait_seconds: float,
+        latency_seconds: float,
+        retries: int,
+        succeeded: bool,
+        default_model: str | None = None,
+    ) -> "CallMetrics":
+        """Build metrics from the `lm.history` entries produced by one attempt."""
+        prompt_tokens = 0
+        completion_tokens = 0
+        cached_prompt_tokens = 0
+        costs: list[float] = []
+        cache_hit = bool(entries)
+        model = default_model
+
+        for entry in entries:
+            usage = entry.get("usage") or {}
+            prompt_tokens += int(usage.get("prompt_tokens") or 0)
+            completion_tokens += int(usage.get("completion_tokens") or 0)
+            cached_prompt_tokens += _cached_tokens(usage)
+            if entry.get("cost") is not None:
+                costs.append(float(entry["cost"]))
+            model = entry.get("model") or model
+            hidden = getattr(entry.get("response"), "_hidden_params", None) or {}
+            cache_hit = cache_hit and bool(hidden.get("cache_hit"))
+
+        return cls(
+            article_url=article_url,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            queue_wait_seconds=queue_wait_seconds,
+            latency_seconds=latency_seconds,
+            retries=retries,
+            cache_hit=cache_hit,
+            cost=sum(costs) if costs else None,
+            succeeded=succeeded,
+            cached_prompt_tokens=cached_prompt_tokens,
+        )
+
+
+@dataclass(frozen=True)
+class RunMetrics:
+    started_at: str
+    model: str | None
+    calls: int
+    failed_calls: int
+    retries: int
+    cache_hits: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_cost: float | None
+    wall_seconds: float
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    queue_wait_p50: float
+    queue_wait_p95: float
+    queue_wait_p99: float
+    call_details: tuple[CallMetrics, ...] = ()
+    cached_prompt_tokens: int = 0
+    prefix_hash: str | None = None  # See GoldAnalyst.prefix_hash
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def prefix_cache_ratio(self) -> float:
+        """Share of prompt tokens the provider reported as cached."""
+        return self.cached_prompt_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    @property
+    def calls_per_second(self) -> float:
+        return self.calls / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+@dataclass
+class MetricsCollector:
+    """Thread-safe sink for per-call metrics of a single analysis run.
+
+    When the provider does not report a cost, it is estimated from the
+    per-million-token prices (if configured).
+    """
+
+    prompt_cost_per_million: float | None = None
+    completion_cost_per_million: float | None = None
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    _calls: list[CallMetrics] = field(default_factory=list, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def record(self, call: CallMetrics) -> None:
+        with self._lock:
+            self._calls.append(call)
+
+    @property
+    def calls(self) -> list[CallMetrics]:
+        with self._lock:
+            return list(self._calls)
+
+    def summarize(self, wall_seconds: float, prefix_hash: str | None = None) -> RunMetrics:
+        calls = self.calls
+        latencies = [c.latency_seconds for c in calls]
+        waits = [c.queue_wait_seconds for c in calls]
+        models = [c.model for c in calls if c.model]
+
+        return RunMetrics(
+            started_at=self.started_at.isoformat(),
+            model=models[-1] if models else None,
+            calls=len(calls),
+            failed_calls=sum(1 for c in calls if not c.succeeded),
+            retries=sum(1 for c in calls if c.retries > 0),
+            cache_hits=sum(1 for c in calls if c.cache_hit),
+            prompt_tokens=sum(c.prompt_tokens for c in calls),
+            completion_tokens=sum(c.completion_tokens for c in calls),
+            total_cost=self._total_cost(calls),
+            wall_seconds=wall_seconds,
+            latency_p50=percentile(latencies, 50),
+            latency_p95=percentile(latencies, 95),
+            latency_p99=percentile(latencies, 99),
+            queue_wait_p50=percentile(waits, 50),
+            queue_wait_p95=percentile(waits, 95),
+            queue_wait_p99=percentile(waits, 99),
+            call_details=tuple(calls),
+            cached_prompt_tokens=sum(c.cached_prompt_tokens for c in calls),
+            prefix_hash=prefix_hash,
+        )
+
+    def _total_cost(self, calls: list[CallMetrics]) -> float | None:
+        total = 0.0
+        known = False
+        for call in calls:
+            if call.cost is not None:
+                total += call.cost
+                known = True
+            elif self.prompt_cost_per_million is not None or self.completion_cost_per_million is not None:
+                total += call.prompt_tokens * (self.prompt_cost_per_million or 0.0) / 1_000_000
+                total += call.completion_tokens * (self.completion_cost_per_million or 0.0) / 1_000_000
+                known = True
+        return total if known else None
+
+
+def _cached_tokens(usage: dict) -> int:
+    # OpenAI-style `prompt_tokens_details.cached_tokens`; LiteLLM may hand back
+    # either a dict or a pydantic object, and most providers omit it entirely.
+    details = usage.get("prompt_tokens_details")
+    if details is None:
+        return 0
+    cached = details.get("cached_tokens") if isinstance(details, dict) else getattr(details, "cached_tokens", None)
+    return int(cached or 0)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Linear-interpolated percentile (same convention as numpy's default)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def append_run_metrics(path: Path, metrics: RunMetrics) -> None:
+    """Persist one run's metrics as a JSONL line next to the analysis log."""
+    payload = asdict(metrics)
+    payload["logged_at"] = datetime.now(timezone.utc).isoformat()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as file:
+        file.write(dumps(payload) + b"\n")
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from .metrics import RunMetrics
 
 Category = Literal["Macro", "Geopolitical", "Industrial", "Irrelevant"]
 
+# The record types below are slotted: no per-instance __dict__, which matters
+# when hundreds of thousands of historical analyses are loaded (backtests).
+# Low-cardinality strings (source, category, trend) are interned so repeated
+# values share one object. `asdict`, `replace` and pickling work unchanged.
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class NewsArticle:
     title: str
     description: str
@@ -15,8 +24,12 @@ class NewsArticle:
     source: str | None = None
     url: str | None = None
 
+    def __post_init__(self) -> None:
+        if self.source is not None:
+            object.__setattr__(self, "source", sys.intern(self.source))
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class AnalysisResult:
     article: NewsArticle
     is_relevant: bool
@@ -26,8 +39,11 @@ class AnalysisResult:
     rationale: str | None = None  # DSPy ChainOfThought reasoning - how the model arrived at its conclusion
     confidence_score: float = 0.5  # Model's confidence (0.0-1.0) in this analysis
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "category", sys.intern(self.category))
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class MarketSummary:
     average_score: float
     trend: str
@@ -35,3 +51,24 @@ class MarketSummary:
     relevant_articles: int
     weighted_score: float = 0.0  # Weighted by category and confidence
     confidence_average: float = 0.0  # Average confidence across all analyses
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "trend", sys.intern(self.trend))
+
+
+@dataclass(frozen=True)
+class AnalysisFailure:
+    article: NewsArticle
+    error: str
+    attempts: int
+
+
+@dataclass(frozen=True)
+class BatchAnalysis:
+    results: list[AnalysisResult]
+    failures: list[AnalysisFailure]
+    metrics: RunMetrics | None = None
+
+    @property
+    def attempted(self) -> int:
+        return len(self.results) + len(self.failures)
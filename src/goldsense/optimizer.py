@@ -0,0 +1,188 @@
+"""Fit MarketEngine category weights and thresholds on historical data.
+
+Weights are chosen to maximize the rank IC (forward-return correlation) of
+the weighted score. Every candidate is scored from the backtest's
+precomputed `SignalMatrix`, so a candidate costs one column of a matrix
+product and one rank correlation. Candidates are split across a process
+pool. Thresholds for the best weight vectors are then picked by hit rate.
+The result is written as a JSON config that `MarketEngine.from_config`
+loads at startup (ENGINE_CONFIG_PATH).
+
+    python -m goldsense.optimizer --prices data/gold_prices.csv --horizon 4h --out config/engine.json
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from .backtest import (
+    SIGNAL_CATEGORIES,
+    SignalMatrix,
+    baseline_config,
+    build_signal_matrix,
+    evaluate,
+    load_price_series,
+    rank_ic,
+)
+from .exceptions import GoldSenseError
+from .frame import ResultFrame
+
+
+def _steps(start: float, stop: float, step: float) -> tuple[float, ...]:
+    return tuple(float(value) for value in np.round(np.arange(start, stop + step / 2, step), 4))
+
+
+@dataclass(frozen=True)
+class SearchSpace:
+    weight_values: tuple[float, ...] = field(default_factory=lambda: _steps(0.0, 3.0, 0.1))  # 31³ ≈ 30k vectors
+    bullish_thresholds: tuple[float, ...] = field(default_factory=lambda: _steps(5.5, 9.0, 0.25))
+    bearish_thresholds: tuple[float, ...] = field(default_factory=lambda: _steps(2.0, 5.5, 0.25))
+    min_signals: int = 10  # Threshold pairs with fewer signals are ignored
+    top_k: int = 25  # Best-IC weight vectors that get a threshold search
+
+    def weight_vectors(self) -> np.ndarray:
+        combos = itertools.product(self.weight_values, repeat=len(SIGNAL_CATEGORIES))
+        vectors = np.array(list(combos), dtype=np.float64)
+        return vectors[vectors.sum(axis=1) > 0]  # All-zero weights give no score
+
+
+@dataclass(frozen=True)
+class FittedConfig:
+    bullish_threshold: float
+    bearish_threshold: float
+    category_weights: dict[str, float]
+    horizon: str
+    ic: float
+    hit_rate: float
+    signals: int
+    samples: int
+    baseline_ic: float | None
+    baseline_hit_rate: float | None
+    candidates: int
+    fitted_at: str
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def score_weights(matrix: SignalMatrix, weights: np.ndarray, horizon: str) -> np.ndarray:
+    """Rank IC of each (m, 3) weight vector for one horizon."""
+    returns = matrix.returns[horizon]
+    valid = (matrix.relevant > 0) & np.isfinite(returns)
+    return rank_ic(matrix.weighted_scores(weights)[valid], returns[valid])
+
+
+def fit(
+    matrix: SignalMatrix,
+    horizon: str,
+    space: SearchSpace | None = None,
+    workers: int | None = None,
+) -> FittedConfig:
+    space = space or SearchSpace()
+    if horizon not in matrix.returns:
+        raise GoldSenseError(f"Horizon {horizon} is not in the signal matrix")
+    matrix = replace(matrix, returns={horizon: matrix.returns[horizon]})
+    candidates = space.weight_vectors()
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(candidates)))
+    if workers == 1:
+        ic = score_weights(matrix, candidates, horizon)
+    else:
+        chunks = np.array_split(candidates, workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            ic = np.concatenate(list(pool.map(score_weights, [matrix] * len(chunks), chunks, [horizon] * len(chunks))))
+
+    ranked = np.argsort(np.where(np.isfinite(ic), -ic, np.inf), kind="stable")[: space.top_k]
+    ranked = ranked[np.isfinite(ic[ranked])]
+    if len(ranked) == 0:
+        raise GoldSenseError("Not enough priced analyses to fit the engine (IC undefined)")
+
+    report = evaluate(matrix, candidates[ranked], np.array(space.bullish_thresholds), np.array(space.bearish_thresholds))
+    report = report[report["signals"] >= space.min_signals]
+    if report.empty:
+        raise GoldSenseError(f"No configuration produced at least {space.min_signals} signals")
+    best = report.sort_values(
+        ["hit_rate", "ic", "mean_signal_return"], ascending=False, kind="stable"
+    ).iloc[0]
+
+    # Scores are invariant to scaling the weights; rescale to the baseline's
+    # total so fitted weights read on the same scale as CATEGORY_WEIGHTS.
+    baseline = baseline_config()
+    fitted_weights = np.array([best[f"{name.lower()}_weight"] for name in SIGNAL_CATEGORIES], dtype=np.float64)
+    baseline_total = sum(baseline[f"{name.lower()}_weight"] for name in SIGNAL_CATEGORIES)
+    fitted_weights *= baseline_total / fitted_weights.sum()
+
+    baseline_row = evaluate(
+        matrix,
+        np.array([[baseline[f"{name.lower()}_weight"] for name in SIGNAL_CATEGORIES]]),
+        np.array([baseline["bullish_threshold"]]),
+        np.array([baseline["bearish_threshold"]]),
+    ).iloc[0]
+
+    return FittedConfig(
+        bullish_threshold=float(best["bullish_threshold"]),
+        bearish_threshold=float(best["bearish_threshold"]),
+        category_weights={name: round(float(w), 4) for name, w in zip(SIGNAL_CATEGORIES, fitted_weights)},
+        horizon=horizon,
+        ic=float(best["ic"]),
+        hit_rate=float(best["hit_rate"]),
+        signals=int(best["signals"]),
+        samples=int(best["samples"]),
+        baseline_ic=_finite_or_none(baseline_row["ic"]),
+        baseline_hit_rate=_finite_or_none(baseline_row["hit_rate"]),
+        candidates=len(candidates),
+        fitted_at=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def write_engine_config(path: Path, fitted: FittedConfig) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(fitted.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _finite_or_none(value: float) -> float | None:
+    return float(value) if np.isfinite(value) else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fit MarketEngine weights and thresholds")
+    parser.add_argument(
+        "--prices", type=Path, required=True, help="CSV/Parquet with timestamp and price columns, or a PriceStore .sqlite"
+    )
+    parser.add_argument("--source", default=None, help="PriceStore source (default: most recorded)")
+    parser.add_argument("--log", type=Path, default=Path("logs/analysis.jsonl"))
+    parser.add_argument("--horizon", default="4h")
+    parser.add_argument("--freq", default="1h", help="Signal bucket size")
+    parser.add_argument("--min-signals", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", type=Path, default=Path("config/engine.json"))
+    args = parser.parse_args()
+
+    matrix = build_signal_matrix(
+        ResultFrame.from_log(args.log), load_price_series(args.prices, args.source), (args.horizon,), args.freq
+    )
+    started = time.perf_counter()
+    fitted = fit(matrix, args.horizon, SearchSpace(min_signals=args.min_signals), workers=args.workers)
+    elapsed = time.perf_counter() - started
+    write_engine_config(args.out, fitted)
+
+    print(f"{fitted.candidates:,} ağırlık adayı {elapsed:.2f} sn'de değerlendirildi ({len(matrix)} sinyal dönemi)")
+    print(f"Ağırlıklar: {fitted.category_weights}")
+    print(f"Eşikler: boğa > {fitted.bullish_threshold}, ayı < {fitted.bearish_threshold}")
+    print(f"IC {fitted.ic:.3f} (mevcut: {fitted.baseline_ic}), isabet {fitted.hit_rate:.1%} (mevcut: {fitted.baseline_hit_rate})")
+    print(f"Kaydedildi: {args.out} -> ENGINE_CONFIG_PATH={args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Iterator
+
+import dspy
+
+from .analyst import GoldAnalyst
+from .config import Settings
+from .engine import MarketEngine
+from .fetcher import NewsFetcher
+from .logger import JsonlLogger
+from .metrics import RunMetrics
+from .models import AnalysisFailure, AnalysisResult, MarketSummary, NewsArticle
+from .price import CachedQuote, GoldPriceService
+from .runs import RunRecorder, RunStore
+from .serialization import dumps, result_to_dict
+from .tonl import decode_news_articles, encode_news_articles
+
+ProgressCallback = Callable[[str, dict, float], None]  # stage, counts, seconds
+
+
+def configure_lm(settings: Settings, model: str | None = None) -> dspy.LM:
+    """Point DSPy at the OpenAI-compatible Cerebras endpoint (process-wide)."""
+    lm = dspy.LM(
+        f"openai/{model or settings.cerebras_model}",
+        api_key=settings.cerebras_api_key,
+        api_base=settings.cerebras_api_base,
+        temperature=settings.analysis_temperature,
+        cache=False,
+    )
+    dspy.configure(lm=lm)
+    return lm
+
+
+def article_from_item(item: dict) -> NewsArticle:
+    """NewsArticle from a decoded TONL news item (`published_at`, flat `source`)."""
+    published_raw = item.get("published_at") or item.get("publishedAt")
+    published_at = datetime.now(timezone.utc)
+    if isinstance(published_raw, str) and published_raw:
+        try:
+            published_at = datetime.fromisoformat(published_raw.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+
+    return NewsArticle(
+        title=(item.get("title") or "").strip(),
+        description=(item.get("description") or "").strip(),
+        published_at=published_at,
+        source=item.get("source"),
+        url=item.get("url"),
+    )
+
+
+@dataclass(frozen=True)
+class PipelineResult:
+    run_id: str | None
+    fetched: int
+    skipped: int  # Older than `since` or already logged
+    results: list[AnalysisResult]
+    failures: list[AnalysisFailure]
+    written: int
+    price: float | None
+    summary: MarketSummary
+    seconds: float
+    metrics: RunMetrics | None = None
+    price_source: str | None = None
+    price_unit: str | None = None  # e.g. "TRY/g"; see goldsense.price.source_unit
+
+    @property
+    def analyzed(self) -> int:
+        return len(self.results)
+
+
+@dataclass
+class Pipeline:
+    """Headless fetch → TONL → analysis → log → summary run.
+
+    The same stages the Streamlit tabs run one button at a time, in one
+    call: news is encoded to TONL and decoded again (as in the app) while
+    the gold price is fetched, then articles that are new are analyzed,
+    logged and summarized. Each stage is timed into a `RunRecorder` when a
+    run store is given, and reported to `on_progress`.
+    DSPy must be configured first (`configure_lm`).
+    """
+
+    settings: Settings
+    logger: JsonlLogger
+    engine: MarketEngine = field(default_factory=MarketEngine)
+    price_service: GoldPriceService | None = None
+    runs: RunStore | None = None
+    model: str | None = None
+    on_progress: ProgressCallback | None = None
+
+    async def run(self, since: datetime | None = None, skip_logged: bool = True) -> PipelineResult:
+        started = time.perf_counter()
+        recorder = self.runs.start(model=self.model) if self.runs is not None else None
+
+        with self._stage(recorder, "fetch") as counts:
+            fetched, payload = await NewsFetcher(self.settings).fetch_latest_with_payload()
+            counts["articles"] = len(fetched)
+        self._artifact(recorder, "raw_news.json", dumps(payload))
+
+        with self._stage(recorder, "tonl") as counts:
+            tonl_text = encode_news_articles(payload.get("articles", []))
+            counts["chars"] = len(tonl_text)
+        self._artifact(recorder, "news.tonl", tonl_text)
+
+        with self._stage(recorder, "decode") as counts:
+            quote, items = await asyncio.gather(
+                self._price(), asyncio.to_thread(decode_news_articles, tonl_text)
+            )
+            articles = [article_from_item(item) for item in items if item.get("title")]
+            if since is not None:
+                articles = [article for article in articles if article.published_at >= since]
+            if skip_logged:
+                articles = [article for article in articles if not article.url or article.url not in self.logger]
+            counts["articles"] = len(articles)
+            price = quote.price if quote is not None else None
+            counts["price"] = price
+            counts["price_unit"] = quote.unit if quote is not None else None
+
+        results: list[AnalysisResult] = []
+        failures: list[AnalysisFailure] = []
+        metrics: RunMetrics | None = None
+        if articles:
+            with self._stage(recorder, "analysis") as counts:
+                batch = await GoldAnalyst(self.settings).analyze_batch(articles)
+                results, failures, metrics = batch.results, batch.failures, batch.metrics
+                counts["results"] = len(results)
+                counts["failures"] = len(failures)
+                if batch.metrics is not None:
+                    counts["prompt_tokens"] = batch.metrics.prompt_tokens
+                    counts["completion_tokens"] = batch.metrics.completion_tokens
+            self._artifact(recorder, "results.jsonl", b"".join(dumps(result_to_dict(r)) + b"\n" for r in results))
+
+        with self._stage(recorder, "log") as counts:
+            written = await asyncio.to_thread(self.logger.log_many, results, model=self.model)
+            counts["written"] = written
+
+        with self._stage(recorder, "summary"):
+            summary = self.engine.summarize(results)
+        if recorder is not None:
+            recorder.finish(summary=asdict(summary))
+
+        return PipelineResult(
+            run_id=recorder.run_id if recorder is not None else None,
+            fetched=len(fetched),
+            skipped=len(fetched) - len(articles),
+            results=results,
+            failures=failures,
+            written=written,
+            price=price,
+            summary=summary,
+            seconds=time.perf_counter() - started,
+            metrics=metrics,
+            price_source=quote.source if quote is not None else None,
+            price_unit=quote.unit if quote is not None else None,
+        )
+
+    async def _price(self) -> CachedQuote | None:
+        if self.price_service is None:
+            return None
+        return await self.price_service.get_quote_async()
+
+    @contextmanager
+    def _stage(self, recorder: RunRecorder | None, name: str) -> Iterator[dict]:
+        started = time.perf_counter()
+        with recorder.stage(name) if recorder is not None else nullcontext({}) as counts:
+            yield counts
+        if self.on_progress is not None:
+            self.on_progress(name, counts, time.perf_counter() - started)
+
+    @staticmethod
+    def _artifact(recorder: RunRecorder | None, name: str, data: bytes | str) -> None:
+        if recorder is not None:
+            recorder.add_artifact(name, data)
+
@@ -1,12 +1,193 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import asyncio
+import json
+import os
+import sqlite3
+import statistics
+import threading
+from dataclasses import asdict, dataclass, field
 import time
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable
 
 import httpx
 
+from .circuit import HALF_OPEN, CircuitBreaker
 from .config import Settings
 from .exceptions import ExternalServiceError
+from .price_store import PriceStore
+
+
+PRICE_SOURCES = ("truncgil", "binance")
+PRICE_STRATEGIES = ("first", "median")
+BINANCE_URL = "https://api.binance.com/api/v3/ticker/price?symbol=PAXGUSDT"
+BINANCE_UNIT = "USD/oz"  # One PAXG token is backed by one troy ounce
+_TRUNCGIL_UNITS = {"GRA": "TRY/g", "ONS": "USD/oz"}  # Other Truncgil symbols are TRY prices of that symbol
+
+QuoteFetcher = Callable[[], Awaitable[float]]
+
+
+@dataclass(frozen=True)
+class PriceQuote:
+    source: str
+    price: float
+    latency_seconds: float
+    unit: str | None = None  # e.g. "TRY/g" or "USD/oz"; see `source_unit`
+
+
+@dataclass(frozen=True)
+class CachedQuote:
+    source: str
+    price: float
+    fetched_at: float  # Unix time
+    unit: str | None = None
+
+
+@dataclass
+class PriceCache:
+    """Stale-while-revalidate cache for the latest gold quote.
+
+    Fresh quotes (younger than `fresh_seconds`) are served as-is. Stale ones
+    (up to `max_stale_seconds`) are served immediately while one background
+    thread refetches. Older quotes are not served at all. The last quote
+    of every source is kept with its own timestamp, and everything is
+    persisted to `path` so it survives Streamlit reruns and restarts.
+    """
+
+    path: Path | None = None
+    fresh_seconds: float = 300.0
+    max_stale_seconds: float = 3600.0
+    _selected: CachedQuote | None = field(default=None, init=False, repr=False)
+    _sources: dict[str, CachedQuote] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _refresh_thread: threading.Thread | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._load()
+
+    @property
+    def current(self) -> CachedQuote | None:
+        return self._selected
+
+    @property
+    def sources(self) -> dict[str, CachedQuote]:
+        with self._lock:
+            return dict(self._sources)
+
+    def state(self, now: float | None = None) -> str:
+        """Return "fresh", "stale" (serve and refresh) or "expired" (refetch inline)."""
+        quote = self._selected
+        if quote is None:
+            return "expired"
+        age = (now or time.time()) - quote.fetched_at
+        if age < self.fresh_seconds:
+            return "fresh"
+        return "stale" if age < self.max_stale_seconds else "expired"
+
+    def store(self, selected: PriceQuote, quotes: Iterable[PriceQuote] = ()) -> CachedQuote:
+        now = time.time()
+        cached = CachedQuote(selected.source, selected.price, now, selected.unit)
+        with self._lock:
+            self._selected = cached
+            for quote in (*quotes, selected):
+                self._sources[quote.source] = CachedQuote(quote.source, quote.price, now, quote.unit)
+            self._save()
+        return cached
+
+    def refresh_in_background(self, fetch: Callable[[], PriceQuote | None]) -> bool:
+        """Start one refresh thread unless one is already running."""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            self._refresh_thread = threading.Thread(target=self._refresh, args=(fetch,), daemon=True)
+            self._refresh_thread.start()
+            return True
+
+    def wait_for_refresh(self, timeout: float | None = None) -> None:
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _refresh(self, fetch: Callable[[], PriceQuote | None]) -> None:
+        try:
+            quote = fetch()
+        except Exception as exc:
+            print(f"⚠️  Arka plan fiyat yenilemesi başarısız: {exc}")
+            return
+        if quote is not None:
+            self.store(quote)
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            selected = payload.get("selected")
+            self._selected = CachedQuote(**selected) if selected else None
+            self._sources = {name: CachedQuote(**quote) for name, quote in payload.get("sources", {}).items()}
+        except (OSError, ValueError, TypeError):
+            pass  # Corrupted cache file: start empty
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        payload = {
+            "selected": asdict(self._selected) if self._selected else None,
+            "sources": {name: asdict(quote) for name, quote in self._sources.items()},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            print(f"⚠️  Fiyat cache kaydedilemedi: {exc}")
+
+
+def source_unit(settings: Settings, name: str) -> str:
+    """Unit of the instrument a source quotes, e.g. "TRY/g" for Truncgil GRA."""
+    if name == "binance":
+        return BINANCE_UNIT
+    symbol = settings.truncgil_gold_symbol
+    return _TRUNCGIL_UNITS.get(symbol.upper(), f"TRY/{symbol}")
+
+
+_SHARED_CACHES: dict[tuple, PriceCache] = {}
+_SHARED_CACHES_LOCK = threading.Lock()
+
+
+def shared_price_cache(settings: Settings) -> PriceCache:
+    """Process-wide cache per configuration; outlives GoldPriceService instances."""
+    path = Path(settings.price_cache_path) if settings.price_cache_path else None
+    key = (path, settings.price_cache_fresh_seconds, settings.price_cache_max_stale_seconds)
+    with _SHARED_CACHES_LOCK:
+        if key not in _SHARED_CACHES:
+            _SHARED_CACHES[key] = PriceCache(
+                path=path,
+                fresh_seconds=settings.price_cache_fresh_seconds,
+                max_stale_seconds=settings.price_cache_max_stale_seconds,
+            )
+        return _SHARED_CACHES[key]
+
+
+_SHARED_BREAKERS: dict[tuple, dict[str, CircuitBreaker]] = {}
+
+
+def shared_breakers(settings: Settings) -> dict[str, CircuitBreaker]:
+    """Process-wide circuit breakers, one per price source."""
+    key = (settings.price_breaker_failure_threshold, settings.price_breaker_cooldown_seconds)
+    with _SHARED_CACHES_LOCK:
+        if key not in _SHARED_BREAKERS:
+            _SHARED_BREAKERS[key] = {
+                name: CircuitBreaker(
+                    name,
+                    failure_threshold=settings.price_breaker_failure_threshold,
+                    cooldown_seconds=settings.price_breaker_cooldown_seconds,
+                )
+                for name in PRICE_SOURCES
+            }
+        return _SHARED_BREAKERS[key]
 
 
 @dataclass
@@ -14,46 +195,169 @@ class GoldPriceService:
     settings: Settings
     max_retries: int = 2
     base_delay_seconds: float = 0.6
-    _price_cache: tuple[float | None, float] = field(default_factory=lambda: (None, 0), init=False)
-    _cache_ttl_seconds: int = 300  # 5 dakika cache
+    cache: PriceCache | None = None  # Defaults to the shared, persisted cache
+    breakers: dict[str, CircuitBreaker] | None = None  # Defaults to the shared per-source breakers
+    recorder: PriceStore | None = None  # Every fetched quote is appended here (PRICE_STORE_PATH)
+
+    def __post_init__(self) -> None:
+        if self.cache is None:
+            self.cache = shared_price_cache(self.settings)
+        if self.breakers is None:
+            self.breakers = shared_breakers(self.settings)
+        if self.recorder is None and self.settings.price_store_path:
+            self.recorder = PriceStore(Path(self.settings.price_store_path))
 
     def get_current_price(self) -> float | None:
         """Get current gold price. Returns None if unavailable instead of raising exception.
         
-        Cache: Fiyat 5 dakikada bir yenilenir (performans için).
+        Cache: taze fiyat doğrudan, bayat fiyat anında döner ve arka planda yenilenir.
         """
-        cached_price, cache_time = self._price_cache
-        current_time = time.time()
-        
-        # Cache valid mı kontrol et
-        if cached_price is not None and (current_time - cache_time) < self._cache_ttl_seconds:
-            return cached_price
-        
-        # Cache geçersiz, yeni fiyat çek
+        quote = self.get_quote()
+        return quote.price if quote is not None else None
+
+    def get_quote(self) -> CachedQuote | None:
+        """Like `get_current_price`, with the source and unit of the price."""
+        state = self.cache.state()
+        if state != "expired":
+            if state == "stale":
+                self.cache.refresh_in_background(self._fetch_quote_sync)
+            return self.cache.current
+
+        quote = self._fetch_quote_sync()
+        return self.cache.store(quote) if quote is not None else None
+
+    async def get_current_price_async(self) -> float | None:
+        """Query the configured sources concurrently; None if none answers in time.
+
+        Uses the same stale-while-revalidate cache as `get_current_price`.
+        Strategy and deadline come from PRICE_STRATEGY / PRICE_DEADLINE_SECONDS.
+        """
+        quote = await self.get_quote_async()
+        return quote.price if quote is not None else None
+
+    async def get_quote_async(self) -> CachedQuote | None:
+        """Like `get_current_price_async`, with the source and unit of the price."""
+        state = self.cache.state()
+        if state != "expired":
+            if state == "stale":
+                self.cache.refresh_in_background(lambda: asyncio.run(self.fetch_quote()))
+            return self.cache.current
+
+        quote = await self.fetch_quote()
+        return self.cache.current if quote is not None else None
+
+    async def fetch_quote(self) -> PriceQuote | None:
+        """Race same-unit sources and store every valid quote in the cache.
+
+        PRICE_SOURCES is a preference order. Sources quoting the same unit
+        are raced (or combined by the median); a source quoting another
+        instrument - Truncgil gram gold in TRY vs Binance PAXG in USD per
+        ounce - is only tried when the preferred unit yields nothing. So the
+        unit of the result never depends on which source answered first.
+        Each unit group gets the full PRICE_DEADLINE_SECONDS.
+        """
+        deadline = self.settings.price_deadline_seconds
+        received: list[PriceQuote] = []
+        quote = None
+        async with httpx.AsyncClient(timeout=deadline) as client:
+            fetchers = {
+                "truncgil": lambda: self._fetch_truncgil_async(client),
+                "binance": lambda: self._fetch_binance_async(client),
+            }
+            for unit, names in self._unit_groups():
+                allowed = {name: self._guarded(name, fetchers[name]) for name in names if self.breakers[name].allow()}
+                quote = await race_quotes(
+                    allowed,
+                    strategy=self.settings.price_strategy,
+                    deadline_seconds=deadline,
+                    on_quote=received.append,
+                    on_timeout=lambda name: self.breakers[name].record_failure("deadline exceeded"),
+                    units={name: unit for name in allowed},
+                )
+                if quote is not None:
+                    break
+        if quote is not None:
+            self.cache.store(quote, received)
+        self._record(received)
+        return quote
+
+    def _unit_groups(self) -> list[tuple[str, list[str]]]:
+        # Configured sources grouped by unit, groups in first-preference order
+        groups: dict[str, list[str]] = {}
+        for name in self.settings.price_sources:
+            groups.setdefault(source_unit(self.settings, name), []).append(name)
+        return list(groups.items())
+
+    def _fetch_quote_sync(self) -> PriceQuote | None:
+        # Sources in PRICE_SOURCES order (fallback chain); an open breaker skips
+        # its source instantly, and a half-open probe gets a single attempt.
+        fetchers = {"truncgil": self._fetch_price_from_truncgil, "binance": self._fetch_from_binance}
+        for name in self.settings.price_sources:
+            breaker = self.breakers[name]
+            if not breaker.allow():
+                print(f"⚠️  {name} devre kesici açık, kaynak atlandı")
+                continue
+            started = time.perf_counter()
+            try:
+                price = fetchers[name](max_retries=0 if breaker.state == HALF_OPEN else None)
+            except Exception as exc:
+                # Log the error but don't crash
+                breaker.record_failure(exc)
+                print(f"⚠️  {name} fiyat alınamadı: {exc}")
+                continue
+            breaker.record_success()
+            quote = PriceQuote(name, price, time.perf_counter() - started, source_unit(self.settings, name))
+            self._record([quote])
+            return quote
+        return None
+
+    def _record(self, quotes: list[PriceQuote]) -> None:
+        if self.recorder is None or not quotes:
+            return
+        now = time.time()
         try:
-            price = self._fetch_price_from_truncgil()
-            self._price_cache = (price, current_time)
-            return price
-        except Exception as truncgil_error:
-            # Log the error but don't crash
-            print(f"⚠️  Truncgil fiyat alınamadı: {truncgil_error}")
-            
-            # Try Binance as fallback (Automatic)
+            self.recorder.record_many((now, quote.source, quote.price) for quote in quotes)
+        except sqlite3.Error as exc:
+            print(f"⚠️  Fiyat kaydı yazılamadı: {exc}")  # Recording must never block pricing
+
+    def breaker_states(self) -> list[dict]:
+        return [self.breakers[name].snapshot() for name in self.settings.price_sources]
+
+    def _guarded(self, name: str, fetch: QuoteFetcher) -> QuoteFetcher:
+        breaker = self.breakers[name]
+
+        async def _call() -> float:
             try:
-                price = self._fetch_from_binance()
-                self._price_cache = (price, current_time)
-                return price
-            except Exception as binance_error:
-                print(f"⚠️  Binance fallback da başarısız: {binance_error}")
-                return None
-            return None
+                price = await fetch()
+            except asyncio.CancelledError:
+                breaker.release()  # Lost the race: no verdict on the source
+                raise
+            except Exception as exc:
+                breaker.record_failure(exc)
+                raise
+            breaker.record_success()
+            return price
+
+        return _call
 
+    async def _fetch_truncgil_async(self, client: httpx.AsyncClient) -> float:
+        response = await client.get(self.settings.truncgil_url)
+        if response.status_code != 200:
+            raise ExternalServiceError(f"Truncgil API yanıt vermedi (HTTP {response.status_code})")
+        return _parse_truncgil_payload(response.json(), self.settings.truncgil_gold_symbol)
 
-    def _fetch_from_binance(self) -> float:
+    async def _fetch_binance_async(self, client: httpx.AsyncClient) -> float:
+        response = await client.get(BINANCE_URL)
+        if response.status_code != 200:
+            raise ExternalServiceError(f"Binance API yanıt vermedi (HTTP {response.status_code})")
+        return _parse_binance_payload(response.json())
+
+    def _fetch_from_binance(self, max_retries: int | None = None) -> float:
         """Fetch gold price from Binance API (PAXGUSDT = Paxos Gold in USDT)."""
-        url = "https://api.binance.com/api/v3/ticker/price?symbol=PAXGUSDT"
+        url = BINANCE_URL
+        retries = self.max_retries if max_retries is None else max_retries
         
-        for attempt in range(self.max_retries + 1):
+        for attempt in range(retries + 1):
             try:
                 response = httpx.get(url, timeout=10)
                 if response.status_code != 200:
@@ -61,36 +365,32 @@ class GoldPriceService:
                         f"Binance API yanıt vermedi (HTTP {response.status_code})"
                     )
                 
-                data = response.json()
-                price_str = data.get("price")
-                if not price_str:
-                    raise ExternalServiceError("Binance price field bulunamadı")
-                
-                return float(price_str)
+                return _parse_binance_payload(response.json())
             except httpx.ConnectError as exc:
-                if attempt < self.max_retries:
+                if attempt < retries:
                     time.sleep(self.base_delay_seconds * (attempt + 1))
                 else:
                     raise ExternalServiceError("Binance sunucusuna bağlanılamadı") from exc
             except httpx.ReadTimeout as exc:
-                if attempt < self.max_retries:
+                if attempt < retries:
                     time.sleep(self.base_delay_seconds * (attempt + 1))
                 else:
                     raise ExternalServiceError("Binance zaman aşımı") from exc
             except Exception as exc:
-                if attempt < self.max_retries:
+                if attempt < retries:
                     time.sleep(self.base_delay_seconds * (attempt + 1))
                 else:
                     raise ExternalServiceError(f"Binance hatası: {exc}") from exc
         
         raise ExternalServiceError("Binance yanıt vermedi")
 
-    def _fetch_price_from_truncgil(self) -> float:
+    def _fetch_price_from_truncgil(self, max_retries: int | None = None) -> float:
         url = self.settings.truncgil_url
         symbol = self.settings.truncgil_gold_symbol
         last_error: Exception | None = None
+        retries = self.max_retries if max_retries is None else max_retries
 
-        for attempt in range(self.max_retries + 1):
+        for attempt in range(retries + 1):
             try:
                 response = httpx.get(url, timeout=15)
                 if response.status_code != 200:
@@ -98,31 +398,117 @@ class GoldPriceService:
                         f"Truncgil API yanıt vermedi (HTTP {response.status_code})"
                     )
 
-                payload = response.json()
-                entry = payload.get(symbol)
-                if not isinstance(entry, dict):
-                    raise ExternalServiceError(f"Truncgil sembol bulunamadı: {symbol}")
-
-                price = entry.get("Selling") or entry.get("Buying")
-                if price is None:
-                    raise ExternalServiceError(
-                        f"Truncgil fiyat bilgisi eksik: {symbol}"
-                    )
-
-                return float(price)
+                return _parse_truncgil_payload(response.json(), symbol)
             except httpx.ConnectError:
                 last_error = ExternalServiceError("Truncgil sunucusuna bağlanılamadı")
-                if attempt < self.max_retries:
+                if attempt < retries:
                     time.sleep(self.base_delay_seconds * (attempt + 1))
             except httpx.ReadTimeout:
                 last_error = ExternalServiceError("Truncgil zaman aşımı")
-                if attempt < self.max_retries:
+                if attempt < retries:
                     time.sleep(self.base_delay_seconds * (attempt + 1))
             except Exception as exc:
                 last_error = exc
-                if attempt < self.max_retries:
+                if attempt < retries:
                     time.sleep(self.base_delay_seconds * (attempt + 1))
 
         raise ExternalServiceError(f"Truncgil yanıt vermedi: {last_error}")
 
 
+async def race_quotes(
+    fetchers: dict[str, QuoteFetcher],
+    strategy: str = "first",
+    deadline_seconds: float = 5.0,
+    on_quote: Callable[[PriceQuote], None] | None = None,
+    on_timeout: Callable[[str], None] | None = None,
+    units: dict[str, str] | None = None,
+) -> PriceQuote | None:
+    """Run all fetchers concurrently and pick a quote before the deadline.
+
+    "first" returns the first valid quote and cancels the rest. "median"
+    waits for every source (up to the deadline) and returns the median of
+    the valid quotes, so every source must quote the same unit.
+    Failing sources are logged and skipped; None means nothing valid arrived.
+    `on_quote` sees every valid quote (e.g. for per-source cache entries);
+    `on_timeout` is told about sources still running at the deadline.
+    `units` labels each source's quotes with the unit it prices in.
+    """
+    if strategy not in PRICE_STRATEGIES:
+        raise ValueError(f"Unknown price strategy: {strategy}")
+    units = units or {}
+    if strategy == "median" and len({units.get(name) for name in fetchers}) > 1:
+        raise ValueError(f"Cannot take the median of different units: {units}")
+    if not fetchers:
+        return None
+
+    started = time.perf_counter()
+
+    async def _timed(name: str, fetch: QuoteFetcher) -> PriceQuote:
+        price = await fetch()
+        if not price or price <= 0:
+            raise ExternalServiceError(f"{name} geçersiz fiyat döndürdü: {price}")
+        return PriceQuote(
+            source=name, price=float(price), latency_seconds=time.perf_counter() - started, unit=units.get(name)
+        )
+
+    names = {asyncio.ensure_future(_timed(name, fetch)): name for name, fetch in fetchers.items()}
+    pending = set(names)
+    quotes: list[PriceQuote] = []
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                if on_timeout is not None:
+                    for task in pending:
+                        on_timeout(names[task])
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    quote = task.result()
+                except Exception as exc:
+                    print(f"⚠️  Fiyat kaynağı başarısız: {exc}")
+                    continue
+                quotes.append(quote)
+                if on_quote is not None:
+                    on_quote(quote)
+            if quotes and strategy == "first":
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        # Let cancelled sources unwind (and release their breakers) before the caller closes the client
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if not quotes:
+        return None
+    if strategy == "first":
+        return min(quotes, key=lambda quote: quote.latency_seconds)
+    return PriceQuote(
+        source="median(" + ",".join(quote.source for quote in quotes) + ")",
+        price=statistics.median(quote.price for quote in quotes),
+        latency_seconds=max(quote.latency_seconds for quote in quotes),
+        unit=quotes[0].unit,
+    )
+
+
+def _parse_truncgil_payload(payload: dict, symbol: str) -> float:
+    entry = payload.get(symbol)
+    if not isinstance(entry, dict):
+        raise ExternalServiceError(f"Truncgil sembol bulunamadı: {symbol}")
+
+    price = entry.get("Selling") or entry.get("Buying")
+    if price is None:
+        raise ExternalServiceError(
+            f"Truncgil fiyat bilgisi eksik: {symbol}"
+        )
+    return float(price)
+
+
+def _parse_binance_payload(data: dict) -> float:
+    price_str = data.get("price")
+    if not price_str:
+        raise ExternalServiceError("Binance price field bulunamadı")
+    return float(price_str)
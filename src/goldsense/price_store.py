@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    ts REAL NOT NULL,      -- Unix seconds, UTC
+    source TEXT NOT NULL,
+    price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quotes_ts ON quotes (ts);
+"""
+
+
+@dataclass
+class PriceStore:
+    """Append-only SQLite time series of fetched gold quotes.
+
+    One row per quote (timestamp, source, price) with an index on the
+    timestamp, so range queries and OHLC downsampling stay cheap as the
+    history grows. Every call opens its own connection, which makes the
+    store safe to use from the background price-refresh thread.
+    """
+
+    path: Path
+
+    def __post_init__(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def record(self, source: str, price: float, at: float | None = None) -> None:
+        self.record_many([(at if at is not None else time.time(), source, price)])
+
+    def record_many(self, rows: Iterable[tuple[float, str, float]]) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.executemany("INSERT INTO quotes (ts, source, price) VALUES (?, ?, ?)", rows)
+
+    def sources(self) -> dict[str, int]:
+        """Quote count per source, most frequent first."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT source, COUNT(*) FROM quotes GROUP BY source ORDER BY COUNT(*) DESC"
+            ).fetchall()
+        return dict(rows)
+
+    def quotes(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        source: str | None = None,
+    ) -> pd.DataFrame:
+        """Raw quotes in [start, end), indexed by UTC timestamp."""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(end.timestamp())
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(f"SELECT ts, source, price FROM quotes {where} ORDER BY ts", params).fetchall()
+
+        frame = pd.DataFrame(rows, columns=["ts", "source", "price"])
+        frame.index = pd.to_datetime(frame.pop("ts"), unit="s", utc=True)
+        frame.index.name = "timestamp"
+        return frame
+
+    def series(
+        self,
+        source: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> pd.Series:
+        """Price series of one source (default: the most recorded one).
+
+        Sources quote different instruments (Truncgil gram/TRY, Binance
+        PAXG/USDT), so they are never mixed into one series.
+        """
+        source = source or next(iter(self.sources()), None)
+        if source is None:
+            return pd.Series(dtype=float, name="price", index=pd.DatetimeIndex([], tz="UTC"))
+        return self.quotes(start, end, source)["price"]
+
+    def ohlc(
+        self,
+        freq: str = "1h",
+        source: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> pd.DataFrame:
+        """Open/high/low/close/count per `freq` bucket; empty buckets are dropped."""
+        prices = self.series(source, start, end)
+        bars = prices.resample(freq).ohlc()
+        bars["count"] = prices.resample(freq).count()
+        return bars[bars["count"] > 0]
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
@@ -0,0 +1,233 @@
+"""Per-run manifests and content-addressed pipeline artifacts.
+
+Every pipeline run (fetch → TONL → analysis → summary) gets a run id and a
+manifest under `<root>/manifests/<run_id>.json` with per-stage timings and
+counts, the model, a digest of the goldsense source (`code_version`) and the
+SHA-256 of each artifact. Artifact bytes live once under
+`<root>/objects/<aa>/<sha256>`, so a payload fetched again unchanged costs
+no extra storage. Manifests are rewritten after every stage, so interrupted
+runs are still inspectable.
+
+    python -m goldsense.runs list
+    python -m goldsense.runs compare <run_a> <run_b>
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+from .exceptions import GoldSenseError
+from .serialization import dumps, loads
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Short digest of the goldsense sources, to tell versions apart in comparisons."""
+    digest = hashlib.sha256()
+    for path in sorted(_PACKAGE_DIR.glob("*.py")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class ArtifactStore:
+    root: Path
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if not path.exists():  # Identical payloads are stored once
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        try:
+            return self.path(digest).read_bytes()
+        except FileNotFoundError:
+            raise GoldSenseError(f"Artifact {digest[:12]} is missing from {self.root}") from None
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def stored_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.root.glob("*/*") if path.is_file())
+
+
+@dataclass
+class RunManifest:
+    run_id: str
+    started_at: str
+    code_version: str
+    model: str | None = None
+    finished_at: str | None = None
+    stages: list[dict] = field(default_factory=list)  # {"name", "started_at", "seconds", "counts"}
+    artifacts: dict[str, dict] = field(default_factory=dict)  # name -> {"sha256", "bytes", "stage"}
+    summary: dict | None = None
+    error: str | None = None  # Set when the run was finished as failed
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "RunManifest":
+        return cls(**payload)
+
+    def stage_seconds(self) -> dict[str, float]:
+        """Total seconds per stage name (a stage run twice is summed)."""
+        totals: dict[str, float] = {}
+        for stage in self.stages:
+            totals[stage["name"]] = totals.get(stage["name"], 0.0) + stage["seconds"]
+        return totals
+
+
+@dataclass
+class RunRecorder:
+    store: "RunStore"
+    manifest: RunManifest
+    _stage: str | None = field(default=None, init=False, repr=False)
+
+    @property
+    def run_id(self) -> str:
+        return self.manifest.run_id
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict]:
+        """Time a stage; the yielded dict collects its counts. Saved even if the stage fails."""
+        counts: dict = {}
+        started_at = datetime.now(timezone.utc).isoformat()
+        started = time.perf_counter()
+        self._stage = name
+        try:
+            yield counts
+        except BaseException as exc:
+            counts["error"] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            self._stage = None
+            self.manifest.stages.append(
+                {"name": name, "started_at": started_at, "seconds": round(time.perf_counter() - started, 6), "counts": counts}
+            )
+            self.save()
+
+    def add_artifact(self, name: str, data: bytes | str) -> str:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = self.store.objects.put(data)
+        self.manifest.artifacts[name] = {"sha256": digest, "bytes": len(data), "stage": self._stage}
+        return digest
+
+    def finish(self, summary: dict | None = None, error: str | None = None) -> None:
+        """Close the run; pass `error` to record it as failed. Never append stages afterwards."""
+        self.manifest.summary = summary
+        self.manifest.error = error
+        self.manifest.finished_at = datetime.now(timezone.utc).isoformat()
+        self.save()
+
+    def save(self) -> None:
+        self.store.save(self.manifest)
+
+
+@dataclass
+class RunStore:
+    root: Path
+
+    @property
+    def objects(self) -> ArtifactStore:
+        return ArtifactStore(self.root / "objects")
+
+    @property
+    def manifest_dir(self) -> Path:
+        return self.root / "manifests"
+
+    def start(self, model: str | None = None) -> RunRecorder:
+        now = datetime.now(timezone.utc)
+        manifest = RunManifest(
+            run_id=f"{now:%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:6]}",
+            started_at=now.isoformat(),
+            code_version=code_version(),
+            model=model,
+        )
+        recorder = RunRecorder(self, manifest)
+        recorder.save()
+        return recorder
+
+    def save(self, manifest: RunManifest) -> None:
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        path = self.manifest_dir / f"{manifest.run_id}.json"
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(dumps(asdict(manifest)))
+        os.replace(tmp_path, path)
+
+    def load(self, run_id: str) -> RunManifest:
+        path = self.manifest_dir / f"{run_id}.json"
+        if not path.exists():
+            raise GoldSenseError(f"Unknown run: {run_id}")
+        return RunManifest.from_dict(loads(path.read_bytes()))
+
+    def runs(self) -> list[RunManifest]:
+        """All manifests, newest first (run ids sort by start time)."""
+        paths = sorted(self.manifest_dir.glob("*.json"), reverse=True) if self.manifest_dir.exists() else []
+        return [RunManifest.from_dict(loads(path.read_bytes())) for path in paths]
+
+    def artifact(self, run_id: str, name: str) -> bytes:
+        """Bytes of one artifact of a past run, e.g. to replay its raw payload."""
+        manifest = self.load(run_id)
+        if name not in manifest.artifacts:
+            raise GoldSenseError(f"Run {run_id} has no artifact {name!r}")
+        return self.objects.get(manifest.artifacts[name]["sha256"])
+
+    def compare(self, run_a: str, run_b: str) -> list[tuple[str, float | None, float | None]]:
+        """(stage, seconds in a, seconds in b) for every stage of either run."""
+        a, b = self.load(run_a).stage_seconds(), self.load(run_b).stage_seconds()
+        names = list(a) + [name for name in b if name not in a]
+        return [(name, a.get(name), b.get(name)) for name in names]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pipeline run manifests")
+    parser.add_argument("--root", type=Path, default=Path("logs/runs"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list")
+    show = commands.add_parser("show")
+    show.add_argument("run_id")
+    compare = commands.add_parser("compare")
+    compare.add_argument("run_a")
+    compare.add_argument("run_b")
+    args = parser.parse_args()
+
+    store = RunStore(args.root)
+    if args.command == "list":
+        manifests = store.runs()
+        for manifest in manifests:
+            seconds = sum(manifest.stage_seconds().values())
+            stages = ",".join(manifest.stage_seconds())
+            failed = "  HATA" if manifest.error else ""
+            print(f"{manifest.run_id}  {manifest.code_version}  {manifest.model or '-':<24} {seconds:8.2f} sn  {stages}{failed}")
+        logical = sum(artifact["bytes"] for manifest in manifests for artifact in manifest.artifacts.values())
+        print(f"{len(manifests)} çalıştırma, artefaktlar {logical:,} bayt -> diskte {store.objects.stored_bytes():,} bayt")
+    elif args.command == "show":
+        print(dumps(asdict(store.load(args.run_id))).decode("utf-8"))
+    else:
+        for name, a, b in store.compare(args.run_a, args.run_b):
+            delta = f"{(b - a) / a:+.1%}" if a and b is not None else "-"
+            print(f"{name:<12} {_seconds(a):>10} {_seconds(b):>10} {delta:>9}")
+
+
+def _seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+if __name__ == "__main__":
+    main()
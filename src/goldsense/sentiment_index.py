@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import bisect
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .engine import MarketEngine
+from .logger import read_results
+from .models import AnalysisResult
+
+WINDOWS = {
+    "1h": timedelta(hours=1),
+    "6h": timedelta(hours=6),
+    "24h": timedelta(hours=24),
+}
+
+# Exponents above this are rebased during backfill to stay far from float overflow
+_MAX_EXPONENT = 600.0
+
+
+@dataclass(frozen=True)
+class SentimentPoint:
+    timestamp: datetime
+    value: float | None  # Decayed, weighted mean sentiment (1-10); None if the window is empty
+    weight: float  # Total decayed weight - how much evidence backs `value`
+    count: int  # Relevant analyses inside the window
+
+
+@dataclass
+class RollingSentimentIndex:
+    """Time-decayed rolling sentiment over published analyses.
+
+    Each relevant result contributes `score × category weight × confidence`
+    (the MarketEngine weighting), decayed by `exp(-λ·age)` with
+    `λ = ln 2 / half_life`, and drops out once older than `window`.
+    `update` is O(1) for results arriving in publish order (an append) and
+    O(n) for late, out-of-order ones (a sorted insert shifts the list);
+    evictions are O(1) each. `backfill` computes the same series vectorized
+    for long histories.
+    """
+
+    window: timedelta = WINDOWS["24h"]
+    half_life: timedelta = timedelta(hours=6)
+    category_weights: dict[str, float] = field(default_factory=lambda: dict(MarketEngine.CATEGORY_WEIGHTS))
+
+    # Sums are kept "as of" `_as_of` (epoch seconds); advancing time only rescales them
+    _as_of: float | None = field(default=None, init=False, repr=False)
+    _numerator: float = field(default=0.0, init=False, repr=False)
+    _denominator: float = field(default=0.0, init=False, repr=False)
+    _entries: list[tuple[float, float, float]] = field(default_factory=list, init=False, repr=False)
+
+    @property
+    def decay_rate(self) -> float:
+        return math.log(2) / self.half_life.total_seconds()
+
+    def update(self, result: AnalysisResult) -> None:
+        weight = self._weight(result)
+        if weight == 0.0:
+            return
+
+        published = result.article.published_at.timestamp()
+        if self._as_of is None or published > self._as_of:
+            self._advance(published)
+        if published <= self._as_of - self.window.total_seconds():
+            return  # Arrived already outside the window
+
+        decay = math.exp(-(self._as_of - published) * self.decay_rate)
+        self._numerator += result.sentiment_score * weight * decay
+        self._denominator += weight * decay
+        entry = (published, result.sentiment_score * weight, weight)
+        if not self._entries or entry >= self._entries[-1]:
+            self._entries.append(entry)
+        else:
+            bisect.insort(self._entries, entry)
+
+    def point_at(self, when: datetime | None = None) -> SentimentPoint:
+        """Index value at `when` (default: now). Time only moves forward."""
+        when = when or datetime.now(timezone.utc)
+        if self._as_of is None or when.timestamp() > self._as_of:
+            self._advance(when.timestamp())
+
+        as_of = datetime.fromtimestamp(self._as_of, tz=timezone.utc)
+        if not self._entries:
+            return SentimentPoint(timestamp=as_of, value=None, weight=0.0, count=0)
+        return SentimentPoint(
+            timestamp=as_of,
+            value=self._numerator / self._denominator,
+            weight=self._denominator,
+            count=len(self._entries),
+        )
+
+    def backfill(self, results: Iterable[AnalysisResult], freq: str = "15min") -> pd.DataFrame:
+        """Vectorized index series on a regular time grid.
+
+        Returns a DataFrame indexed by UTC timestamp with `value`, `weight`
+        and `count` columns; identical (to float precision) to replaying
+        `update` + `point_at` at each grid time.
+        """
+        rows = [
+            (r.article.published_at.timestamp(), r.sentiment_score, self._weight(r))
+            for r in results
+        ]
+        rows = sorted(row for row in rows if row[2] > 0.0)
+        if not rows:
+            return pd.DataFrame(columns=["value", "weight", "count"], dtype=float)
+
+        times, scores, weights = (np.asarray(column, dtype=float) for column in zip(*rows))
+        grid = pd.date_range(
+            start=pd.Timestamp(times[0], unit="s", tz="UTC").floor(freq),
+            end=pd.Timestamp(times[-1], unit="s", tz="UTC").ceil(freq),
+            freq=freq,
+        )
+        grid_seconds = ((grid - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)).to_numpy(dtype=float)
+
+        numerator = self._windowed_sum(times, scores * weights, grid_seconds)
+        denominator = self._windowed_sum(times, weights, grid_seconds)
+
+        last = np.searchsorted(times, grid_seconds, side="right")
+        first = np.searchsorted(times, grid_seconds - self.window.total_seconds(), side="right")
+        count = last - first
+
+        empty = count == 0
+        value = np.where(empty, np.nan, numerator / np.where(empty, 1.0, denominator))
+        return pd.DataFrame(
+            {"value": value, "weight": np.where(empty, 0.0, denominator), "count": count},
+            index=grid,
+        )
+
+    def _windowed_sum(self, times: np.ndarray, values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+        # S(g) = Σ_{g-W < t_i <= g} v_i·exp(-λ(g - t_i)), as the decayed running
+        # sum up to g minus the decayed running sum up to g - W.
+        rate = self.decay_rate
+        running = _decayed_cumsum(times, values, rate)
+
+        def _at(boundaries: np.ndarray, horizon: np.ndarray) -> np.ndarray:
+            index = np.searchsorted(times, boundaries, side="right") - 1
+            valid = index >= 0
+            safe = np.where(valid, index, 0)
+            return np.where(valid, running[safe] * np.exp(-rate * (horizon - times[safe])), 0.0)
+
+        return _at(grid, grid) - _at(grid - self.window.total_seconds(), grid)
+
+    def _advance(self, now: float) -> None:
+        if self._as_of is not None:
+            decay = math.exp(-(now - self._as_of) * self.decay_rate)
+            self._numerator *= decay
+            self._denominator *= decay
+        self._as_of = now
+
+        cutoff = now - self.window.total_seconds()
+        evicted = 0
+        for published, weighted_score, weight in self._entries:
+            if published > cutoff:
+                break
+            decay = math.exp(-(now - published) * self.decay_rate)
+            self._numerator -= weighted_score * decay
+            self._denominator -= weight * decay
+            evicted += 1
+        if evicted:
+            del self._entries[:evicted]
+        if not self._entries:
+            # Clear float residue left by the subtractions
+            self._numerator = 0.0
+            self._denominator = 0.0
+
+    def _weight(self, result: AnalysisResult) -> float:
+        if not result.is_relevant or result.category == "Irrelevant":
+            return 0.0
+        return self.category_weights.get(result.category, 0.0) * result.confidence_score
+
+
+def sentiment_series(
+    log_path: Path,
+    window: str = "24h",
+    half_life: timedelta = timedelta(hours=6),
+    freq: str = "15min",
+) -> pd.DataFrame:
+    """Backfill the rolling index over the whole analysis log."""
+    index = RollingSentimentIndex(window=WINDOWS[window], half_life=half_life)
+    return index.backfill(read_results(log_path), freq=freq)
+
+
+def _decayed_cumsum(times: np.ndarray, values: np.ndarray, rate: float) -> np.ndarray:
+    """out[k] = Σ_{i<=k} values[i]·exp(-rate·(times[k] - times[i])) for sorted times.
+
+    Computed as a cumulative sum of exponentially *grown* values; the series
+    is split into chunks whose exponents stay below _MAX_EXPONENT and the
+    running total is carried across chunk boundaries.
+    """
+    out = np.empty_like(values)
+    span = _MAX_EXPONENT / rate
+    carry = 0.0
+    carry_time = times[0]
+    start = 0
+    while start < len(times):
+        reference = times[start]
+        end = max(int(np.searchsorted(times, reference + span, side="left")), start + 1)
+        offsets = times[start:end] - reference
+        grown = np.cumsum(values[start:end] * np.exp(rate * offsets))
+        carried = carry * math.exp(-rate * (reference - carry_time))
+        out[start:end] = (grown + carried) * np.exp(-rate * offsets)
+        carry = out[end - 1]
+        carry_time = times[end - 1]
+        start = end
+    return out
@@ -0,0 +1,77 @@
+"""JSON encoding for logs and machine-read files.
+
+`dumps` and `loads` use the fastest available backend: orjson, then ujson
+(installed with the requirements), then the stdlib. All three produce
+compact UTF-8 JSON with non-ASCII text kept as-is, so files written by one
+backend read back identically with any other. `BACKEND` names the one in use.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from .models import AnalysisResult, NewsArticle
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - depends on the environment
+    ujson = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+elif ujson is not None:  # pragma: no cover - depends on the environment
+    BACKEND = "ujson"
+
+    def dumps(obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+    def loads(data: bytes | str) -> Any:
+        return ujson.loads(data)
+
+else:  # pragma: no cover - depends on the environment
+    BACKEND = "json"
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+def article_to_dict(article: NewsArticle) -> dict:
+    return {
+        "title": article.title,
+        "description": article.description,
+        "published_at": article.published_at.isoformat(),
+        "source": article.source,
+        "url": article.url,
+    }
+
+
+def result_to_dict(result: AnalysisResult) -> dict:
+    """Field-by-field equivalent of `asdict(result)` without its deep copies.
+
+    Key order matches `asdict`, so log lines keep their existing layout.
+    Update together with the `AnalysisResult` fields.
+    """
+    return {
+        "article": article_to_dict(result.article),
+        "is_relevant": result.is_relevant,
+        "category": result.category,
+        "sentiment_score": result.sentiment_score,
+        "impact_reasoning": result.impact_reasoning,
+        "rationale": result.rationale,
+        "confidence_score": result.confidence_score,
+    }
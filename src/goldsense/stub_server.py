@@ -0,0 +1,282 @@
+"""OpenAI-compatible stub LLM server for offline load testing.
+
+Serves `/v1/chat/completions` with configurable latency, decode throughput
+and injected 429/500 errors. Answers come from a replay fixture (keyed by a
+hash of the request messages) or, for unknown prompts, from a deterministic
+synthetic answer in DSPy's ChatAdapter format. In record mode every request
+is proxied to a real upstream and the answer is saved to the fixture.
+
+    python -m goldsense.stub_server --port 8089 --error-rate 0.02 --rate-limit-rate 0.05
+    python -m goldsense.stub_server --record --upstream https://api.cerebras.ai/v1
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from .httpserver import HttpRequest, HttpResponse, bound_port, start_http_server, stop_http_server
+from .lean import encode_verdict
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "lognormal")
+_OUTPUT_FIELDS_RE = re.compile(r"Your output fields are:\n(.*?)(?:\n\n|$)", re.DOTALL)
+_FIELD_NAME_RE = re.compile(r"^\d+\. `(\w+)`", re.MULTILINE)
+_CATEGORIES = ("Macro", "Geopolitical", "Industrial", "Irrelevant")
+
+
+@dataclass
+class StubConfig:
+    latency: str = "lognormal"  # Time to first token distribution
+    latency_mean_seconds: float = 0.3
+    latency_sigma: float = 0.5  # Lognormal sigma, or +/- spread for uniform
+    tokens_per_second: float = 450.0  # Decode throughput for completion tokens
+    error_rate: float = 0.0  # Share of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0  # Share of requests answered with HTTP 429
+    retry_after_seconds: float = 1.0
+    seed: int = 0
+    fixture_path: Path | None = None
+    record: bool = False
+    upstream_base: str | None = None
+    upstream_api_key: str | None = None
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    replayed: int = 0
+    synthesized: int = 0
+    recorded: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+
+
+@dataclass
+class StubLLMServer:
+    config: StubConfig = field(default_factory=StubConfig)
+    stats: StubStats = field(default_factory=StubStats, init=False)
+    _fixture: dict[str, dict] = field(default_factory=dict, init=False, repr=False)
+    _rng: random.Random = field(init=False, repr=False)
+    _server: asyncio.AbstractServer | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.config.seed)
+        path = self.config.fixture_path
+        if path is not None and path.exists():
+            self._fixture = json.loads(path.read_text(encoding="utf-8"))
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the OpenAI `api_base` URL."""
+        self._server = await start_http_server(self.handle, host, port)
+        return f"http://{host}:{bound_port(self._server)}/v1"
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            await stop_http_server(self._server)
+            self._server = None
+
+    async def handle(self, request: HttpRequest) -> HttpResponse:
+        if request.method == "GET" and request.path.rstrip("/") in {"/v1/models", "/models"}:
+            return HttpResponse.json({"object": "list", "data": [{"id": "stub", "object": "model"}]})
+        if request.path.rstrip("/") not in {"/v1/chat/completions", "/chat/completions"}:
+            return HttpResponse.json({"error": {"message": "not found"}}, status=404)
+        if request.method != "POST":
+            return HttpResponse.json({"error": {"message": "method not allowed"}}, status=405)
+
+        self.stats.requests += 1
+        payload = request.json() or {}
+        messages = payload.get("messages", [])
+        model = payload.get("model", "stub")
+
+        if not self.config.record:
+            roll = self._rng.random()
+            if roll < self.config.rate_limit_rate:
+                self.stats.rate_limited += 1
+                return HttpResponse.json(
+                    _error_body("Rate limit exceeded (stub)", "rate_limit_exceeded"),
+                    status=429,
+                    headers={"Retry-After": f"{self.config.retry_after_seconds:g}"},
+                )
+            if roll < self.config.rate_limit_rate + self.config.error_rate:
+                self.stats.errors += 1
+                return HttpResponse.json(_error_body("Injected server error (stub)", "server_error"), status=500)
+
+        key = fixture_key(messages)
+        if self.config.record:
+            answer = await self._record(key, payload)
+        elif key in self._fixture:
+            self.stats.replayed += 1
+            answer = self._fixture[key]
+        else:
+            self.stats.synthesized += 1
+            answer = synthesize_answer(messages)
+
+        usage = answer.get("usage") or _estimate_usage(messages, answer["content"])
+        if not self.config.record:
+            await asyncio.sleep(self._sample_latency() + usage["completion_tokens"] / self.config.tokens_per_second)
+
+        return HttpResponse.json({
+            "id": f"chatcmpl-stub-{self.stats.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer["content"]},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _sample_latency(self) -> float:
+        mean = self.config.latency_mean_seconds
+        spread = self.config.latency_sigma
+        if self.config.latency == "constant":
+            return mean
+        if self.config.latency == "uniform":
+            return max(0.0, self._rng.uniform(mean - spread, mean + spread))
+        # Lognormal with the requested mean: mu = ln(mean) - sigma^2 / 2
+        return self._rng.lognormvariate(math.log(max(mean, 1e-6)) - spread ** 2 / 2, spread)
+
+    async def _record(self, key: str, payload: dict) -> dict:
+        if not self.config.upstream_base:
+            raise ValueError("Record mode requires upstream_base")
+        headers = {"Authorization": f"Bearer {self.config.upstream_api_key}"} if self.config.upstream_api_key else {}
+        async with httpx.AsyncClient(timeout=120) as client:
+            response = await client.post(
+                self.config.upstream_base.rstrip("/") + "/chat/completions",
+                json=payload,
+                headers=headers,
+            )
+        response.raise_for_status()
+        data = response.json()
+        answer = {
+            "content": data["choices"][0]["message"]["content"],
+            "usage": {
+                "prompt_tokens": data.get("usage", {}).get("prompt_tokens", 0),
+                "completion_tokens": data.get("usage", {}).get("completion_tokens", 0),
+                "total_tokens": data.get("usage", {}).get("total_tokens", 0),
+            },
+        }
+        self._fixture[key] = answer
+        self.stats.recorded += 1
+        self._save_fixture()
+        return answer
+
+    def _save_fixture(self) -> None:
+        path = self.config.fixture_path
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self._fixture, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def fixture_key(messages: list[dict]) -> str:
+    encoded = json.dumps(messages, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def synthesize_answer(messages: list[dict]) -> dict:
+    """Deterministic ChatAdapter-formatted answer for any GoldSignal-style prompt."""
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    article = messages[-1].get("content", "") if messages else ""
+    digest = hashlib.sha256(article.encode("utf-8")).digest()
+
+    category = _CATEGORIES[digest[0] % len(_CATEGORIES)]
+    relevant = category != "Irrelevant"
+    score = 1 + digest[1] % 10 if relevant else 5
+    confidence = round(0.5 + (digest[2] % 50) / 100, 2)
+    values = {
+        "reasoning": "Stub reasoning: the article is scored deterministically from its hash.",
+        "rationale": "Stub rationale for offline load testing.",
+        "is_relevant": str(relevant),
+        "category": category,
+        "sentiment_score": str(score),
+        "impact_reasoning": "Bu yanıt yük testi için üretilmiş sahte bir değerlendirmedir.",
+        "confidence_score": str(confidence),
+        "verdict": encode_verdict(
+            is_relevant=relevant,
+            category=category,
+            sentiment_score=score,
+            confidence_score=confidence,
+            impact_reasoning="Yük testi için sahte değerlendirme.",
+        ),
+    }
+
+    section = _OUTPUT_FIELDS_RE.search(system)
+    names = _FIELD_NAME_RE.findall(section.group(1)) if section else list(values)
+    parts = [f"[[ ## {name} ## ]]\n{values.get(name, 'N/A')}" for name in names]
+    parts.append("[[ ## completed ## ]]")
+    return {"content": "\n\n".join(parts)}
+
+
+def _estimate_usage(messages: list[dict], content: str) -> dict[str, int]:
+    # ~4 characters per token is close enough for throughput simulation
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+    completion_tokens = max(1, len(content) // 4)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _error_body(message: str, code: str) -> dict:
+    return {"error": {"message": message, "type": code, "code": code}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-mean", type=float, default=0.3)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=450.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixture", type=Path, default=Path("logs/llm_fixture.json"))
+    parser.add_argument("--record", action="store_true", help="Proxy to --upstream and save answers")
+    parser.add_argument("--upstream", default=os.getenv("CEREBRAS_API_BASE"))
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency=args.latency,
+        latency_mean_seconds=args.latency_mean,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+        fixture_path=args.fixture,
+        record=args.record,
+        upstream_base=args.upstream,
+        upstream_api_key=os.getenv("CEREBRAS_API_KEY"),
+    )
+
+    async def _serve() -> None:
+        stub = StubLLMServer(config)
+        api_base = await stub.start(args.host, args.port)
+        print(f"Stub LLM: {api_base} ({'record' if args.record else 'replay/synthetic'})")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import re
+
+# FTS5 tokenizer for the history search index. unicode61 lower-cases and,
+# with remove_diacritics 2, maps ş/ğ/ü/ö/ç to s/g/u/o/c.
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+
+# Turkish dotted/dotless i: İ/I/ı/i all fold to "i", so "ıran", "IRAN" and
+# "iran" match, and Python's "İ".lower() (i + combining dot) is avoided.
+_TURKISH_I = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+_WORD = re.compile(r"\w+")
+
+
+def fold_text(text: str | None) -> str:
+    """Case-fold for indexing and querying (Turkish-aware)."""
+    return (text or "").translate(_TURKISH_I).lower()
+
+
+def match_query(text: str) -> str | None:
+    """FTS5 MATCH expression: every word must occur, as a prefix.
+
+    Words are quoted, so user input never hits FTS5 query syntax
+    (AND/OR/NEAR, quotes, `*`, `-`). Returns None for a query without words.
+    """
+    words = _WORD.findall(fold_text(text))
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
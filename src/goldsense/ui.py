@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 import dspy
 
+from .frame import ResultFrame
+from .metrics import RunMetrics
 from .models import MarketSummary, AnalysisResult
 
 def _trend_tr(value: str) -> str:
@@ -15,16 +18,26 @@ def _trend_tr(value: str) -> str:
     }
     return mapping.get(value, value)
 
+CATEGORY_LABELS_TR = {
+    "Macro": "Makro",
+    "Geopolitical": "Jeopolitik",
+    "Industrial": "Endüstriyel",
+    "Irrelevant": "Alakasız",
+}
+
 def _category_tr(value: str) -> str:
-    mapping = {
-        "Macro": "Makro",
-        "Geopolitical": "Jeopolitik",
-        "Industrial": "Endüstriyel",
-        "Irrelevant": "Alakasız",
-    }
-    return mapping.get(value, value)
+    return CATEGORY_LABELS_TR.get(value, value)
 
-def render_results(price: float | None, summary: MarketSummary, results: list[AnalysisResult], confidence_threshold: float):
+def render_results(
+    price: float | None,
+    summary: MarketSummary,
+    results: list[AnalysisResult],
+    confidence_threshold: float,
+    frame: ResultFrame | None = None,
+    price_history: pd.DataFrame | None = None,
+    key: str = "results",  # Widget key prefix; distinct per call when rendered more than once
+    price_unit: str | None = None,  # e.g. "TRY/g"; the unit of `price` and `price_history`
+):
     # ... (Existing code kept as is, but focusing on new function below)
     # Strategic Summary
     st.subheader("Stratejik Değerlendirme")
@@ -49,7 +62,7 @@ def render_results(price: float | None, summary: MarketSummary, results: list[An
     if price is None:
         col1.metric("Altın Fiyatı", "Veri Yok")
     else:
-        col1.metric("Altın Fiyatı", f"{price:.2f} USD")
+        col1.metric("Altın Fiyatı", f"{price:.2f} {price_unit}" if price_unit else f"{price:.2f}")
     
     col2.metric("Eğilim", _trend_tr(summary.trend))
     col3.metric("Ort. Skor", f"{summary.average_score:.1f}/10")
@@ -68,7 +81,12 @@ def render_results(price: float | None, summary: MarketSummary, results: list[An
     st.divider()
 
     # Chart Section
-    _render_chart(results)
+    _render_chart(
+        frame if frame is not None else ResultFrame.from_results(results),
+        price_history,
+        key=f"{key}_chart",
+        price_unit=price_unit,
+    )
 
     st.divider()
     st.subheader("Tüm İlgili Haberler")
@@ -81,6 +99,7 @@ def render_results(price: float | None, summary: MarketSummary, results: list[An
         selected_category_display = st.selectbox(
             "Kategoriye göre filtrele:",
             category_display,
+            key=f"{key}_category",
         )
 
         if selected_category_display == "Tümü":
@@ -144,19 +163,14 @@ def _render_article_card(item: AnalysisResult, rank: int | None = None):
                 st.warning("Not supplied for this particular example.")
                 st.caption("Model bu haber için ayrıntılı muhakeme adımlarını üretmedi veya Few-Shot örneklerde bu alan boştu.")
 
-def _render_chart(results: list[AnalysisResult]):
-    chart_data = pd.DataFrame(
-        [
-            {
-                "title": r.article.title,
-                "score": r.sentiment_score,
-                "category": _category_tr(r.category),
-                "published_at": r.article.published_at,
-            }
-            for r in results
-            if r.is_relevant
-        ]
-    )
+def _render_chart(
+    frame: ResultFrame,
+    price_history: pd.DataFrame | None = None,
+    key: str | None = None,
+    price_unit: str | None = None,
+):
+    """Sentiment scatter; recorded price closes (OHLC bars) on a second y-axis if given."""
+    chart_data = frame.chart_data(category_labels=CATEGORY_LABELS_TR)
 
     if not chart_data.empty:
         fig = px.scatter(
@@ -182,10 +196,75 @@ def _render_chart(results: list[AnalysisResult]):
             annotation_text="Ayı Eşiği",
             annotation_position="right",
         )
-        st.plotly_chart(fig, use_container_width=True)
+        if price_history is not None and not price_history.empty:
+            fig.add_trace(
+                go.Scatter(
+                    x=price_history.index,
+                    y=price_history["close"],
+                    name="Altın Fiyatı",
+                    mode="lines",
+                    line={"color": "goldenrod"},
+                    yaxis="y2",
+                )
+            )
+            fig.update_layout(
+                yaxis2={"title": price_unit or "Fiyat", "overlaying": "y", "side": "right", "showgrid": False}
+            )
+        st.plotly_chart(fig, use_container_width=True, key=key)
     else:
         st.info("Grafik oluşturulacak veri yok.")
 
+def render_sentiment_index(series: pd.DataFrame, window: str):
+    """Time-decayed rolling sentiment over the whole analysis history."""
+    st.subheader(f"Zaman Ağırlıklı Duygu Endeksi ({window})")
+    data = series.dropna(subset=["value"])
+    if data.empty:
+        st.info("Endeks için yeterli geçmiş analiz yok.")
+        return
+
+    latest = data.iloc[-1]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Son Endeks", f"{latest['value']:.2f}/10")
+    col2.metric("Penceredeki Haber", int(latest["count"]))
+    col3.metric("Kanıt Ağırlığı", f"{latest['weight']:.2f}")
+
+    fig = px.line(
+        data.reset_index(names="timestamp"),
+        x="timestamp",
+        y="value",
+        labels={"value": "Endeks (1-10)", "timestamp": "Zaman"},
+    )
+    fig.add_hline(y=7, line_dash="dash", line_color="green")
+    fig.add_hline(y=4, line_dash="dash", line_color="red")
+    st.plotly_chart(fig, use_container_width=True)
+
+def render_run_metrics(metrics: RunMetrics):
+    """Token, latency and cost figures for the last analysis run."""
+    st.markdown("### ⏱️ Token & Gecikme Metrikleri")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("LM Çağrısı", metrics.calls, help=f"{metrics.failed_calls} başarısız, {metrics.retries} tekrar")
+    col2.metric("Prompt Token", f"{metrics.prompt_tokens:,}")
+    col3.metric("Completion Token", f"{metrics.completion_tokens:,}")
+    col4.metric("Toplam Maliyet", f"${metrics.total_cost:.4f}" if metrics.total_cost is not None else "N/A")
+
+    col5, col6, col7, col8 = st.columns(4)
+    col5.metric("Gecikme p50", f"{metrics.latency_p50:.2f} sn")
+    col6.metric("Gecikme p95", f"{metrics.latency_p95:.2f} sn")
+    col7.metric("Gecikme p99", f"{metrics.latency_p99:.2f} sn")
+    col8.metric("Kuyruk Bekleme p95", f"{metrics.queue_wait_p95:.2f} sn")
+
+    st.caption(
+        f"Toplam süre: {metrics.wall_seconds:.1f} sn | "
+        f"Hız: {metrics.calls_per_second:.2f} çağrı/sn | "
+        f"Cache isabeti: {metrics.cache_hits}/{metrics.calls}"
+    )
+    st.caption(
+        f"Prompt önbelleği: {metrics.cached_prompt_tokens:,}/{metrics.prompt_tokens:,} token "
+        f"(%{metrics.prefix_cache_ratio * 100:.0f}) | "
+        f"Prefix hash: `{(metrics.prefix_hash or 'N/A')[:12]}`"
+    )
+
 def render_performance_tab(lm_history: list | None, token_usage: dict | None):
     """
     Renders detailed performance metrics and DSPy prompt inspection.
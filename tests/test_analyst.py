@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.analyst import GoldAnalyst
+from goldsense.config import Settings
+from goldsense.examples import TRAINING_SET
+from goldsense.models import NewsArticle
+
+
+def _settings(**overrides) -> Settings:
+    values = dict(
+        newsapi_key="test",
+        newsapi_base="https://newsapi.org/v2/everything",
+        query="gold",
+        lookback_days=2,
+        cerebras_api_key="test",
+        cerebras_api_base="test",
+        cerebras_model="test",
+        analysis_temperature=0.2,
+        max_concurrency=3,
+        truncgil_url="test",
+        truncgil_gold_symbol="GRA",
+        analysis_max_attempts=3,
+        analysis_retry_base_delay=0.0,
+    )
+    values.update(overrides)
+    return Settings(**values)
+
+
+def _article(title: str) -> NewsArticle:
+    return NewsArticle(
+        title=title,
+        description=f"{title} description",
+        published_at=datetime(2026, 2, 2, tzinfo=timezone.utc),
+        url=f"https://example.com/{title}",
+    )
+
+
+class _ScriptedPredict:
+    """Stands in for the compiled DSPy module; fails a title a fixed number of times."""
+
+    def __init__(self, failures: dict[str, int]):
+        self.failures = dict(failures)
+        self.calls: dict[str, int] = {}
+
+    def named_predictors(self):
+        return []
+
+    def __call__(self, title: str, description: str, **kwargs):
+        self.calls[title] = self.calls.get(title, 0) + 1
+        if self.failures.get(title, 0) > 0:
+            self.failures[title] -= 1
+            raise ValueError(f"malformed response for {title}")
+        return SimpleNamespace(
+            is_relevant="True",
+            category="Macro",
+            sentiment_score="7",
+            rationale="Rates down, gold up.",
+            impact_reasoning="Faiz indirimi altını destekler.",
+            confidence_score="0.9",
+            verdict='{"r":1,"c":"M","s":7,"k":0.9,"i":"Faiz indirimi altını destekler."}',
+        )
+
+
+def _analyst(predict: _ScriptedPredict, **overrides) -> GoldAnalyst:
+    # Skip __post_init__ so no LM or few-shot compilation is needed
+    analyst = GoldAnalyst.__new__(GoldAnalyst)
+    analyst.settings = _settings(**overrides)
+    analyst._predict = predict
+    return analyst
+
+
+def test_batch_keeps_partial_results_on_permanent_failure() -> None:
+    predict = _ScriptedPredict({"bad": 99})
+    analyst = _analyst(predict)
+    articles = [_article("a"), _article("bad"), _article("b")]
+
+    batch = asyncio.run(analyst.analyze_batch(articles))
+
+    assert [r.article.title for r in batch.results] == ["a", "b"]
+    assert len(batch.failures) == 1
+    assert batch.failures[0].article.title == "bad"
+    assert batch.failures[0].attempts == 3
+    assert "malformed response" in batch.failures[0].error
+    assert predict.calls["bad"] == 3
+    assert predict.calls["a"] == 1
+    assert batch.metrics.calls == 5
+    assert batch.metrics.failed_calls == 3
+
+
+def test_batch_retries_transient_failure() -> None:
+    predict = _ScriptedPredict({"flaky": 1})
+    analyst = _analyst(predict)
+
+    batch = asyncio.run(analyst.analyze_batch([_article("flaky")]))
+
+    assert not batch.failures
+    assert batch.results[0].sentiment_score == 7
+    assert predict.calls["flaky"] == 2
+
+
+def test_analyze_articles_returns_only_successes() -> None:
+    predict = _ScriptedPredict({"bad": 99})
+    analyst = _analyst(predict, analysis_max_attempts=1)
+
+    results = asyncio.run(analyst.analyze_articles([_article("bad"), _article("ok")]))
+
+    assert [r.article.title for r in results] == ["ok"]
+
+
+def test_retry_delay_is_exponential() -> None:
+    analyst = _analyst(_ScriptedPredict({}), analysis_retry_base_delay=0.5)
+
+    assert [analyst._retry_delay(n) for n in (1, 2, 3)] == [0.5, 1.0, 2.0]
+
+
+def test_lean_mode_parses_compact_verdict() -> None:
+    predict = _ScriptedPredict({})
+    analyst = _analyst(predict, analysis_output_mode="lean")
+
+    result = analyst._analyze_one(_article("lean"))
+
+    assert result.category == "Macro"
+    assert result.is_relevant is True
+    assert result.sentiment_score == 7
+    assert result.confidence_score == 0.9
+    assert result.rationale is None
+
+
+def test_prompt_prefix_is_canonical_across_articles() -> None:
+    analyst = GoldAnalyst(_settings())
+
+    first = analyst.format_prompt(_article("Fed cuts rates"))
+    second = analyst.format_prompt(_article("Mine strike halts output"))
+
+    assert first[:-1] == second[:-1]
+    assert first[-1] != second[-1]
+    _, predictor = analyst._predict.named_predictors()[0]
+    assert [demo.title for demo in predictor.demos] == [example.title for example in TRAINING_SET]
+    assert analyst.prefix_hash == GoldAnalyst(_settings()).prefix_hash
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.api import ApiServer
+from goldsense.history import AnalysisHistory
+from goldsense.logger import JsonlLogger
+from goldsense.models import AnalysisResult, NewsArticle
+from goldsense.tonl import encode_news_articles
+
+
+def _result(title: str, hours_ago: float, score: int = 8) -> AnalysisResult:
+    article = NewsArticle(
+        title=title,
+        description="d",
+        published_at=datetime.now(timezone.utc) - timedelta(hours=hours_ago),
+        source="Reuters",
+        url=f"https://example.com/{title.replace(' ', '-')}",
+    )
+    return AnalysisResult(article=article, is_relevant=True, category="Macro", sentiment_score=score, impact_reasoning="-")
+
+
+async def _request(base: str, method: str, path: str, body: bytes = b"", headers: dict | None = None):
+    host, port = base.removeprefix("http://").split(":")
+    reader, writer = await asyncio.open_connection(host, int(port))
+    extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: api\r\nConnection: close\r\n{extra}Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, response_body = raw.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    response_headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split(" ")[1]), response_headers, response_body
+
+
+def _server(tmp_path: Path, **overrides) -> tuple[JsonlLogger, ApiServer]:
+    logger = JsonlLogger(tmp_path / "analysis.jsonl")
+    values = dict(history=AnalysisHistory(logger.index_path), state_path=tmp_path / "state.json", check_seconds=0.0)
+    values.update(overrides)
+    return logger, ApiServer(**values)
+
+
+def test_analyses_since_and_conditional_get(tmp_path: Path) -> None:
+    logger, server = _server(tmp_path)
+    logger.log_many([_result("Fed cuts", 1), _result("ECB holds", 5), _result("Old news", 72)])
+
+    async def scenario():
+        base = await server.start()
+        try:
+            status, headers, body = await _request(base, "GET", "/analyses?since=24h&limit=10")
+            etag = headers["ETag"]
+            not_modified = await _request(base, "GET", "/analyses?since=24h&limit=10", headers={"If-None-Match": etag})
+            logger.log_many([_result("Gold rallies", 0.5)])  # Index changes: cached body is dropped
+            changed = await _request(base, "GET", "/analyses?since=24h&limit=10", headers={"If-None-Match": etag})
+            return status, body, etag, not_modified, changed
+        finally:
+            await server.stop()
+
+    status, body, etag, not_modified, changed = asyncio.run(scenario())
+
+    payload = json.loads(body)
+    assert status == 200
+    assert [item["article"]["title"] for item in payload["analyses"]] == ["Fed cuts", "ECB holds"]
+    assert payload["total"] == 2
+    assert not_modified[0] == 304 and not_modified[2] == b"" and not_modified[1]["ETag"] == etag
+    assert changed[0] == 200 and changed[1]["ETag"] != etag
+    assert json.loads(changed[2])["analyses"][0]["article"]["title"] == "Gold rallies"
+
+
+def test_summary_prefers_daemon_state_and_falls_back_to_history(tmp_path: Path) -> None:
+    logger, server = _server(tmp_path)
+    logger.log_many([_result("Fed cuts", 1, score=9), _result("ECB holds", 2, score=3)])
+
+    async def scenario():
+        base = await server.start()
+        try:
+            from_history = json.loads((await _request(base, "GET", "/summary"))[2])
+            summary = {"average_score": 7.5, "trend": "Bullish", "total_articles": 4, "relevant_articles": 4}
+            state = {
+                "started_at": "s", "updated_at": "u", "status": "running",
+                "price": 2400.0, "price_source": "binance", "price_unit": "USD/oz", "summary": summary,
+            }
+            (tmp_path / "state.json").write_text(json.dumps(state), encoding="utf-8")
+            from_daemon = json.loads((await _request(base, "GET", "/summary"))[2])
+            price = json.loads((await _request(base, "GET", "/price"))[2])
+            return from_history, from_daemon, price
+        finally:
+            await server.stop()
+
+    from_history, from_daemon, price = asyncio.run(scenario())
+
+    assert from_history["source"] == "history"
+    assert from_history["summary"]["total_articles"] == 2
+    assert from_daemon["source"] == "daemon"
+    assert from_daemon["summary"]["trend"] == "Bullish"
+    assert price == {"price": 2400.0, "unit": "USD/oz", "source": "daemon", "price_source": "binance"}
+
+
+def test_history_summary_counts_past_one_page(tmp_path: Path) -> None:
+    logger, server = _server(tmp_path)
+    logger.log_many([_result(f"Gold {i}", 1) for i in range(10_050)])
+
+    async def scenario():
+        base = await server.start()
+        try:
+            return json.loads((await _request(base, "GET", "/summary"))[2])
+        finally:
+            await server.stop()
+
+    assert asyncio.run(scenario())["summary"]["total_articles"] == 10_050
+
+
+def test_tonl_encode_and_errors(tmp_path: Path) -> None:
+    _, server = _server(tmp_path)
+    articles = [{"title": "Gold up", "description": "d", "source": {"name": "Reuters"}, "publishedAt": "2026-03-01T10:00:00Z"}]
+
+    async def scenario():
+        base = await server.start()
+        try:
+            encoded = await _request(base, "POST", "/tonl/encode", json.dumps({"articles": articles}).encode())
+            again = await _request(base, "POST", "/tonl/encode", json.dumps({"articles": articles}).encode())
+            return (
+                encoded,
+                again,
+                (await _request(base, "POST", "/tonl/encode", b"not json"))[0],
+                (await _request(base, "GET", "/tonl/encode"))[0],
+                (await _request(base, "GET", "/analyses?since=yesterday"))[0],
+                (await _request(base, "GET", "/analyses?limit=0"))[0],
+                (await _request(base, "GET", "/nope"))[0],
+            )
+        finally:
+            await server.stop()
+
+    encoded, again, bad_body, wrong_method, bad_since, bad_limit, unknown = asyncio.run(scenario())
+
+    assert encoded[0] == 200
+    assert encoded[2].decode("utf-8") == encode_news_articles(articles)
+    assert again[1]["ETag"] == encoded[1]["ETag"]
+    assert (bad_body, wrong_method, bad_since, bad_limit, unknown) == (400, 405, 400, 400, 404)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.backtest import (
+    BacktestGrid,
+    build_signal_matrix,
+    evaluate,
+    load_price_series,
+    run_backtest,
+)
+from goldsense.engine import MarketEngine
+from goldsense.exceptions import ConfigError, GoldSenseError
+from goldsense.frame import ResultFrame
+from goldsense.models import AnalysisResult, NewsArticle
+
+START = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def _result(hour: int, score: int, category: str = "Macro", confidence: float = 0.9) -> AnalysisResult:
+    return AnalysisResult(
+        article=NewsArticle(title=f"t{hour}", description="d", published_at=START + timedelta(hours=hour, minutes=10)),
+        is_relevant=category != "Irrelevant",
+        category=category,
+        sentiment_score=score,
+        impact_reasoning="-",
+        confidence_score=confidence,
+    )
+
+
+def _fixture() -> tuple[ResultFrame, pd.Series]:
+    # Bullish news precedes a rise, bearish news a fall
+    scores = [9, 2, 8, 3, 9, 5, 2, 9]
+    results = [_result(hour, score) for hour, score in enumerate(scores)]
+    results.append(_result(3, 5, "Irrelevant"))
+
+    price = [100.0]
+    for score in scores:
+        price.append(price[-1] * (1.01 if score > 6 else 0.99 if score < 4 else 1.0))
+    prices = pd.Series(price, index=pd.date_range(START + timedelta(hours=1), periods=len(price), freq="1h"))
+    return ResultFrame.from_results(results), prices
+
+
+def test_signal_matrix_matches_engine_scores() -> None:
+    results = [_result(0, 9, "Macro", 0.8), _result(0, 3, "Geopolitical", 0.6), _result(0, 6, "Industrial", 0.5)]
+    frame, prices = _fixture()
+    matrix = build_signal_matrix(ResultFrame.from_results(results), prices, ("1h",))
+
+    weights = np.array([[MarketEngine.CATEGORY_WEIGHTS[name] for name in ("Macro", "Geopolitical", "Industrial")]])
+    expected = MarketEngine().summarize(results).weighted_score
+
+    assert len(matrix) == 1
+    assert matrix.weighted_scores(weights)[0, 0] == pytest.approx(expected)
+
+
+def test_forward_returns_and_hit_rate() -> None:
+    frame, prices = _fixture()
+    matrix = build_signal_matrix(frame, prices, ("1h",))
+
+    assert matrix.returns["1h"][0] == pytest.approx(0.01)
+    assert matrix.returns["1h"][1] == pytest.approx(-0.01)
+
+    report = evaluate(matrix, np.array([[1.5, 1.2, 1.0]]), np.array([7.0]), np.array([4.0]))
+
+    row = report.iloc[0]
+    assert row["signals"] == 7  # The neutral 5 is flat
+    assert row["hit_rate"] == pytest.approx(1.0)
+    assert row["ic"] > 0.9
+
+
+def test_horizon_beyond_price_history_is_excluded() -> None:
+    frame, prices = _fixture()
+    matrix = build_signal_matrix(frame, prices, ("24h",))
+
+    assert np.isnan(matrix.returns["24h"]).all()
+    assert evaluate(matrix, np.array([[1.0, 1.0, 1.0]]), np.array([7.0]), np.array([4.0]))["signals"].iloc[0] == 0
+
+
+def test_empty_price_series_is_rejected() -> None:
+    frame, _ = _fixture()
+
+    with pytest.raises(GoldSenseError, match="boş"):
+        build_signal_matrix(frame, pd.Series([], index=pd.DatetimeIndex([], tz="UTC"), dtype=float), ("1h",))
+
+
+def test_parallel_sweep_matches_serial() -> None:
+    frame, prices = _fixture()
+    matrix = build_signal_matrix(frame, prices, ("1h", "2h"))
+    grid = BacktestGrid(bullish_thresholds=(6.5, 7.0), bearish_thresholds=(4.0, 7.0))
+
+    serial = run_backtest(matrix, grid, workers=1)
+    parallel = run_backtest(matrix, grid, workers=2)
+
+    # 27 weight vectors × 2 pairs with bearish < bullish × 2 horizons
+    assert len(serial) == 27 * 2 * 2
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_load_price_series_csv(tmp_path: Path) -> None:
+    path = tmp_path / "gold.csv"
+    path.write_text("date,close\n2026-02-01T02:00:00Z,101\n2026-02-01T01:00:00Z,100\n", encoding="utf-8")
+
+    series = load_price_series(path)
+
+    assert list(series) == [100.0, 101.0]
+    assert str(series.index.tz) == "UTC"
+
+    (tmp_path / "bad.csv").write_text("a,b\n1,2\n", encoding="utf-8")
+    with pytest.raises(ConfigError):
+        load_price_series(tmp_path / "bad.csv")
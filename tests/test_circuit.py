@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense import circuit
+from goldsense.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(monkeypatch) -> tuple[CircuitBreaker, _Clock]:
+    clock = _Clock()
+    monkeypatch.setattr(circuit.time, "monotonic", clock)
+    return CircuitBreaker("truncgil", failure_threshold=2, cooldown_seconds=30), clock
+
+
+def test_opens_after_consecutive_failures(monkeypatch) -> None:
+    breaker, _ = _breaker(monkeypatch)
+
+    breaker.record_failure("timeout")
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure("timeout")
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.snapshot()["retry_in_seconds"] == 30
+
+
+def test_success_resets_failure_count(monkeypatch) -> None:
+    breaker, _ = _breaker(monkeypatch)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_a_single_probe(monkeypatch) -> None:
+    breaker, clock = _breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # Probe already in flight
+
+    breaker.record_failure("still down")
+    assert breaker.state == OPEN  # One failed probe re-opens
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["failures"] == 0
+
+
+def test_released_probe_can_be_retried(monkeypatch) -> None:
+    breaker, clock = _breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.release()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
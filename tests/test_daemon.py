@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense import daemon
+from goldsense.config import Settings
+from goldsense.daemon import AnalysisDaemon, read_state
+from goldsense.engine import MarketEngine
+from goldsense.logger import JsonlLogger, read_results
+from goldsense.models import AnalysisResult, BatchAnalysis, NewsArticle
+
+
+def _settings() -> Settings:
+    return Settings(
+        newsapi_key="test",
+        newsapi_base="test",
+        query="gold",
+        lookback_days=2,
+        cerebras_api_key="test",
+        cerebras_api_base="test",
+        cerebras_model="test",
+        analysis_temperature=0.2,
+        max_concurrency=3,
+        truncgil_url="test",
+    )
+
+
+def _articles(count: int) -> list[NewsArticle]:
+    now = datetime.now(timezone.utc)
+    return [
+        NewsArticle(title=f"Gold {i}", description="d", published_at=now - timedelta(hours=i), source="Reuters", url=f"https://{i}")
+        for i in range(count)
+    ]
+
+
+class _Fetcher:
+    articles: list[NewsArticle] = []
+
+    def __init__(self, settings: Settings) -> None:
+        pass
+
+    async def fetch_latest(self):
+        return list(self.articles)
+
+
+class _Analyst:
+    delay = 0.0
+    max_depth = 0  # Deepest article queue seen while analyzing
+    queue: asyncio.Queue | None = None
+
+    def __init__(self, settings: Settings) -> None:
+        pass
+
+    async def analyze_batch(self, articles):
+        if _Analyst.queue is not None:
+            _Analyst.max_depth = max(_Analyst.max_depth, _Analyst.queue.qsize())
+        await asyncio.sleep(self.delay)
+        results = [
+            AnalysisResult(article=a, is_relevant=True, category="Macro", sentiment_score=8, impact_reasoning="-")
+            for a in articles
+        ]
+        return BatchAnalysis(results=results, failures=[])
+
+
+@pytest.fixture(autouse=True)
+def _fakes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(daemon, "NewsFetcher", _Fetcher)
+    monkeypatch.setattr(daemon, "GoldAnalyst", _Analyst)
+    _Fetcher.articles = _articles(3)
+    _Analyst.delay, _Analyst.max_depth, _Analyst.queue = 0.0, 0, None
+
+
+async def _run_until(service: AnalysisDaemon, written: int) -> None:
+    task = asyncio.create_task(service.run())
+    for _ in range(500):
+        await asyncio.sleep(0.01)
+        if hasattr(service, "_state") and service._state.written_total >= written:
+            break
+    service.stop()
+    await task
+
+
+def test_daemon_logs_new_articles_and_publishes_state(tmp_path: Path) -> None:
+    logger = JsonlLogger(tmp_path / "analysis.jsonl")
+    state_path = tmp_path / "state.json"
+    service = AnalysisDaemon(settings=_settings(), logger=logger, state_path=state_path, poll_seconds=3600)
+
+    asyncio.run(_run_until(service, written=3))
+
+    state = read_state(state_path)
+    assert state is not None
+    assert state.status == "stopped"
+    assert (state.polls, state.fetched_total, state.written_total) == (1, 3, 3)
+    assert state.queues == {"articles": 0, "results": 0}
+    assert state.market_summary().total_articles == 3
+    assert [r.article.title for r in state.recent_results()] == ["Gold 0", "Gold 1", "Gold 2"]
+    assert len(list(read_results(logger.path))) == 3
+
+
+def test_daemon_skips_logged_articles_and_seeds_window_on_restart(tmp_path: Path) -> None:
+    logger = JsonlLogger(tmp_path / "analysis.jsonl")
+    state_path = tmp_path / "state.json"
+    asyncio.run(_run_until(AnalysisDaemon(settings=_settings(), logger=logger, state_path=state_path, poll_seconds=3600), 3))
+
+    _Fetcher.articles = _articles(4)  # One new article, three already logged
+    restarted = AnalysisDaemon(
+        settings=_settings(), logger=JsonlLogger(tmp_path / "analysis.jsonl"), state_path=state_path, poll_seconds=3600
+    )
+    asyncio.run(_run_until(restarted, written=1))
+
+    state = read_state(state_path)
+    assert (state.fetched_total, state.analyzed_total, state.written_total) == (4, 1, 1)
+    assert state.market_summary().total_articles == 4  # Window includes the analyses from before the restart
+    assert len(list(read_results(logger.path))) == 4
+
+
+def test_daemon_window_summary_is_incremental_and_evicts_old_articles(tmp_path: Path) -> None:
+    logger = JsonlLogger(tmp_path / "analysis.jsonl")
+    service = AnalysisDaemon(
+        settings=_settings(),
+        logger=logger,
+        state_path=tmp_path / "state.json",
+        poll_seconds=3600,
+        window=timedelta(hours=1, minutes=30),
+    )
+
+    asyncio.run(_run_until(service, written=3))
+
+    state = read_state(tmp_path / "state.json")
+    in_window = [r for r in read_results(logger.path) if r.article.title in {"Gold 0", "Gold 1"}]
+    assert [r.article.title for r in state.recent_results()] == ["Gold 0", "Gold 1"]  # Gold 2 is 2h old
+    assert state.market_summary() == service.engine.summarize(in_window)
+    assert state.sentiment["count"] == 2
+
+    latest = service._window["https://0"]
+    service._add_to_window(latest)  # Re-analysis of the same article replaces it instead of double counting
+    assert service.engine.current_summary().total_articles == 2
+
+
+def test_drained_window_publishes_an_empty_summary(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    verdicts = {"Gold 0": ("Macro", 8, 0.7), "Gold 1": ("Geopolitical", 3, 0.9), "Gold 2": ("Industrial", 6, 0.65)}
+
+    class _VariedAnalyst(_Analyst):
+        async def analyze_batch(self, articles):
+            results = [
+                AnalysisResult(
+                    article=a,
+                    is_relevant=True,
+                    category=verdicts[a.title][0],
+                    sentiment_score=verdicts[a.title][1],
+                    impact_reasoning="-",
+                    confidence_score=verdicts[a.title][2],
+                )
+                for a in articles
+            ]
+            return BatchAnalysis(results=results, failures=[])
+
+    monkeypatch.setattr(daemon, "GoldAnalyst", _VariedAnalyst)
+    now = datetime.now(timezone.utc)
+    _Fetcher.articles = [
+        NewsArticle(
+            title=f"Gold {i}",
+            description="d",
+            published_at=now - timedelta(seconds=(3 - i) / 10),  # Gold 0 is the oldest and leaves first
+            source="Reuters",
+            url=f"https://{i}",
+        )
+        for i in range(3)
+    ]
+    service = AnalysisDaemon(
+        settings=_settings(),
+        logger=JsonlLogger(tmp_path / "analysis.jsonl"),
+        state_path=tmp_path / "state.json",
+        poll_seconds=3600,
+        window=timedelta(seconds=1),
+    )
+
+    async def scenario() -> None:
+        await _run_until(service, written=3)
+        assert read_state(tmp_path / "state.json").market_summary().relevant_articles == 3
+        await asyncio.sleep(1.1)  # Every article leaves the window
+        await service._publish()
+
+    asyncio.run(scenario())
+
+    state = read_state(tmp_path / "state.json")
+    assert state.market_summary() == MarketEngine().summarize([])  # Exactly empty, no float residue
+    assert state.recent == []
+    assert state.sentiment == {"value": None, "weight": 0.0, "count": 0}
+
+
+def test_daemon_backpressure_bounds_the_article_queue(tmp_path: Path) -> None:
+    _Fetcher.articles = _articles(6)
+    _Analyst.delay = 0.02
+    service = AnalysisDaemon(
+        settings=_settings(),
+        logger=JsonlLogger(tmp_path / "analysis.jsonl"),
+        state_path=tmp_path / "state.json",
+        poll_seconds=3600,
+        queue_size=1,
+        batch_size=1,
+    )
+
+    async def scenario() -> None:
+        task = asyncio.create_task(service.run())
+        await asyncio.sleep(0)
+        _Analyst.queue = service._articles
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            if service._state.written_total >= 6:
+                break
+        service.stop()
+        await task
+
+    asyncio.run(scenario())
+
+    assert _Analyst.max_depth <= 1
+    assert read_state(tmp_path / "state.json").written_total == 6
+
+
+def test_read_state_missing_file(tmp_path: Path) -> None:
+    assert read_state(tmp_path / "missing.json") is None
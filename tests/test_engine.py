@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import math
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.engine import MarketEngine
+from goldsense.models import AnalysisResult, NewsArticle
+
+CATEGORIES = ["Macro", "Geopolitical", "Industrial", "Irrelevant"]
+
+
+def _result(score: int, category: str = "Macro", confidence: float = 0.9, relevant: bool = True) -> AnalysisResult:
+    return AnalysisResult(
+        article=NewsArticle(title="t", description="d", published_at=datetime(2026, 2, 2, tzinfo=timezone.utc)),
+        is_relevant=relevant,
+        category=category,
+        sentiment_score=score,
+        impact_reasoning="-",
+        confidence_score=confidence,
+    )
+
+
+def _random_results(count: int, seed: int = 7) -> list[AnalysisResult]:
+    rng = random.Random(seed)
+    return [
+        _result(
+            rng.randint(1, 10),
+            rng.choice(CATEGORIES),
+            round(rng.random(), 3),
+            relevant=rng.random() > 0.2,
+        )
+        for _ in range(count)
+    ]
+
+
+def test_summarize_weighted_trend() -> None:
+    summary = MarketEngine().summarize([
+        _result(9, "Macro", 1.0),
+        _result(8, "Geopolitical", 0.5),
+        _result(2, "Industrial", 0.5, relevant=False),
+    ])
+
+    assert summary.total_articles == 3
+    assert summary.relevant_articles == 2
+    assert summary.average_score == 8.5
+    assert abs(summary.weighted_score - (9 * 1.5 + 8 * 0.6) / (1.5 + 0.6)) < 1e-12
+    assert summary.trend == "Strong Bullish"
+
+
+def test_empty_summary_is_neutral() -> None:
+    summary = MarketEngine().summarize([])
+
+    assert summary.trend == "Neutral"
+    assert summary.weighted_score == 0.0
+    assert summary.confidence_average == 0.0
+
+
+def test_streamed_updates_match_batch() -> None:
+    results = _random_results(200)
+    engine = MarketEngine()
+
+    for index, result in enumerate(results, 1):
+        engine.update(result)
+        assert engine.current_summary() == MarketEngine().summarize(results[:index])
+
+
+def _assert_close(actual, expected) -> None:
+    assert (actual.total_articles, actual.relevant_articles) == (expected.total_articles, expected.relevant_articles)
+    assert actual.average_score == expected.average_score
+    assert math.isclose(actual.weighted_score, expected.weighted_score, rel_tol=1e-9, abs_tol=1e-9)
+    assert math.isclose(actual.confidence_average, expected.confidence_average, rel_tol=1e-9, abs_tol=1e-9)
+    assert actual.trend == expected.trend
+
+
+def test_sliding_window_eviction_matches_batch() -> None:
+    results = _random_results(300, seed=11)
+    window = 25
+    engine = MarketEngine()
+
+    for index, result in enumerate(results):
+        engine.update(result)
+        if index >= window:
+            engine.remove(results[index - window])
+        start = max(0, index - window + 1)
+        _assert_close(engine.current_summary(), MarketEngine().summarize(results[start:index + 1]))
+
+
+def test_long_running_window_is_resummed() -> None:
+    results = _random_results(5000, seed=3)
+    window = 40
+    engine = MarketEngine()
+    engine.RESUM_EVERY = 100
+
+    for index, result in enumerate(results):
+        engine.update(result)
+        if index >= window:
+            engine.remove(results[index - window])
+
+    _assert_close(engine.current_summary(), MarketEngine().summarize(results[-window:]))
+    assert engine._removals < 100
+
+
+def test_remove_rejects_results_that_were_not_added() -> None:
+    engine = MarketEngine()
+    result = _result(9)
+    engine.update(result)
+    engine.remove(result)
+
+    with pytest.raises(ValueError):
+        engine.remove(result)
+    assert engine.current_summary() == MarketEngine().summarize([])
+
+
+def test_drained_window_is_exactly_empty() -> None:
+    engine = MarketEngine()
+    results = [_result(8, "Macro", 0.7), _result(3, "Geopolitical", 0.9), _result(6, "Industrial", 0.65)]
+    for result in results:
+        engine.update(result)
+    for result in results:
+        engine.remove(result)
+    assert engine.current_summary() == MarketEngine().summarize([])
+
+    for trial in range(200):
+        batch = _random_results(random.Random(trial).randint(1, 30), seed=trial)
+        irrelevant = [r for r in batch if not MarketEngine._is_relevant(r)]
+        for result in batch:
+            engine.update(result)
+        for result in batch:
+            if MarketEngine._is_relevant(result):
+                engine.remove(result)
+        assert engine.current_summary() == MarketEngine().summarize(irrelevant)  # Exact, not approximate
+        for result in irrelevant:
+            engine.remove(result)
+        assert engine.current_summary() == MarketEngine().summarize([])
+
+
+def test_summarize_does_not_touch_running_state() -> None:
+    engine = MarketEngine()
+    engine.update(_result(9))
+
+    engine.summarize([_result(1), _result(2)])
+
+    assert engine.current_summary().total_articles == 1
+    engine.reset()
+    assert engine.current_summary() == MarketEngine().summarize([])
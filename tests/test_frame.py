@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import math
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.engine import MarketEngine
+from goldsense.frame import ResultFrame
+from goldsense.logger import read_results
+
+LOG_PATH = ROOT / "logs" / "analysis.jsonl"
+
+
+def test_roundtrip_preserves_results() -> None:
+    results = list(read_results(LOG_PATH))
+
+    frame = ResultFrame.from_results(results)
+
+    assert len(frame) == len(results)
+    assert frame.to_results() == results
+
+
+def test_sources_are_dictionary_encoded() -> None:
+    frame = ResultFrame.from_log(LOG_PATH)
+
+    assert len(frame.sources) < len(frame)
+    assert len(set(frame.sources)) == len(frame.sources)
+    assert frame.source_code.dtype.itemsize == 4
+
+
+def test_summarize_frame_matches_batch_summary() -> None:
+    results = list(read_results(LOG_PATH))
+    engine = MarketEngine()
+
+    batch = engine.summarize(results)
+    columnar = engine.summarize_frame(ResultFrame.from_results(results))
+
+    assert columnar.trend == batch.trend
+    assert columnar.total_articles == batch.total_articles
+    assert columnar.relevant_articles == batch.relevant_articles
+    for name in ("average_score", "weighted_score", "confidence_average"):
+        assert math.isclose(getattr(columnar, name), getattr(batch, name), rel_tol=1e-12)
+
+
+def test_chart_data_contains_relevant_rows_only() -> None:
+    results = list(read_results(LOG_PATH))
+
+    data = ResultFrame.from_results(results).chart_data({"Macro": "Makro"})
+
+    assert len(data) == sum(1 for r in results if r.is_relevant and r.category != "Irrelevant")
+    assert set(data["category"].unique()) <= {"Makro", "Geopolitical", "Industrial"}
+    assert str(data["published_at"].dt.tz) == "UTC"
+
+
+def test_empty_frame() -> None:
+    frame = ResultFrame.from_results([])
+
+    assert len(frame) == 0
+    assert frame.to_results() == []
+    assert MarketEngine().summarize_frame(frame) == MarketEngine().summarize([])
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.history import AnalysisHistory, HistoryFilter, parse_duration, parse_since
+from goldsense.logger import JsonlLogger
+from goldsense.models import AnalysisResult, NewsArticle
+
+START = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def _result(index: int, category: str = "Macro", source: str = "Reuters", confidence: float = 0.5) -> AnalysisResult:
+    return AnalysisResult(
+        article=NewsArticle(
+            title=f"Haber {index}",
+            description="d",
+            published_at=START + timedelta(hours=index),
+            source=source,
+            url=f"https://example.com/{index}",
+        ),
+        is_relevant=category != "Irrelevant",
+        category=category,
+        sentiment_score=1 + index % 10,
+        impact_reasoning="-",
+        confidence_score=confidence,
+    )
+
+
+@pytest.fixture
+def history(tmp_path: Path) -> AnalysisHistory:
+    logger = JsonlLogger(tmp_path / "analysis.jsonl")
+    logger.log_many([_result(i, "Macro", "Reuters", 0.9) for i in range(0, 10)], model="llama")
+    logger.log_many([_result(i, "Geopolitical", "BBC", 0.4) for i in range(10, 20)], model="qwen")
+    return AnalysisHistory(logger.index_path)
+
+
+def test_filters_combine(history: AnalysisHistory) -> None:
+    page = history.query(HistoryFilter(categories=("Macro",), min_confidence=0.8))
+    assert page.total == 10
+    assert {result.category for result in page.results} == {"Macro"}
+
+    page = history.query(HistoryFilter(start=START + timedelta(hours=5), end=START + timedelta(hours=12), models=("qwen",)))
+    assert [result.article.title for result in page.results] == ["Haber 11", "Haber 10"]
+    assert history.query(HistoryFilter(sources=("BBC",), min_confidence=0.5)).total == 0
+
+
+def test_pagination_and_sort(history: AnalysisHistory) -> None:
+    first = history.query(page=1, page_size=8, sort="published_at", descending=False)
+    last = history.query(page=3, page_size=8, sort="published_at", descending=False)
+    assert first.total == 20 and first.pages == 3
+    assert first.results[0].article.title == "Haber 0"
+    assert [r.article.title for r in last.results] == ["Haber 16", "Haber 17", "Haber 18", "Haber 19"]
+    assert isinstance(first.results[0], AnalysisResult)
+
+    with pytest.raises(ValueError):
+        history.query(sort="title")
+
+
+def test_facets(history: AnalysisHistory) -> None:
+    assert history.facets() == {
+        "categories": ["Geopolitical", "Macro"],
+        "sources": ["BBC", "Reuters"],
+        "models": ["llama", "qwen"],
+    }
+
+
+def test_existing_index_is_backfilled(tmp_path: Path) -> None:
+    path = tmp_path / "analysis.jsonl"
+    logger = JsonlLogger(path, rotate_max_bytes=2000, codec="gzip")
+    logger.log_many([_result(i) for i in range(12)])
+    assert logger.archive.segments()
+
+    # An index from before the history table: rows are rebuilt from segments and hot file
+    with sqlite3.connect(logger.index_path) as connection:
+        connection.execute("DELETE FROM history")
+        connection.execute("DELETE FROM meta WHERE key = 'history_version'")
+
+    assert AnalysisHistory.for_log(path).query().total == 12
+
+
+def test_search_folds_turkish_case_and_ranks_title_hits(tmp_path: Path) -> None:
+    logger = JsonlLogger(tmp_path / "analysis.jsonl")
+    logger.log_many([
+        AnalysisResult(
+            article=NewsArticle("Petrol fiyatları", "İRAN gerginliği altını destekliyor", START, "AA", "https://a"),
+            is_relevant=True, category="Geopolitical", sentiment_score=8, impact_reasoning="Güvenli liman talebi",
+        ),
+        AnalysisResult(
+            article=NewsArticle("Iran tensions lift gold", "d", START, "Reuters", "https://b"),
+            is_relevant=True, category="Geopolitical", sentiment_score=7, impact_reasoning="Safe haven",
+        ),
+        _result(1),
+    ])
+    history = AnalysisHistory(logger.index_path)
+
+    page = history.search("ıran")
+    assert [result.article.url for result in page.results] == ["https://b", "https://a"]
+    assert history.search("guvenli lim").total == 1  # Diacritics ignored, prefix match
+    assert history.search("iran", HistoryFilter(sources=("AA",))).total == 1
+    assert history.search('"iran* -(').total == 2  # Syntax characters are not FTS operators
+    assert history.search("   ").total == 0
+
+
+def test_parse_since_and_duration() -> None:
+    now = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+    assert parse_since("24h", now) == now - timedelta(hours=24)
+    assert parse_since("3d", now) == now - timedelta(days=3)
+    assert parse_since("2026-02-01") == datetime(2026, 2, 1, tzinfo=timezone.utc)
+    assert parse_duration("90m") == timedelta(minutes=90)
+    with pytest.raises(ValueError):
+        parse_since("yesterday")
+    with pytest.raises(ValueError):
+        parse_duration("1w")
+
+
+def test_index_path_with_uri_characters(tmp_path: Path) -> None:
+    directory = tmp_path / "logs?v=1#x%20y"
+    logger = JsonlLogger(directory / "analysis.jsonl")
+    logger.log_many([_result(i, "Macro", "Reuters", 0.9) for i in range(3)])
+
+    assert AnalysisHistory(logger.index_path).query(HistoryFilter()).total == 3
+
+
+def test_iter_results_reads_past_one_batch_oldest_first(history: AnalysisHistory) -> None:
+    titles = [r.article.title for r in history.iter_results(HistoryFilter(min_confidence=0.3), batch_size=3)]
+    assert titles == [f"Haber {i}" for i in range(20)]
+    macro = list(history.iter_results(HistoryFilter(categories=("Macro",), start=START + timedelta(hours=4)), batch_size=2))
+    assert [r.article.title for r in macro] == [f"Haber {i}" for i in range(4, 10)]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.lean import encode_verdict, max_completion_tokens, parse_verdict, verdict_description
+
+
+def test_verdict_roundtrip() -> None:
+    raw = encode_verdict(
+        is_relevant=True,
+        category="Geopolitical",
+        sentiment_score=8,
+        confidence_score=0.851,
+        impact_reasoning="Güvenli liman talebi artar.",
+        rationale="Risk-off flows favour gold.",
+    )
+
+    assert '"c":"G"' in raw
+    verdict = parse_verdict(raw)
+    assert verdict.is_relevant is True
+    assert verdict.category == "Geopolitical"
+    assert verdict.sentiment_score == 8
+    assert verdict.confidence_score == 0.85
+    assert verdict.impact_reasoning == "Güvenli liman talebi artar."
+    assert verdict.rationale == "Risk-off flows favour gold."
+
+
+def test_parse_tolerates_fences_and_full_names() -> None:
+    raw = '```json\n{"r": "0", "c": "Irrelevant", "s": 5, "k": 0.9, "i": "Etkisi yok."}\n```'
+
+    verdict = parse_verdict(raw)
+
+    assert verdict.is_relevant is False
+    assert verdict.category == "Irrelevant"
+    assert verdict.rationale is None
+
+
+def test_parse_truncates_to_token_caps() -> None:
+    raw = encode_verdict(
+        is_relevant=True, category="Macro", sentiment_score=3, confidence_score=0.7,
+        impact_reasoning="kelime " * 100,
+    )
+
+    verdict = parse_verdict(raw, reasoning_max_tokens=10)
+
+    assert len(verdict.impact_reasoning) <= 41
+    assert verdict.impact_reasoning.endswith("…")
+
+
+def test_parse_rejects_non_json() -> None:
+    with pytest.raises(ValueError):
+        parse_verdict("Sentiment is bullish.")
+
+
+def test_rationale_is_optional_in_schema_and_budget() -> None:
+    assert '"w"' not in verdict_description(False, 80, 60)
+    assert '"w"' in verdict_description(True, 80, 60)
+    assert max_completion_tokens(True, 80, 60) - max_completion_tokens(False, 80, 60) == 120
+
+
+def test_completion_cap_leaves_headroom_over_field_budgets() -> None:
+    # A reply that overruns its field budget must still fit with its closing brace
+    assert max_completion_tokens(False, 80, 60) >= 2 * 80 + 40
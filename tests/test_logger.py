@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.archive import iter_log_lines
+from goldsense.logger import BufferedJsonlWriter, JsonlLogger, read_results
+from goldsense.models import AnalysisResult, NewsArticle
+
+
+def _result(url: str | None) -> AnalysisResult:
+    return AnalysisResult(
+        article=NewsArticle(
+            title="Fed holds rates",
+            description="d",
+            published_at=datetime(2026, 2, 2, tzinfo=timezone.utc),
+            url=url,
+        ),
+        is_relevant=True,
+        category="Macro",
+        sentiment_score=7,
+        impact_reasoning="-",
+    )
+
+
+def test_duplicate_urls_are_skipped_across_instances(tmp_path: Path) -> None:
+    path = tmp_path / "analysis.jsonl"
+    JsonlLogger(path).log(_result("https://a"))
+
+    logger = JsonlLogger(path)
+    logger.log(_result("https://a"))
+    logger.log(_result("https://b"))
+    logger.log(_result(None))
+    logger.log(_result(None))
+
+    assert [r.article.url for r in read_results(path)] == ["https://a", "https://b", None, None]
+    assert "https://b" in logger
+    assert "https://c" not in logger
+
+
+def test_existing_jsonl_is_migrated_once(tmp_path: Path) -> None:
+    path = tmp_path / "analysis.jsonl"
+    lines = [json.dumps({"article": {"url": f"https://{i}"}}) for i in range(3)]
+    path.write_text("\n".join(lines) + "\n" + "{corrupted\n", encoding="utf-8")
+
+    logger = JsonlLogger(path)
+
+    assert "https://2" in logger
+    logger.log(_result("https://1"))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+
+
+def test_lines_appended_by_other_writers_are_indexed(tmp_path: Path) -> None:
+    path = tmp_path / "analysis.jsonl"
+    logger = JsonlLogger(path)
+    logger.log(_result("https://a"))
+
+    with path.open("a", encoding="utf-8") as file:
+        file.write(json.dumps({"article": {"url": "https://external"}}) + "\n")
+        file.write('{"article": {"url": "https://partial"')  # Writer still mid-line
+
+    assert "https://external" in JsonlLogger(path)
+    assert "https://partial" not in JsonlLogger(path)
+
+
+def test_truncated_or_replaced_log_is_reindexed_without_duplicates(tmp_path: Path) -> None:
+    import os
+    import sqlite3
+
+    path = tmp_path / "analysis.jsonl"
+    logger = JsonlLogger(path)
+    logger.log_many([_result(f"https://{i}") for i in range(3)])
+
+    def _rows() -> tuple[int, int]:
+        with sqlite3.connect(logger.index_path) as connection:
+            return (
+                connection.execute("SELECT COUNT(*) FROM history").fetchone()[0],
+                connection.execute("SELECT COUNT(*) FROM history_fts").fetchone()[0],
+            )
+
+    lines = path.read_bytes().splitlines(keepends=True)
+    path.write_bytes(lines[0])  # Truncated: smaller than the indexed offset
+    assert _rows() == (3, 3)
+    JsonlLogger(path)
+    assert _rows() == (1, 1)
+
+    replacement = tmp_path / "replacement.jsonl"
+    replacement.write_bytes(b"".join(lines[:2]))  # Another file, larger than the offset
+    os.replace(replacement, path)
+    JsonlLogger(path).log(_result("https://new"))
+    assert _rows() == (3, 3)
+    assert [r.article.url for r in read_results(path)] == ["https://0", "https://1", "https://new"]
+
+
+def test_log_many_writes_batch_and_skips_duplicates(tmp_path: Path) -> None:
+    path = tmp_path / "analysis.jsonl"
+    logger = JsonlLogger(path)
+    logger.log(_result("https://a"))
+
+    written = logger.log_many([_result("https://a"), _result("https://b"), _result("https://b"), _result(None)])
+
+    assert written == 2
+    assert [r.article.url for r in read_results(path)] == ["https://a", "https://b", None]
+    assert logger.log_many([]) == 0
+
+
+def test_buffered_writer_flushes_on_flush_and_close(tmp_path: Path) -> None:
+    path = tmp_path / "analysis.jsonl"
+    writer = BufferedJsonlWriter(JsonlLogger(path), max_queue=4, max_batch=3, flush_interval_seconds=0.01)
+
+    writer.submit_many(_result(f"https://{i}") for i in range(10))
+    writer.flush()
+    assert len(list(read_results(path))) == 10
+
+    writer.submit(_result("https://last"))
+    writer.close()
+    assert [r.article.url for r in read_results(path)][-1] == "https://last"
+    with pytest.raises(RuntimeError):
+        writer.submit(_result("https://late"))
+
+
+def test_rotation_moves_hot_file_into_segments(tmp_path: Path) -> None:
+    path = tmp_path / "analysis.jsonl"
+    logger = JsonlLogger(path, rotate_max_bytes=500, codec="gzip")
+    for index in range(10):
+        logger.log(_result(f"https://{index}"))
+
+    segments = logger.archive.segments()
+    assert segments and all(segment.name.endswith(".jsonl.gz") for segment in segments)
+    assert path.stat().st_size < 500
+    assert [r.article.url for r in read_results(path)] == [f"https://{index}" for index in range(10)]
+
+    # Dedup covers archived URLs, also for a fresh index
+    (tmp_path / "analysis.index.sqlite").unlink()
+    logger = JsonlLogger(path, rotate_max_bytes=500, codec="gzip")
+    assert logger.log_many([_result("https://0"), _result("https://new")]) == 1
+
+
+def test_compaction_keeps_last_entry_per_url(tmp_path: Path) -> None:
+    path = tmp_path / "analysis.jsonl"
+    logger = JsonlLogger(path, codec="gzip")
+    logger.log_many([_result("https://a"), _result("https://b")])
+    logger.rotate()
+    first = json.loads(next(iter_log_lines(path)))
+    with path.open("a", encoding="utf-8") as file:  # Another writer re-logged https://a
+        file.write(json.dumps({**first, "sentiment_score": 2}) + "\n")
+
+    assert logger.compact() == (3, 2)
+    results = {result.article.url: result for result in read_results(path)}
+    assert results["https://a"].sentiment_score == 2
+    assert len(logger.archive.segments()) == 1
+    assert path.stat().st_size == 0
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.metrics import CallMetrics, MetricsCollector, append_run_metrics, percentile
+
+
+def _call(latency: float, *, cost: float | None = None, succeeded: bool = True, retries: int = 0) -> CallMetrics:
+    return CallMetrics(
+        article_url=None,
+        model="llama-3.3-70b",
+        prompt_tokens=1000,
+        completion_tokens=200,
+        queue_wait_seconds=latency / 10,
+        latency_seconds=latency,
+        retries=retries,
+        cache_hit=False,
+        cost=cost,
+        succeeded=succeeded,
+    )
+
+
+def test_percentile_matches_linear_interpolation() -> None:
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 50) == 2.5
+    assert percentile(values, 100) == 4.0
+    assert percentile([], 95) == 0.0
+
+
+def test_from_history_sums_usage_and_cost() -> None:
+    entries = [
+        {"usage": {"prompt_tokens": 900, "completion_tokens": 150}, "cost": 0.001, "model": "m"},
+        {"usage": {"prompt_tokens": 100, "completion_tokens": 50}, "cost": None, "model": "m",
+         "response": SimpleNamespace(_hidden_params={"cache_hit": True})},
+    ]
+
+    call = CallMetrics.from_history(
+        entries, article_url="u", queue_wait_seconds=0.1, latency_seconds=1.0, retries=1, succeeded=True,
+    )
+
+    assert call.prompt_tokens == 1000
+    assert call.completion_tokens == 200
+    assert call.cost == 0.001
+    assert call.model == "m"
+    assert call.cache_hit is False  # Only one of the two requests came from cache
+
+
+def test_from_history_reads_cached_prompt_tokens() -> None:
+    entries = [
+        {"usage": {"prompt_tokens": 1200, "completion_tokens": 80,
+                   "prompt_tokens_details": {"cached_tokens": 1024}}},
+        {"usage": {"prompt_tokens": 1200, "completion_tokens": 80,
+                   "prompt_tokens_details": SimpleNamespace(cached_tokens=None)}},
+    ]
+
+    call = CallMetrics.from_history(
+        entries, article_url=None, queue_wait_seconds=0.0, latency_seconds=0.5, retries=0, succeeded=True,
+    )
+    collector = MetricsCollector()
+    collector.record(call)
+    metrics = collector.summarize(wall_seconds=1.0, prefix_hash="abc")
+
+    assert call.cached_prompt_tokens == 1024
+    assert metrics.prefix_cache_ratio == 1024 / 2400
+    assert metrics.prefix_hash == "abc"
+
+
+def test_summarize_aggregates_and_estimates_cost() -> None:
+    collector = MetricsCollector(prompt_cost_per_million=1.0, completion_cost_per_million=2.0)
+    for latency in (1.0, 2.0, 3.0):
+        collector.record(_call(latency))
+    collector.record(_call(4.0, cost=0.5, succeeded=False, retries=1))
+
+    metrics = collector.summarize(wall_seconds=2.0)
+
+    assert metrics.calls == 4
+    assert metrics.failed_calls == 1
+    assert metrics.retries == 1
+    assert metrics.prompt_tokens == 4000
+    assert metrics.latency_p50 == 2.5
+    assert metrics.calls_per_second == 2.0
+    # 3 estimated calls (1000 * 1 + 200 * 2) / 1e6 plus one reported cost
+    assert abs(metrics.total_cost - (3 * 0.0014 + 0.5)) < 1e-12
+
+
+def test_append_run_metrics_writes_jsonl(tmp_path: Path) -> None:
+    collector = MetricsCollector()
+    collector.record(_call(1.0))
+    path = tmp_path / "logs" / "metrics.jsonl"
+
+    append_run_metrics(path, collector.summarize(wall_seconds=1.0))
+    append_run_metrics(path, collector.summarize(wall_seconds=1.0))
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    entry = json.loads(lines[0])
+    assert entry["total_cost"] is None
+    assert entry["call_details"][0]["latency_seconds"] == 1.0
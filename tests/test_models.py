@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pickle
+import sys
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.logger import result_from_entry
+from goldsense.models import AnalysisResult, NewsArticle
+
+
+def _result(source: str = "Reuters") -> AnalysisResult:
+    return AnalysisResult(
+        article=NewsArticle(
+            title="Fed holds rates",
+            description="d",
+            published_at=datetime(2026, 2, 2, tzinfo=timezone.utc),
+            source="".join(source),  # Force a fresh, non-interned string
+            url="https://example.com/a",
+        ),
+        is_relevant=True,
+        category="".join("Macro"),
+        sentiment_score=7,
+        impact_reasoning="-",
+        confidence_score=0.8,
+    )
+
+
+def test_models_are_slotted() -> None:
+    result = _result()
+
+    assert not hasattr(result, "__dict__")
+    assert not hasattr(result.article, "__dict__")
+
+
+def test_low_cardinality_strings_are_interned() -> None:
+    first, second = _result(), _result()
+
+    assert first.article.source is second.article.source
+    assert first.category is second.category
+
+
+def test_asdict_replace_and_pickle_still_work() -> None:
+    result = _result()
+    payload = asdict(result)
+    payload["article"]["published_at"] = result.article.published_at.isoformat()
+
+    assert result_from_entry(payload) == result
+    assert replace(result, sentiment_score=3).sentiment_score == 3
+    assert pickle.loads(pickle.dumps(result)) == result
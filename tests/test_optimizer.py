@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.backtest import build_signal_matrix
+from goldsense.engine import MarketEngine
+from goldsense.exceptions import ConfigError
+from goldsense.frame import ResultFrame
+from goldsense.models import AnalysisResult, NewsArticle
+from goldsense.optimizer import SearchSpace, fit, write_engine_config
+
+START = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def _fixture(hours: int = 60, seed: int = 3):
+    # Macro news predicts the next hour's move; Geopolitical news is noise
+    rng = np.random.default_rng(seed)
+    results = []
+    price = [100.0]
+    for hour in range(hours):
+        macro = int(rng.integers(1, 11))
+        noise = int(rng.integers(1, 11))
+        for category, score in (("Macro", macro), ("Geopolitical", noise)):
+            results.append(AnalysisResult(
+                article=NewsArticle(title="t", description="d", published_at=START + timedelta(hours=hour, minutes=5)),
+                is_relevant=True,
+                category=category,
+                sentiment_score=score,
+                impact_reasoning="-",
+                confidence_score=0.9,
+            ))
+        price.append(price[-1] * (1 + (macro - 5.5) / 1000))
+    prices = pd.Series(price, index=pd.date_range(START + timedelta(hours=1), periods=len(price), freq="1h"))
+    return build_signal_matrix(ResultFrame.from_results(results), prices, ("1h",))
+
+
+def _space() -> SearchSpace:
+    return SearchSpace(weight_values=(0.0, 0.5, 1.0, 1.5), min_signals=5)
+
+
+def test_fit_prefers_the_predictive_category() -> None:
+    fitted = fit(_fixture(), "1h", _space(), workers=1)
+
+    assert fitted.category_weights["Macro"] > fitted.category_weights["Geopolitical"]
+    assert fitted.ic > fitted.baseline_ic
+    assert fitted.signals >= 5
+    assert fitted.bearish_threshold < fitted.bullish_threshold
+    assert sum(fitted.category_weights.values()) == pytest.approx(3.7)
+    assert fitted.candidates == 4 ** 3 - 1
+
+
+def test_parallel_fit_matches_serial() -> None:
+    matrix = _fixture()
+
+    serial = fit(matrix, "1h", _space(), workers=1)
+    parallel = fit(matrix, "1h", _space(), workers=2)
+
+    assert {**serial.to_dict(), "fitted_at": None} == {**parallel.to_dict(), "fitted_at": None}
+
+
+def test_engine_loads_written_config(tmp_path: Path) -> None:
+    path = tmp_path / "engine.json"
+    fitted = fit(_fixture(), "1h", _space(), workers=1)
+    write_engine_config(path, fitted)
+
+    engine = MarketEngine.from_config(path)
+
+    assert engine.bullish_threshold == fitted.bullish_threshold
+    assert engine.category_weights["Macro"] == fitted.category_weights["Macro"]
+    assert engine.category_weights["Irrelevant"] == 0.0
+
+
+def test_invalid_engine_config_raises(tmp_path: Path) -> None:
+    path = tmp_path / "engine.json"
+    path.write_text(json.dumps({"bullish_threshold": 3, "bearish_threshold": 5, "category_weights": {}}))
+
+    with pytest.raises(ConfigError):
+        MarketEngine.from_config(path)
+    with pytest.raises(ConfigError):
+        MarketEngine.from_config(tmp_path / "missing.json")
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense import cli, pipeline
+from goldsense.config import Settings
+from goldsense.exceptions import ConfigError
+from goldsense.logger import JsonlLogger
+from goldsense.models import AnalysisResult, BatchAnalysis
+from goldsense.pipeline import Pipeline
+from goldsense.runs import RunStore
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def _settings() -> Settings:
+    return Settings(
+        newsapi_key="test",
+        newsapi_base="test",
+        query="gold",
+        lookback_days=2,
+        cerebras_api_key="test",
+        cerebras_api_base="test",
+        cerebras_model="test",
+        analysis_temperature=0.2,
+        max_concurrency=3,
+        truncgil_url="test",
+        runs_dir=None,
+    )
+
+
+def _payload() -> dict:
+    return {
+        "articles": [
+            {"title": f"Gold {i}", "description": "d", "url": f"https://{i}", "source": {"name": "Reuters"},
+             "publishedAt": (NOW - timedelta(hours=i * 10)).isoformat().replace("+00:00", "Z")}
+            for i in range(4)
+        ]
+    }
+
+
+class _Fetcher:
+    def __init__(self, settings: Settings) -> None:
+        pass
+
+    async def fetch_latest_with_payload(self):
+        return [None] * 4, _payload()
+
+
+class _Analyst:
+    def __init__(self, settings: Settings) -> None:
+        pass
+
+    async def analyze_batch(self, articles):
+        results = [
+            AnalysisResult(article=a, is_relevant=True, category="Macro", sentiment_score=8, impact_reasoning="-")
+            for a in articles
+        ]
+        return BatchAnalysis(results=results, failures=[])
+
+
+@pytest.fixture(autouse=True)
+def _fakes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pipeline, "NewsFetcher", _Fetcher)
+    monkeypatch.setattr(pipeline, "GoldAnalyst", _Analyst)
+
+
+def test_run_skips_old_and_logged_articles(tmp_path: Path) -> None:
+    logger = JsonlLogger(tmp_path / "analysis.jsonl")
+    stages = []
+    runner = Pipeline(
+        _settings(), logger, runs=RunStore(tmp_path / "runs"), model="test",
+        on_progress=lambda stage, counts, seconds: stages.append(stage),
+    )
+
+    first = asyncio.run(runner.run(since=NOW - timedelta(hours=25)))
+    assert [r.article.url for r in first.results] == ["https://0", "https://1", "https://2"]
+    assert first.written == 3 and first.skipped == 1
+    assert first.summary.relevant_articles == 3
+    assert stages == ["fetch", "tonl", "decode", "analysis", "log", "summary"]
+
+    second = asyncio.run(runner.run())
+    assert [r.article.url for r in second.results] == ["https://3"]
+
+    manifest = RunStore(tmp_path / "runs").load(first.run_id)
+    assert set(manifest.artifacts) == {"raw_news.json", "news.tonl", "results.jsonl"}
+    assert manifest.summary["relevant_articles"] == 3
+
+
+def test_invalid_since_is_a_usage_error(capsys: pytest.CaptureFixture) -> None:
+    assert cli.build_parser().parse_args(["run", "--since", "3d"]).since <= datetime.now(timezone.utc) - timedelta(days=3)
+    with pytest.raises(SystemExit) as exc_info:
+        cli.build_parser().parse_args(["run", "--since", "yesterday"])
+    assert exc_info.value.code == 2
+    assert "invalid since value: 'yesterday'" in capsys.readouterr().err
+
+
+def test_since_widens_lookback_and_bad_config_exits_2(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cli, "load_dotenv", lambda: None)
+    monkeypatch.setenv("NEWSAPI_KEY", "x")
+    monkeypatch.setenv("CEREBRAS_API_KEY", "x")
+    monkeypatch.setenv("CEREBRAS_API_BASE", "x")
+    monkeypatch.setenv("CEREBRAS_MODEL", "x")
+
+    args = cli.build_parser().parse_args(["run", "--since", "2026-02-20T00:00:00Z", "--concurrency", "9"])
+    settings = cli.run_settings(args, now=NOW)
+    assert settings.lookback_days == 10 and settings.max_concurrency == 9
+
+    assert cli.main(["run", "--concurrency", "0"]) == cli.EXIT_CONFIG
+
+
+def test_serve_needs_no_news_or_llm_keys(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("NEWSAPI_KEY", "CEREBRAS_API_KEY", "CEREBRAS_API_BASE", "CEREBRAS_MODEL"):
+        monkeypatch.delenv(name, raising=False)
+
+    settings = cli.run_settings(cli.build_parser().parse_args(["serve", "--port", "9000"]))
+    assert settings.api_port == 9000
+    for command in (["run"], ["daemon"]):
+        with pytest.raises(ConfigError, match="NEWSAPI_KEY"):
+            cli.run_settings(cli.build_parser().parse_args(command))
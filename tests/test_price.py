@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.circuit import OPEN, CircuitBreaker
+from goldsense.config import Settings
+from goldsense.exceptions import ExternalServiceError
+from goldsense.price import GoldPriceService, PriceCache, PriceQuote, race_quotes, source_unit
+from goldsense.price_store import PriceStore
+
+
+def _source(price: float, delay: float):
+    async def _fetch() -> float:
+        await asyncio.sleep(delay)
+        return price
+
+    return _fetch
+
+
+async def _failing() -> float:
+    raise ExternalServiceError("down")
+
+
+def _breakers(threshold: int = 1) -> dict[str, CircuitBreaker]:
+    return {name: CircuitBreaker(name, failure_threshold=threshold, cooldown_seconds=60) for name in ("truncgil", "binance")}
+
+
+@pytest.mark.asyncio
+async def test_first_strategy_returns_fastest_valid_quote() -> None:
+    started = time.perf_counter()
+    quote = await race_quotes(
+        {"slow": _source(2000.0, 1.0), "fast": _source(2010.0, 0.01), "broken": _failing},
+        strategy="first",
+        deadline_seconds=2.0,
+    )
+
+    assert quote.source == "fast"
+    assert quote.price == 2010.0
+    assert time.perf_counter() - started < 0.5  # Did not wait for the slow source
+
+
+@pytest.mark.asyncio
+async def test_losing_sources_are_cancelled_and_awaited() -> None:
+    unwound = []
+
+    async def _slow() -> float:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            unwound.append("slow")
+            raise
+        return 1.0
+
+    quote = await race_quotes({"fast": _source(2010.0, 0.0), "slow": _slow}, strategy="first")
+
+    assert quote.source == "fast"
+    assert unwound == ["slow"]  # Finished before race_quotes returned, not left pending
+
+
+@pytest.mark.asyncio
+async def test_median_strategy_skips_failures_and_late_sources() -> None:
+    quote = await race_quotes(
+        {
+            "a": _source(2000.0, 0.01),
+            "b": _source(2030.0, 0.02),
+            "c": _source(2010.0, 0.03),
+            "late": _source(9999.0, 5.0),
+            "broken": _failing,
+            "zero": _source(0.0, 0.0),
+        },
+        strategy="median",
+        deadline_seconds=0.3,
+    )
+
+    assert quote.price == 2010.0
+    assert quote.source == "median(a,b,c)"
+
+
+@pytest.mark.asyncio
+async def test_deadline_without_valid_quote_returns_none() -> None:
+    assert await race_quotes({"late": _source(2000.0, 1.0), "broken": _failing}, deadline_seconds=0.05) is None
+
+
+@pytest.mark.asyncio
+async def test_median_rejects_sources_quoting_different_units() -> None:
+    with pytest.raises(ValueError):
+        await race_quotes(
+            {"truncgil": _source(3300.0, 0.0), "binance": _source(2400.0, 0.0)},
+            strategy="median",
+            units={"truncgil": "TRY/g", "binance": "USD/oz"},
+        )
+
+
+@pytest.mark.asyncio
+async def test_sources_with_different_units_are_fallbacks_not_raced(monkeypatch) -> None:
+    settings = replace(Settings.from_env(), truncgil_gold_symbol="GRA", price_sources=("truncgil", "binance"))
+    service = GoldPriceService(settings, cache=PriceCache(), breakers=_breakers(threshold=5))
+
+    async def _truncgil(client) -> float:
+        await asyncio.sleep(0.05)  # Slower than Binance, but preferred
+        return 3300.0
+
+    async def _binance(client) -> float:
+        return 2400.0
+
+    monkeypatch.setattr(service, "_fetch_truncgil_async", _truncgil)
+    monkeypatch.setattr(service, "_fetch_binance_async", _binance)
+
+    quote = await service.get_quote_async()
+    assert (quote.source, quote.price, quote.unit) == ("truncgil", 3300.0, "TRY/g")
+
+    async def _down(client) -> float:
+        raise ExternalServiceError("down")
+
+    monkeypatch.setattr(service, "_fetch_truncgil_async", _down)
+    fallback = await service.fetch_quote()
+    assert (fallback.source, fallback.price, fallback.unit) == ("binance", 2400.0, "USD/oz")
+    assert service.cache.current.unit == "USD/oz"
+
+
+def test_source_units() -> None:
+    settings = Settings.from_env()
+    assert source_unit(replace(settings, truncgil_gold_symbol="GRA"), "truncgil") == "TRY/g"
+    assert source_unit(replace(settings, truncgil_gold_symbol="ONS"), "truncgil") == "USD/oz"
+    assert source_unit(settings, "binance") == "USD/oz"
+
+
+@pytest.mark.asyncio
+async def test_async_service_uses_configured_sources_and_cache(monkeypatch) -> None:
+    settings = replace(Settings.from_env(), price_sources=("binance",), price_deadline_seconds=1.0)
+    service = GoldPriceService(settings, cache=PriceCache(), breakers=_breakers())
+    calls = []
+
+    async def _binance(client) -> float:
+        calls.append("binance")
+        return 2050.0
+
+    async def _truncgil(client) -> float:
+        calls.append("truncgil")
+        return 1.0
+
+    monkeypatch.setattr(service, "_fetch_binance_async", _binance)
+    monkeypatch.setattr(service, "_fetch_truncgil_async", _truncgil)
+
+    assert await service.get_current_price_async() == 2050.0
+    assert await service.get_current_price_async() == 2050.0  # Served from cache
+    assert calls == ["binance"]
+
+
+def test_cache_serves_stale_quote_and_refreshes_in_background(tmp_path: Path) -> None:
+    cache = PriceCache(path=tmp_path / "price_cache.json", fresh_seconds=60, max_stale_seconds=600)
+    cache.store(PriceQuote("truncgil", 2000.0, 0.1), [PriceQuote("binance", 2001.0, 0.2)])
+    assert cache.state() == "fresh"
+
+    cache._selected = replace(cache.current, fetched_at=time.time() - 120)
+    service = GoldPriceService(Settings.from_env(), cache=cache, breakers=_breakers())
+    refreshed = []
+
+    def _fetch():
+        refreshed.append(True)
+        return PriceQuote("binance", 2050.0, 0.05)
+
+    service._fetch_quote_sync = _fetch
+
+    assert cache.state() == "stale"
+    assert service.get_current_price() == 2000.0  # Served immediately
+    cache.wait_for_refresh(timeout=2)
+    assert refreshed == [True]
+    assert service.get_current_price() == 2050.0
+    assert set(cache.sources) == {"truncgil", "binance"}
+
+
+def test_cache_expires_after_max_staleness_and_persists(tmp_path: Path) -> None:
+    path = tmp_path / "price_cache.json"
+    cache = PriceCache(path=path, fresh_seconds=60, max_stale_seconds=600)
+    cache.store(PriceQuote("truncgil", 2000.0, 0.1))
+
+    reloaded = PriceCache(path=path, fresh_seconds=60, max_stale_seconds=600)
+
+    assert reloaded.current.price == 2000.0
+    assert reloaded.state(now=time.time() + 601) == "expired"
+    assert PriceCache(path=tmp_path / "missing.json").current is None
+
+
+def test_open_breaker_skips_source_without_calling_it() -> None:
+    settings = replace(Settings.from_env(), price_sources=("truncgil", "binance"))
+    service = GoldPriceService(settings, cache=PriceCache(), breakers=_breakers())
+    calls = []
+
+    def _truncgil(max_retries=None):
+        calls.append(("truncgil", max_retries))
+        raise ExternalServiceError("down")
+
+    def _binance(max_retries=None):
+        calls.append(("binance", max_retries))
+        return 2050.0
+
+    service._fetch_price_from_truncgil = _truncgil
+    service._fetch_from_binance = _binance
+
+    assert service._fetch_quote_sync().source == "binance"
+    assert service.breakers["truncgil"].state == OPEN
+
+    calls.clear()
+    assert service._fetch_quote_sync().source == "binance"
+    assert calls == [("binance", None)]  # Truncgil skipped instantly
+    assert [state["state"] for state in service.breaker_states()] == ["open", "closed"]
+
+
+@pytest.mark.asyncio
+async def test_source_hanging_past_deadline_trips_breaker(monkeypatch) -> None:
+    settings = replace(Settings.from_env(), price_deadline_seconds=0.05)
+    service = GoldPriceService(settings, cache=PriceCache(), breakers=_breakers())
+
+    async def _hang(client) -> float:
+        await asyncio.sleep(5)
+        return 1.0
+
+    async def _binance(client) -> float:
+        raise ExternalServiceError("down")
+
+    monkeypatch.setattr(service, "_fetch_truncgil_async", _hang)
+    monkeypatch.setattr(service, "_fetch_binance_async", _binance)
+
+    assert await service.fetch_quote() is None
+    assert service.breakers["truncgil"].state == OPEN
+    assert service.breakers["binance"].state == OPEN
+    assert await service.fetch_quote() is None  # Both skipped, no waiting
+
+
+def test_fetched_quotes_are_recorded(tmp_path: Path) -> None:
+    store = PriceStore(tmp_path / "prices.sqlite")
+    service = GoldPriceService(Settings.from_env(), cache=PriceCache(), breakers=_breakers(), recorder=store)
+    service._fetch_price_from_truncgil = lambda max_retries=None: 6900.0
+
+    assert service.get_current_price() == 6900.0
+    assert service.get_quote().unit == source_unit(service.settings, "truncgil")  # Cached: not recorded again
+
+    assert store.sources() == {"truncgil": 1}
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.backtest import load_price_series
+from goldsense.price_store import PriceStore
+
+START = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def _store(tmp_path: Path) -> PriceStore:
+    store = PriceStore(tmp_path / "prices.sqlite")
+    rows = [((START + timedelta(minutes=15 * i)).timestamp(), "binance", 2000.0 + i) for i in range(8)]
+    rows.append(((START + timedelta(minutes=5)).timestamp(), "truncgil", 6900.0))
+    store.record_many(rows)
+    return store
+
+
+def test_range_query_filters_by_time_and_source(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+
+    quotes = store.quotes(start=START + timedelta(minutes=30), end=START + timedelta(hours=1), source="binance")
+
+    assert list(quotes["price"]) == [2002.0, 2003.0]
+    assert str(quotes.index.tz) == "UTC"
+    assert store.sources() == {"binance": 8, "truncgil": 1}
+
+
+def test_series_defaults_to_most_recorded_source(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+
+    assert len(store.series()) == 8
+    assert list(store.series("truncgil")) == [6900.0]
+
+
+def test_ohlc_downsampling(tmp_path: Path) -> None:
+    bars = _store(tmp_path).ohlc("1h", source="binance")
+
+    assert list(bars["open"]) == [2000.0, 2004.0]
+    assert list(bars["high"]) == [2003.0, 2007.0]
+    assert list(bars["close"]) == [2003.0, 2007.0]
+    assert list(bars["count"]) == [4, 4]
+
+
+def test_backtest_reads_recorded_prices(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+
+    series = load_price_series(store.path)
+
+    assert len(series) == 8
+    assert series.index.is_monotonic_increasing
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.exceptions import GoldSenseError
+from goldsense.runs import RunStore, code_version
+
+
+def _run(store: RunStore, payload: bytes) -> str:
+    run = store.start(model="llama")
+    with run.stage("fetch") as counts:
+        counts["articles"] = 2
+    run.add_artifact("raw_news.json", payload)
+    with run.stage("tonl"):
+        run.add_artifact("news.tonl", "#version 1.0\n")
+    run.finish(summary={"trend": "Bullish"})
+    return run.run_id
+
+
+def test_manifest_records_stages_and_artifacts(tmp_path: Path) -> None:
+    store = RunStore(tmp_path)
+    run_id = _run(store, b'{"articles": []}')
+
+    manifest = store.load(run_id)
+    assert [stage["name"] for stage in manifest.stages] == ["fetch", "tonl"]
+    assert manifest.stages[0]["counts"] == {"articles": 2}
+    assert manifest.artifacts["news.tonl"]["stage"] == "tonl"
+    assert manifest.code_version == code_version() and manifest.model == "llama"
+    assert manifest.finished_at is not None and manifest.summary == {"trend": "Bullish"}
+    assert store.artifact(run_id, "raw_news.json") == b'{"articles": []}'
+
+    with pytest.raises(GoldSenseError):
+        store.artifact(run_id, "results.jsonl")
+
+
+def test_identical_payloads_are_stored_once(tmp_path: Path) -> None:
+    store = RunStore(tmp_path)
+    first = _run(store, b'{"articles": [1]}')
+    second = _run(store, b'{"articles": [1]}')
+
+    assert [manifest.run_id for manifest in store.runs()] == sorted([first, second], reverse=True)
+    assert len(list((tmp_path / "objects").glob("*/*"))) == 2  # raw_news.json + news.tonl
+    assert [name for name, _, _ in store.compare(first, second)] == ["fetch", "tonl"]
+
+
+def test_failed_stage_is_saved_with_error(tmp_path: Path) -> None:
+    store = RunStore(tmp_path)
+    run = store.start()
+    with pytest.raises(GoldSenseError):
+        with run.stage("fetch"):
+            raise GoldSenseError("NewsAPI down")
+
+    manifest = store.load(run.run_id)
+    assert manifest.finished_at is None
+    assert manifest.stages[0]["counts"]["error"] == "GoldSenseError: NewsAPI down"
+
+    run.finish(error="NewsAPI down")
+    manifest = store.load(run.run_id)
+    assert manifest.finished_at is not None and manifest.error == "NewsAPI down" and manifest.summary is None
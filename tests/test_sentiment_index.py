@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import math
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.models import AnalysisResult, NewsArticle
+from goldsense.sentiment_index import WINDOWS, RollingSentimentIndex
+
+START = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def _result(published_at: datetime, score: int, category: str = "Macro", confidence: float = 1.0) -> AnalysisResult:
+    return AnalysisResult(
+        article=NewsArticle(title="t", description="d", published_at=published_at),
+        is_relevant=category != "Irrelevant",
+        category=category,
+        sentiment_score=score,
+        impact_reasoning="-",
+        confidence_score=confidence,
+    )
+
+
+def _history(count: int, seed: int = 3) -> list[AnalysisResult]:
+    rng = random.Random(seed)
+    return [
+        _result(
+            START + timedelta(minutes=rng.randint(0, 60 * 24 * 20)),
+            rng.randint(1, 10),
+            rng.choice(["Macro", "Geopolitical", "Industrial", "Irrelevant"]),
+            round(rng.uniform(0.3, 1.0), 2),
+        )
+        for _ in range(count)
+    ]
+
+
+def test_single_result_decays_by_half_life() -> None:
+    index = RollingSentimentIndex(window=WINDOWS["24h"], half_life=timedelta(hours=2))
+    index.update(_result(START, 8))
+
+    point = index.point_at(START + timedelta(hours=2))
+
+    assert point.value == 8
+    assert point.count == 1
+    assert math.isclose(point.weight, 1.5 / 2)  # Macro weight, halved
+
+
+def test_window_evicts_old_results() -> None:
+    index = RollingSentimentIndex(window=WINDOWS["1h"], half_life=timedelta(hours=1))
+    index.update(_result(START, 2))
+    index.update(_result(START + timedelta(minutes=50), 9))
+
+    assert index.point_at(START + timedelta(minutes=55)).count == 2
+    late = index.point_at(START + timedelta(minutes=61))
+    assert late.count == 1
+    assert math.isclose(late.value, 9)
+    assert index.point_at(START + timedelta(hours=3)).value is None
+
+
+def test_out_of_order_results_match_sorted_replay() -> None:
+    results = _history(200)
+    shuffled = RollingSentimentIndex(window=WINDOWS["6h"])
+    ordered = RollingSentimentIndex(window=WINDOWS["6h"])
+    end = START + timedelta(days=21)
+
+    for result in results:
+        shuffled.update(result)
+    for result in sorted(results, key=lambda r: r.article.published_at):
+        ordered.update(result)
+
+    a, b = shuffled.point_at(end - timedelta(days=1, hours=3)), ordered.point_at(end - timedelta(days=1, hours=3))
+    assert a.count == b.count
+    assert math.isclose(a.weight, b.weight, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_backfill_matches_incremental_replay() -> None:
+    results = sorted(_history(400, seed=5), key=lambda r: r.article.published_at)
+    half_life = timedelta(minutes=30)  # Small half-life vs. 20 days exercises chunk rebasing
+
+    series = RollingSentimentIndex(window=WINDOWS["6h"], half_life=half_life).backfill(results, freq="1h")
+
+    incremental = RollingSentimentIndex(window=WINDOWS["6h"], half_life=half_life)
+    pending = iter(results)
+    upcoming = next(pending, None)
+    for timestamp, row in series.iterrows():
+        while upcoming is not None and upcoming.article.published_at <= timestamp:
+            incremental.update(upcoming)
+            upcoming = next(pending, None)
+        point = incremental.point_at(timestamp.to_pydatetime())
+
+        assert point.count == row["count"]
+        if point.value is None:
+            assert math.isnan(row["value"])
+        else:
+            assert math.isclose(point.value, row["value"], rel_tol=1e-9)
+            assert math.isclose(point.weight, row["weight"], rel_tol=1e-6, abs_tol=1e-12)
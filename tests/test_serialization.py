@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.models import AnalysisResult, NewsArticle
+from goldsense.serialization import dumps, loads, result_to_dict
+
+
+def _result() -> AnalysisResult:
+    return AnalysisResult(
+        article=NewsArticle(
+            title="Altın yükselişte / İstanbul",
+            description="d",
+            published_at=datetime(2026, 2, 2, 9, 30, tzinfo=timezone.utc),
+            source="Reuters",
+            url="https://example.com/a",
+        ),
+        is_relevant=True,
+        category="Macro",
+        sentiment_score=7,
+        impact_reasoning="-",
+        rationale=None,
+        confidence_score=0.8,
+    )
+
+
+def test_result_to_dict_matches_asdict_layout() -> None:
+    result = _result()
+    expected = asdict(result)
+    expected["article"]["published_at"] = result.article.published_at.isoformat()
+
+    converted = result_to_dict(result)
+    assert converted == expected
+    assert list(converted) == list(expected)
+
+
+def test_dumps_is_compact_utf8_and_stdlib_compatible() -> None:
+    payload = result_to_dict(_result())
+    encoded = dumps(payload)
+
+    assert isinstance(encoded, bytes)
+    assert b"\n" not in encoded and b": " not in encoded
+    assert "İstanbul".encode("utf-8") in encoded and b"\\/" not in encoded
+    assert json.loads(encoded) == payload == loads(encoded)
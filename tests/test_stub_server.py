@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from goldsense.lean import parse_verdict
+from goldsense.stub_server import StubConfig, StubLLMServer, fixture_key, synthesize_answer
+
+SYSTEM = (
+    "Your input fields are:\n1. `title` (str)\n2. `description` (str)\n\n"
+    "Your output fields are:\n1. `reasoning` (str)\n2. `category` (str)\n3. `sentiment_score` (int)\n\n"
+    "All interactions will be structured in the following way..."
+)
+
+
+def _messages(title: str) -> list[dict]:
+    return [
+        {"role": "system", "content": SYSTEM},
+        {"role": "user", "content": f"[[ ## title ## ]]\n{title}\n\n[[ ## description ## ]]\n..."},
+    ]
+
+
+async def _post(api_base: str, payload: dict) -> tuple[int, dict]:
+    host, port = api_base.removeprefix("http://").split("/")[0].split(":")
+    reader, writer = await asyncio.open_connection(host, int(port))
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        b"POST /v1/chat/completions HTTP/1.1\r\nHost: stub\r\nConnection: close\r\n"
+        + f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, response_body = raw.partition(b"\r\n\r\n")
+    return int(head.split(b" ")[1]), json.loads(response_body)
+
+
+def _fast_config(**overrides) -> StubConfig:
+    values = dict(latency="constant", latency_mean_seconds=0.0, tokens_per_second=1e9)
+    values.update(overrides)
+    return StubConfig(**values)
+
+
+def test_synthesized_answer_follows_requested_fields() -> None:
+    answer = synthesize_answer(_messages("Fed cuts rates"))["content"]
+
+    assert answer.index("[[ ## reasoning ## ]]") < answer.index("[[ ## sentiment_score ## ]]")
+    assert "[[ ## is_relevant ## ]]" not in answer
+    assert answer.endswith("[[ ## completed ## ]]")
+    assert answer == synthesize_answer(_messages("Fed cuts rates"))["content"]
+
+
+def test_synthesized_lean_verdict_is_parseable() -> None:
+    messages = _messages("x")
+    messages[0]["content"] = messages[0]["content"].replace(
+        "1. `reasoning` (str)\n2. `category` (str)\n3. `sentiment_score` (int)", "1. `verdict` (str)"
+    )
+
+    content = synthesize_answer(messages)["content"]
+    raw = content.split("[[ ## verdict ## ]]\n")[1].split("\n\n")[0]
+
+    assert 1 <= parse_verdict(raw).sentiment_score <= 10
+
+
+def test_server_replays_fixture_over_http(tmp_path: Path) -> None:
+    messages = _messages("Recorded article")
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text(json.dumps({
+        fixture_key(messages): {"content": "recorded", "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12}},
+    }))
+
+    async def scenario():
+        stub = StubLLMServer(_fast_config(fixture_path=fixture))
+        api_base = await stub.start()
+        try:
+            return await _post(api_base, {"model": "stub", "messages": messages}), stub.stats
+        finally:
+            await stub.stop()
+
+    (status, body), stats = asyncio.run(scenario())
+
+    assert status == 200
+    assert body["choices"][0]["message"]["content"] == "recorded"
+    assert body["usage"]["completion_tokens"] == 2
+    assert stats.replayed == 1
+
+
+def test_server_injects_rate_limits_deterministically() -> None:
+    async def scenario():
+        stub = StubLLMServer(_fast_config(rate_limit_rate=1.0))
+        api_base = await stub.start()
+        try:
+            return await _post(api_base, {"model": "stub", "messages": _messages("a")}), stub.stats
+        finally:
+            await stub.stop()
+
+    (status, body), stats = asyncio.run(scenario())
+
+    assert status == 429
+    assert body["error"]["code"] == "rate_limit_exceeded"
+    assert stats.rate_limited == 1
+
+
+def test_stop_closes_idle_keep_alive_connections() -> None:
+    async def scenario():
+        stub = StubLLMServer(_fast_config())
+        api_base = await stub.start()
+        host, port = api_base.removeprefix("http://").split("/")[0].split(":")
+        reader, writer = await asyncio.open_connection(host, int(port))
+        writer.write(b"GET /v1/models HTTP/1.1\r\nHost: stub\r\n\r\n")  # Keep-alive: server waits for more
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+
+        await asyncio.wait_for(stub.stop(), timeout=5)
+        remaining = await reader.read()
+        writer.close()
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return head, remaining, pending
+
+    head, remaining, pending = asyncio.run(scenario())
+
+    assert head.startswith(b"HTTP/1.1 200")
+    assert remaining == b""  # Server closed the connection
+    assert pending == []